@@ -0,0 +1,29 @@
+"""
+gunicorn Konfiguration für die NBA Predictor API
+
+Die App wird im Master geladen (preload_app), Spielerdaten und Synergy-
+Matrizen werden per fork copy-on-write mit allen Workern geteilt.
+Alle Werte lassen sich per Umgebungsvariable überschreiben.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+
+# Ein Prozess pro CPU für die NumPy-Arbeit, Threads für I/O (nba_api, Dateien).
+# Mehr Worker als CPUs bringen nur Kontextwechsel und Lock-Konkurrenz.
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+preload_app = True
+
+# nba_api Calls (check-predictions, today-games) können langsam sein
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
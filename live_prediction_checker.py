@@ -4,100 +4,75 @@ NBA Prediction Checker
 Checkt gestrige Vorhersagen gegen echte Ergebnisse
 """
 
-from nba_api.live.nba.endpoints import scoreboard
 from datetime import datetime, timedelta
-import json
 import os
 
+from nba_prediction_store import atomic_write_json, build_stats, default_data_dir, get_prediction_store
+from nba_result_matcher import ResultMatcher
+from nba_results_fetcher import ResultsFetcher, unchecked_dates
+
 class LivePredictionChecker:
     """Checkt Vorhersagen gegen Live-Ergebnisse"""
     
-    def __init__(self):
-        self.predictions_file = 'predictions_history.json'
-        self.stats_file = 'prediction_stats.json'
+    def __init__(self, data_dir=None):
+        # Gleicher Store wie PredictionTracker (PREDICTIONS_BACKEND / PREDICTIONS_DATA_DIR)
+        if data_dir is None:
+            data_dir = default_data_dir()
+        
+        self.store = get_prediction_store(data_dir)
+        self.predictions_file = self.store.path
+        self.stats_file = os.path.join(data_dir, 'prediction_stats.json')
+        self.fetcher = ResultsFetcher()
         self.load_data()
     
     def load_data(self):
         """Lädt gespeicherte Vorhersagen"""
-        if os.path.exists(self.predictions_file):
-            with open(self.predictions_file, 'r') as f:
-                self.predictions = json.load(f)
-        else:
-            self.predictions = []
+        self.predictions = self.store.predictions()
         
-        if os.path.exists(self.stats_file):
-            with open(self.stats_file, 'r') as f:
-                self.stats = json.load(f)
-        else:
-            self.stats = {
-                'total_predictions': 0,
-                'correct_predictions': 0,
-                'accuracy': 0.0,
-                'last_7_days': [],
-                'best_day': None,
-                'worst_day': None
-            }
+        self.stats = build_stats(self.store.accuracy_stats())
     
-    def save_data(self):
-        """Speichert Daten"""
-        with open(self.predictions_file, 'w') as f:
-            json.dump(self.predictions, f, indent=2)
-        
-        with open(self.stats_file, 'w') as f:
-            json.dump(self.stats, f, indent=2)
+    @staticmethod
+    def _to_live_format(result):
+        """Ergebnis des Fetchers (team1 = Heimteam) im Format dieses Checkers"""
+        home_score, away_score = (int(x) for x in result['score'].split('-'))
+        return {
+            'date': result['date'],
+            'home_team': result['team1'],
+            'away_team': result['team2'],
+            'home_score': home_score,
+            'away_score': away_score,
+            'winner': result['winner'],
+            'final_score': result['score']
+        }
     
     def get_yesterdays_results(self):
-        """Holt gestrige Spiel-Ergebnisse"""
+        """
+        Holt gestrige Spiel-Ergebnisse
+        (ScoreboardV2 für gestern - das Live-Scoreboard zeigt nur den heutigen Tag)
+        """
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
-        try:
-            print(f"📊 Lade Ergebnisse vom {yesterday}...")
-            
-            # NBA Live Scoreboard
-            board = scoreboard.ScoreBoard()
-            games = board.games.get_dict()
-            
-            results = []
-            for game in games:
-                try:
-                    home_team = game.get('homeTeam', {})
-                    away_team = game.get('awayTeam', {})
-                    
-                    home_score = home_team.get('score', 0)
-                    away_score = away_team.get('score', 0)
-                    home_abbr = home_team.get('teamTricode', '')
-                    away_abbr = away_team.get('teamTricode', '')
-                    
-                    # Bestimme Gewinner
-                    if home_score > away_score:
-                        winner = home_abbr
-                    else:
-                        winner = away_abbr
-                    
-                    results.append({
-                        'date': yesterday,
-                        'home_team': home_abbr,
-                        'away_team': away_abbr,
-                        'home_score': home_score,
-                        'away_score': away_score,
-                        'winner': winner,
-                        'final_score': f"{home_score}-{away_score}"
-                    })
-                    
-                except Exception as e:
-                    print(f"⚠️ Fehler beim Parsen: {e}")
-                    continue
-            
-            print(f"✓ {len(results)} Ergebnisse gefunden")
-            return results
-            
-        except Exception as e:
-            print(f"❌ Fehler: {e}")
+        print(f"📊 Lade Ergebnisse vom {yesterday}...")
+        results = [self._to_live_format(r) for r in self.fetcher.fetch_day(yesterday)]
+        print(f"✓ {len(results)} Ergebnisse gefunden")
+        return results
+    
+    def get_backfill_results(self):
+        """Holt die Ergebnisse aller Tage mit ungecheckten Vorhersagen"""
+        dates = unchecked_dates(self.store.unchecked())
+        
+        if not dates:
             return []
+        
+        print(f"📊 Backfill: {len(dates)} Tage ({dates[0]} bis {dates[-1]})...")
+        results_by_date = self.fetcher.fetch_results(dates)
+        results = [self._to_live_format(r) for date in dates for r in results_by_date[date]]
+        print(f"✓ {len(results)} Ergebnisse gefunden")
+        return results
     
-    def check_predictions(self):
-        """Vergleicht Vorhersagen mit Ergebnissen"""
-        results = self.get_yesterdays_results()
+    def check_predictions(self, backfill=False):
+        """Vergleicht Vorhersagen mit Ergebnissen (backfill: alle offenen Tage)"""
+        results = self.get_backfill_results() if backfill else self.get_yesterdays_results()
         
         if not results:
             print("ℹ️ Keine Ergebnisse zum Checken")
@@ -105,103 +80,48 @@ class LivePredictionChecker:
         
         checked_count = 0
         correct_count = 0
+        updates = []
         
-        for result in results:
-            # Finde passende Vorhersage
-            for prediction in self.predictions:
-                if (not prediction.get('checked', False) and
-                    prediction.get('date') == result['date']):
-                    
-                    # Prüfe ob Teams übereinstimmen
-                    pred_teams = {prediction.get('team1'), prediction.get('team2')}
-                    result_teams = {result['home_team'], result['away_team']}
-                    
-                    if pred_teams == result_teams:
-                        # Match gefunden!
-                        prediction['actual_result'] = {
-                            'winner': result['winner'],
-                            'score': result['final_score']
-                        }
-                        
-                        # War Vorhersage richtig?
-                        predicted_winner = prediction.get('predicted_winner', '')
-                        actual_winner = result['winner']
-                        
-                        # Vergleiche (berücksichtige Team-Namen vs Abkürzungen)
-                        is_correct = (
-                            predicted_winner == actual_winner or
-                            actual_winner in predicted_winner
-                        )
-                        
-                        prediction['was_correct'] = is_correct
-                        prediction['checked'] = True
-                        
-                        checked_count += 1
-                        if is_correct:
-                            correct_count += 1
-                        
-                        status = '✅' if is_correct else '❌'
-                        print(f"{status} {pred_teams}: "
-                              f"Predicted {predicted_winner}, "
-                              f"Actual {actual_winner} ({result['final_score']})")
+        with self.store.locked():
+            # Ein Durchlauf: Hash-Index über (Datum, Team-Paar), Teams in
+            # beliebiger Reihenfolge, Namen vs. Tricodes über die Team-Tabelle
+            matcher = ResultMatcher(self.store.unchecked())
+            
+            for key, prediction, result, is_correct in matcher.match(results):
+                updates.append((key, {
+                    'actual_result': {
+                        'winner': result['winner'],
+                        'score': result['final_score']
+                    },
+                    'was_correct': is_correct,
+                    'checked': True
+                }))
+                
+                checked_count += 1
+                if is_correct:
+                    correct_count += 1
+                
+                status = '✅' if is_correct else '❌'
+                print(f"{status} {prediction.get('team1')} vs {prediction.get('team2')}: "
+                      f"Predicted {prediction.get('predicted_winner', '')}, "
+                      f"Actual {result['winner']} ({result['final_score']})")
+            
+            if checked_count > 0:
+                # Vorhersagen + Stats-Aggregat in einem Write bzw. einer Transaktion
+                self.store.update(updates)
+                self.update_stats()
         
         if checked_count > 0:
-            self.save_data()
-            self.update_stats()
             print(f"\n📊 Checked: {checked_count} | Correct: {correct_count}")
             print(f"🎯 Accuracy: {(correct_count/checked_count*100):.1f}%")
         else:
             print("ℹ️ Keine Vorhersagen zum Checken")
     
     def update_stats(self):
-        """Aktualisiert Statistiken"""
-        checked = [p for p in self.predictions if p.get('checked', False)]
-        
-        if not checked:
-            return
-        
-        total = len(checked)
-        correct = sum(1 for p in checked if p.get('was_correct', False))
-        accuracy = (correct / total * 100) if total > 0 else 0
-        
-        self.stats['total_predictions'] = total
-        self.stats['correct_predictions'] = correct
-        self.stats['accuracy'] = round(accuracy, 2)
-        
-        # Last 7 days
-        last_7_days = {}
-        for p in checked:
-            date = p.get('date', '')
-            if date not in last_7_days:
-                last_7_days[date] = {'total': 0, 'correct': 0}
-            
-            last_7_days[date]['total'] += 1
-            if p.get('was_correct', False):
-                last_7_days[date]['correct'] += 1
-        
-        self.stats['last_7_days'] = [
-            {
-                'date': date,
-                'accuracy': round(data['correct'] / data['total'] * 100, 1),
-                'correct': data['correct'],
-                'total': data['total']
-            }
-            for date, data in sorted(last_7_days.items(), reverse=True)[:7]
-        ]
-        
-        # Best/Worst day
-        if self.stats['last_7_days']:
-            self.stats['best_day'] = max(
-                self.stats['last_7_days'],
-                key=lambda x: x['accuracy']
-            )
-            self.stats['worst_day'] = min(
-                self.stats['last_7_days'],
-                key=lambda x: x['accuracy']
-            )
-        
-        self.save_data()
-        print(f"✓ Stats aktualisiert: {accuracy:.1f}% Accuracy")
+        """Aktualisiert Statistiken (Aggregat pflegt der Store, hier nur der Export)"""
+        self.stats = build_stats(self.store.accuracy_stats())
+        atomic_write_json(self.stats_file, self.stats)
+        print(f"✓ Stats aktualisiert: {self.stats['accuracy']:.1f}% Accuracy")
     
     def show_stats(self):
         """Zeigt aktuelle Statistiken"""
@@ -238,14 +158,18 @@ if __name__ == "__main__":
         if command == "check":
             checker.check_predictions()
         
+        elif command == "backfill":
+            checker.check_predictions(backfill=True)
+        
         elif command == "stats":
             checker.show_stats()
         
         else:
-            print("Commands: check, stats")
+            print("Commands: check, backfill, stats")
     
     else:
         print("🏀 NBA Prediction Checker")
         print("\nCommands:")
-        print("  python live_prediction_checker.py check  - Check yesterday's predictions")
-        print("  python live_prediction_checker.py stats  - Show current stats")
+        print("  python live_prediction_checker.py check     - Check yesterday's predictions")
+        print("  python live_prediction_checker.py backfill  - Check all days with open predictions")
+        print("  python live_prediction_checker.py stats     - Show current stats")
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+NBA API Client
+Gemeinsame Fetch-Schicht für alle nba_api Calls (Games Loader, Results
+Fetcher, Data Collector): Disk-Cache, TTL pro Endpoint-Klasse, Token Bucket
+über alle Threads und Retry mit Jitter
+
+Der Cache ist content-addressed: Key ist ein Hash aus Endpoint und den
+tatsächlich gesendeten Parametern (inkl. nba_api-Defaults), gespeichert wird
+die rohe Antwort. Ein Treffer baut das Endpoint-Objekt daraus ohne Netzwerk.
+
+Offline-Replay: mit NBA_API_OFFLINE=1 kommen alle Antworten aus dem Cache
+(abgelaufen oder nicht), ohne Treffer gibt es OfflineCacheMiss. Fixtures
+aufnehmen = einmal online mit NBA_API_CACHE_DIR=<fixtures> laufen lassen.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from nba_prediction_store import atomic_write_json, default_data_dir
+
+# TTLs in Sekunden, None = läuft nie ab
+LIVE_TTL = 10          # Live-Scoreboard (cdn.nba.com liveData)
+RECENT_TTL = 60        # Tages-Scoreboards ab gestern - Spiele können noch laufen
+SEASON_TTL = 3600      # Game Logs der laufenden Saison
+DEFAULT_TTL = 3600     # alles andere
+
+# Token Bucket: stats.nba.com blockt bei zu vielen Requests
+DEFAULT_RATE = 1.5     # Requests pro Sekunde
+DEFAULT_BURST = 3
+
+MAX_ATTEMPTS = 3
+BACKOFF = 1.0          # Basis für exponentielles Backoff (Sekunden)
+
+
+class OfflineCacheMiss(LookupError):
+    """Offline-Modus und keine aufgezeichnete Antwort für den Request"""
+
+
+class TokenBucket:
+    """
+    Token Bucket über alle Threads: rate Requests pro Sekunde, Bursts bis capacity.
+    Wartende reservieren ihr Token sofort, Requests starten so in Ankunftsreihenfolge.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Ein Bucket pro Prozess, egal wie viele Clients
+_shared_bucket = TokenBucket(
+    rate=float(os.environ.get('NBA_API_RATE', DEFAULT_RATE)),
+    capacity=int(os.environ.get('NBA_API_BURST', DEFAULT_BURST))
+)
+
+
+def _parse_date(value):
+    for fmt in ('%Y-%m-%d', '%m/%d/%Y'):
+        try:
+            return datetime.strptime(str(value), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def default_cache_dir():
+    """NBA_API_CACHE_DIR, sonst nba_api_cache im Daten-Verzeichnis"""
+    return os.environ.get('NBA_API_CACHE_DIR') or os.path.join(default_data_dir(), 'nba_api_cache')
+
+
+def current_season(today=None):
+    """Laufende Saison im nba_api-Format ('2025-26'), Saisonstart im Oktober"""
+    today = today or datetime.now().date()
+    start = today.year if today.month >= 10 else today.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def default_ttl(endpoint, parameters, live=False, now=None):
+    """
+    TTL für eine Antwort, berechnet beim Abruf
+
+    - Live-Endpoints: Sekunden
+    - Tages-Scoreboards: vor gestern nie ablaufen, sonst kurz
+    - Game Logs: vergangene Saisons nie ablaufen, laufende Saison stündlich
+    """
+    if live:
+        return LIVE_TTL
+
+    now = now or datetime.now()
+
+    game_date = _parse_date(parameters.get('GameDate', '')) if parameters.get('GameDate') else None
+    if game_date is not None:
+        return None if game_date < (now - timedelta(days=1)).date() else RECENT_TTL
+
+    season = parameters.get('SeasonNullable') or parameters.get('Season')
+    if season:
+        return None if str(season) < current_season(now.date()) else SEASON_TTL
+
+    return DEFAULT_TTL
+
+
+class NBAApiClient:
+    """Holt nba_api Endpoints über Cache, Token Bucket und Retry"""
+
+    def __init__(self, cache_dir=None, offline=None, rate_limiter=None,
+                 max_attempts=MAX_ATTEMPTS, backoff=BACKOFF, ttl_policy=default_ttl):
+        """
+        Args:
+            cache_dir: Cache-/Fixture-Verzeichnis (Default: NBA_API_CACHE_DIR bzw. <data>/nba_api_cache)
+            offline: Nur aus dem Cache antworten (Default: NBA_API_OFFLINE=1)
+            rate_limiter: Token Bucket (Default: einer pro Prozess)
+            ttl_policy: Funktion (endpoint, parameters, live) -> TTL in Sekunden oder None
+        """
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        if offline is None:
+            offline = os.environ.get('NBA_API_OFFLINE') == '1'
+
+        self.cache_dir = cache_dir
+        self.offline = offline
+        self.rate_limiter = rate_limiter or _shared_bucket
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.ttl_policy = ttl_policy
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.retries = 0
+        self._stats_lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _count(self, counter):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _request_id(endpoint):
+        """(Name, Parameter, live) eines nicht abgeschickten Endpoint-Objekts"""
+        live = type(endpoint).__module__.startswith('nba_api.live')
+        if live:
+            return endpoint.endpoint_url, {}, True
+        return endpoint.endpoint, dict(endpoint.parameters), False
+
+    def cache_path(self, name, parameters):
+        """Cache-Datei: <cache_dir>/<endpoint>/<sha256 von Endpoint + Parametern>.json"""
+        key = hashlib.sha256(
+            json.dumps([name, parameters], sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+        folder = ''.join(c if c.isalnum() else '_' for c in name)
+        return os.path.join(self.cache_dir, folder, f"{key}.json")
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _load(endpoint, entry, live):
+        """Endpoint-Objekt aus einer gespeicherten Antwort befüllen"""
+        if live:
+            from nba_api.live.nba.library.http import NBALiveHTTP as http_class
+        else:
+            from nba_api.stats.library.http import NBAStatsHTTP as http_class
+
+        endpoint.nba_response = http_class.nba_response(
+            response=entry['response'], status_code=entry.get('status_code', 200), url=entry.get('url')
+        )
+        endpoint.load_response()
+        return endpoint
+
+    def _request(self, endpoint, max_attempts):
+        """Request mit Token Bucket und Retry (exponentielles Backoff, volles Jitter)"""
+        for attempt in range(max_attempts):
+            self.rate_limiter.acquire()
+            try:
+                endpoint.get_request()
+                return endpoint
+            except Exception as e:
+                if attempt == max_attempts - 1:
+                    raise
+                self._count('retries')
+                wait = random.uniform(0, self.backoff * 2 ** attempt)
+                print(f"⚠️ {type(endpoint).__name__}: {str(e)[:100]} - neuer Versuch in {wait:.1f}s")
+                time.sleep(wait)
+
+    def fetch(self, endpoint_class, max_attempts=None, **params):
+        """
+        Endpoint abrufen (Cache, sonst API)
+
+        Args:
+            endpoint_class: nba_api Endpoint, z.B. ScoreboardV2
+            max_attempts: Versuche für diesen Aufruf (Default: self.max_attempts)
+            **params: Argumente des Endpoints (game_date=..., timeout=...)
+
+        Returns:
+            Endpoint-Objekt wie beim direkten Aufruf
+        """
+        endpoint = endpoint_class(**params, get_request=False)
+        name, parameters, live = self._request_id(endpoint)
+        path = self.cache_path(name, parameters)
+
+        entry = self._read(path)
+        if entry is not None:
+            expires_at = entry.get('expires_at')
+            if self.offline or expires_at is None or time.time() < expires_at:
+                self._count('hits')
+                return self._load(endpoint, entry, live)
+
+        if self.offline:
+            raise OfflineCacheMiss(f"Keine aufgezeichnete Antwort für {name} {parameters}")
+
+        self._count('misses')
+        try:
+            self._request(endpoint, max_attempts or self.max_attempts)
+        except Exception:
+            # Lieber abgelaufene Daten als gar keine
+            if entry is not None:
+                self._count('stale')
+                print(f"⚠️ {name}: API nicht erreichbar, verwende Cache von "
+                      f"{datetime.fromtimestamp(entry['fetched_at']):%Y-%m-%d %H:%M}")
+                return self._load(endpoint, entry, live)
+            raise
+
+        fetched_at = time.time()
+        ttl = self.ttl_policy(name, parameters, live)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write_json(path, {
+            'endpoint': name,
+            'parameters': parameters,
+            'url': endpoint.nba_response.get_url(),
+            'status_code': getattr(endpoint.nba_response, '_status_code', 200),
+            'fetched_at': fetched_at,
+            'expires_at': None if ttl is None else fetched_at + ttl,
+            'response': endpoint.nba_response.get_response()
+        }, indent=None)
+
+        return endpoint
+
+    def info(self):
+        """Cache-Statistiken für /api/health"""
+        with self._stats_lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'retries': self.retries,
+                'offline': self.offline,
+                'cache_dir': self.cache_dir
+            }
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(cache_dir=None):
+    """Gemeinsamer Client pro Cache-Verzeichnis (Statistiken und Cache geteilt)"""
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+
+    with _clients_lock:
+        client = _clients.get(cache_dir)
+        if client is None:
+            client = _clients[cache_dir] = NBAApiClient(cache_dir)
+        return client
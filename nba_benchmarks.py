@@ -0,0 +1,970 @@
+#!/usr/bin/env python3
+"""
+NBA Benchmarks
+Misst die Laufzeit der performance-kritischen Pfade
+
+Usage: python nba_benchmarks.py <benchmark> [args]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+
+def _measure(func, repeat=5, number=1):
+    """Beste Laufzeit (Sekunden) pro Aufruf über mehrere Wiederholungen"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _format_time(seconds):
+    """Formatiert eine Laufzeit lesbar (µs / ms / s)"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.2f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def benchmark_synergy():
+    """
+    Kosten pro Lineup: dict-Pfad (Schwellwert-Checks auf Roh-Stats bei
+    jedem Aufruf) gegen SynergyEngine mit vorberechneten Features
+    """
+    from nba_synergy_system import TeamSynergyCalculator
+    
+    calc = TeamSynergyCalculator()
+    engine = calc.engine
+    rng = np.random.default_rng(42)
+    
+    def random_lineups(n):
+        return np.array([rng.choice(len(engine.names), 5, replace=False) for _ in range(n)])
+    
+    print("\n" + "="*60)
+    print("⏱  SYNERGY BENCHMARK (Kosten pro Lineup)")
+    print("="*60)
+    
+    # Vorher: dict-Pfad, ein Lineup nach dem anderen
+    indices = random_lineups(1000)
+    lineups = [[calc.players[engine.names[i]] for i in row] for row in indices]
+    
+    def dict_path():
+        for lineup in lineups:
+            calc.calculate_team_stats(lineup)
+            calc.calculate_all_synergies(lineup)
+    
+    per_lineup = _measure(dict_path, repeat=3) / len(lineups)
+    print(f"\n  dict-Pfad (vorher):      {_format_time(per_lineup)} pro Lineup")
+    
+    # Gleichheit: Engine und Lineup-Cache (kalt) müssen bitgenau dem dict-Pfad entsprechen
+    expected = [(calc.calculate_team_stats(lineup), calc.calculate_all_synergies(lineup)) for lineup in lineups]
+    stats, synergies = engine.evaluate(indices)
+    calc.cache.clear()
+    profiles = calc.get_lineup_profiles([[engine.names[i] for i in row] for row in indices])
+    for row, (team_stats, team_synergies) in enumerate(expected):
+        assert all(float(stats[key][row]) == value for key, value in team_stats.items())
+        assert all(float(synergies[key][row]) == value for key, value in team_synergies.items())
+        assert profiles[row]['stats'] == {key: float(value) for key, value in team_stats.items()}
+        assert profiles[row]['synergies'] == {key: float(value) for key, value in team_synergies.items()}
+    print(f"  ✓ evaluate und get_lineup_profiles bitgenau gleich dem dict-Pfad ({len(lineups)} Lineups)")
+    
+    # Nachher: Engine mit vorberechneten Features
+    for n in (1, 1000, 100000):
+        indices = random_lineups(n)
+        number = max(1, 10000 // n)
+        per_lineup = _measure(lambda: engine.evaluate(indices), number=number) / n
+        print(f"  SynergyEngine (N={n:>6}): {_format_time(per_lineup)} pro Lineup")
+    
+    print("\n" + "="*60)
+
+
+def benchmark_simulation():
+    """Laufzeit der Monte-Carlo-Simulation für verschiedene n_sims"""
+    from nba_game_simulator import GameSimulator
+    
+    simulator = GameSimulator()
+    calc = simulator.predictor.synergy_calc
+    lineup1 = calc.get_default_lineup('LAL')
+    lineup2 = calc.get_default_lineup('BOS')
+    
+    print("\n" + "="*60)
+    print("⏱  SIMULATION BENCHMARK")
+    print("="*60 + "\n")
+    
+    for n_sims in (1000, 10000, 100000, 1000000):
+        elapsed = _measure(lambda: simulator.simulate(lineup1, lineup2, n_sims=n_sims, seed=1))
+        print(f"  n_sims={n_sims:>8}: {_format_time(elapsed)}")
+    
+    print("\n" + "="*60)
+
+
+def _stats_from_history(predictions):
+    """Alte update_stats-Logik: Totals und Tages-Buckets über alle Vorhersagen"""
+    checked = [p for p in predictions if p['checked']]
+    by_day = {}
+    for p in checked:
+        day = by_day.setdefault(p['date'], {'total': 0, 'correct': 0})
+        day['total'] += 1
+        if p['was_correct']:
+            day['correct'] += 1
+    return len(checked), sum(1 for p in checked if p['was_correct']), by_day
+
+
+def benchmark_prediction_log():
+    """
+    Kosten pro geloggter Vorhersage: ganze JSON-Datei neu schreiben (vorher)
+    gegen die Storage-Backends (JSONL-Log, SQLite), dazu Kaltstart und Queries
+    """
+    import contextlib
+    import io
+    import json
+    import tempfile
+    from nba_prediction_store import STORE_CLASSES, build_stats
+    from nba_prediction_tracker import PredictionTracker
+    
+    def entry(i):
+        return dict(team1='LAL', team2='BOS', predicted_winner='LAL',
+                    predicted_score='112-108', confidence=57.5,
+                    game_date=f"2026-{1 + i // 3000 % 12:02d}-{1 + i % 28:02d}")
+    
+    print("\n" + "="*60)
+    print("⏱  PREDICTION LOG BENCHMARK")
+    print("="*60 + "\n")
+    
+    # Vorher: jede Vorhersage liest und schreibt die komplette Historie
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, 'predictions_history.json')
+        tracker = PredictionTracker(data_dir)
+        for n in (1000, 5000, 10000):
+            history = [tracker._make_prediction(**entry(i)) for i in range(n)]
+            with open(path, 'w') as f:
+                json.dump(history, f, indent=2)
+            
+            def rewrite():
+                with open(path, 'r') as f:
+                    predictions = json.load(f)
+                predictions.append(tracker._make_prediction(**entry(n)))
+                with open(path, 'w') as f:
+                    json.dump(predictions, f, indent=2)
+            
+            print(f"  JSON neu schreiben (Historie {n:>6}): {_format_time(_measure(rewrite, repeat=3))} pro Vorhersage")
+    
+    # Nachher: 100k Vorhersagen über die Storage-Backends
+    n_total = 100000
+    for backend in STORE_CLASSES:
+        with tempfile.TemporaryDirectory() as data_dir:
+            tracker = PredictionTracker(data_dir, backend=backend)
+            times = np.empty(n_total)
+            
+            with contextlib.redirect_stdout(io.StringIO()):
+                for i in range(n_total):
+                    start = time.perf_counter()
+                    tracker.log_prediction(**entry(i))
+                    times[i] = time.perf_counter() - start
+            
+            print(f"\n  Backend {backend}, {n_total} Vorhersagen: {_format_time(times.sum())} gesamt")
+            print(f"    pro Vorhersage: Mittel {_format_time(times.mean())}, "
+                  f"p99 {_format_time(np.percentile(times, 99))}, "
+                  f"Max {_format_time(times.max())}")
+            
+            start = time.perf_counter()
+            cold = STORE_CLASSES[backend](data_dir)
+            n_loaded = len(cold)
+            print(f"    Kaltstart:        {_format_time(time.perf_counter() - start)} "
+                  f"für {n_loaded} Vorhersagen")
+            
+            elapsed = _measure(lambda: cold.find_unchecked('2026-01-01', 'LAL', 'BOS'), number=20)
+            print(f"    find_unchecked:   {_format_time(elapsed)}")
+            # Jede zweite Vorhersage checken, damit die Stats etwas zu zählen haben
+            first_day = cold.find_unchecked('2026-01-01', 'LAL', 'BOS')
+            cold.update([(key, {'checked': True, 'was_correct': i % 3 > 0})
+                         for i, (key, _) in enumerate(first_day)])
+            elapsed = _measure(lambda: build_stats(cold.accuracy_stats()), repeat=3)
+            print(f"    Stats (Aggregat): {_format_time(elapsed)}")
+            elapsed = _measure(lambda: _stats_from_history(cold.predictions()), repeat=3)
+            print(f"    Stats (Historie): {_format_time(elapsed)} (vorher: Neuberechnung)")
+            elapsed = _measure(cold.predictions, repeat=3)
+            print(f"    predictions():    {_format_time(elapsed)}")
+    
+    print("\n" + "="*60)
+
+
+def benchmark_matching():
+    """
+    Ergebnis-Matching über eine Historie von 50k Vorhersagen: verschachtelte
+    Schleifen der Checker (vorher) gegen den Hash-Index des ResultMatcher
+    """
+    from nba_result_matcher import ResultMatcher
+    from nba_teams import TEAMS, TEAM_NAMES
+    
+    rng = np.random.default_rng(7)
+    abbrs = list(TEAMS)
+    n_predictions, n_days = 50000, 400
+    
+    def date(day):
+        return f"D{day:04d}"
+    
+    predictions = []
+    for i in range(n_predictions):
+        home, away = rng.choice(abbrs, 2, replace=False)
+        predictions.append({
+            'date': date(i % n_days), 'team1': home, 'team2': away,
+            'predicted_winner': TEAM_NAMES[home], 'checked': i % n_days < n_days - 30
+        })
+    
+    # Ergebnisse der letzten 30 Tage (15 Spiele pro Tag, jedes Team einmal)
+    results = []
+    for day in range(n_days - 30, n_days):
+        teams = rng.permutation(abbrs)
+        for home, away in zip(teams[::2], teams[1::2]):
+            results.append({'date': date(day), 'home_team': home, 'away_team': away, 'winner': home})
+    
+    def nested_loops():
+        matched = 0
+        for result in results:
+            for prediction in predictions:
+                if (not prediction.get('checked', False) and
+                    prediction.get('date') == result['date']):
+                    pred_teams = {prediction.get('team1'), prediction.get('team2')}
+                    result_teams = {result['home_team'], result['away_team']}
+                    if pred_teams == result_teams:
+                        matched += 1
+        return matched
+    
+    def hash_index():
+        unchecked = [(i, p) for i, p in enumerate(predictions) if not p['checked']]
+        return len(ResultMatcher(unchecked).match(results))
+    
+    assert nested_loops() == hash_index()
+    
+    print("\n" + "="*60)
+    print(f"⏱  MATCHING BENCHMARK ({n_predictions} Vorhersagen, {len(results)} Ergebnisse)")
+    print("="*60 + "\n")
+    print(f"  Verschachtelte Schleifen (vorher): {_format_time(_measure(nested_loops, repeat=1))}")
+    print(f"  ResultMatcher (Index + Match):     {_format_time(_measure(hash_index))}")
+    print("\n" + "="*60)
+
+
+class _Frame:
+    """Minimaler nba_api-Datensatz: get_data_frame() liefert einen festen DataFrame"""
+    
+    def __init__(self, df):
+        self.df = df
+    
+    def get_data_frame(self):
+        return self.df
+
+
+def _scheduled_board(n_games, seed=11):
+    """Synthetisches ScoreboardV2 mit n_games geplanten Spielen"""
+    import pandas as pd
+    from types import SimpleNamespace
+    from nba_teams import TEAMS
+    
+    rng = np.random.default_rng(seed)
+    abbrs = list(TEAMS)
+    ids = {abbr: 1610612737 + i for i, abbr in enumerate(abbrs)}
+    
+    header, lines = [], []
+    for i in range(n_games):
+        home, away = rng.choice(abbrs, 2, replace=False)
+        header.append({'GAME_ID': f"{22500000 + i:010d}", 'GAME_STATUS_TEXT': '7:30 pm ET',
+                       'HOME_TEAM_ID': ids[home], 'VISITOR_TEAM_ID': ids[away],
+                       'MATCHUP': f"{away} @ {home}"})
+        # Jedes dritte Spiel ohne line_score, damit auch der MATCHUP-Pfad läuft
+        if i % 3:
+            lines += [{'GAME_ID': header[-1]['GAME_ID'], 'TEAM_ID': ids[t], 'TEAM_ABBREVIATION': t}
+                      for t in (away, home)]
+    
+    return SimpleNamespace(
+        game_header=_Frame(pd.DataFrame(header)),
+        line_score=_Frame(pd.DataFrame(lines, columns=['GAME_ID', 'TEAM_ID', 'TEAM_ABBREVIATION'])),
+        series_standings=_Frame(pd.DataFrame(columns=['GAME_ID', 'HOME_TEAM_ID', 'VISITOR_TEAM_ID']))
+    )
+
+
+def _parse_iterrows(board, date):
+    """Alte Parser-Logik von get_tomorrows_games_safe: iterrows + Filter pro Zeile"""
+    from nba_teams import TEAM_NAMES
+    
+    games_df = board.game_header.get_data_frame()
+    series_df = board.line_score.get_data_frame()
+    parsed = []
+    for _, game in games_df.iterrows():
+        home_abbr = away_abbr = None
+        home_row = series_df[series_df['TEAM_ID'] == game['HOME_TEAM_ID']]
+        away_row = series_df[series_df['TEAM_ID'] == game['VISITOR_TEAM_ID']]
+        if not home_row.empty:
+            home_abbr = home_row.iloc[0].get('TEAM_ABBREVIATION', '')
+        if not away_row.empty:
+            away_abbr = away_row.iloc[0].get('TEAM_ABBREVIATION', '')
+        if not away_abbr or not home_abbr:
+            away_abbr, home_abbr = [part.strip() for part in game['MATCHUP'].split(' @ ')]
+        team_name_map = dict(TEAM_NAMES)
+        parsed.append({
+            'game_id': game['GAME_ID'], 'date': date, 'time': game.get('GAME_STATUS_TEXT', 'TBD'),
+            'team1_abbr': home_abbr, 'team2_abbr': away_abbr,
+            'team1_name': team_name_map.get(home_abbr, home_abbr),
+            'team2_name': team_name_map.get(away_abbr, away_abbr),
+            'matchup': f"{home_abbr} vs {away_abbr}", 'status': 'Scheduled'
+        })
+    return parsed
+
+
+def benchmark_games_fallback():
+    """
+    Spiele laden mit Fallback auf morgen: ScoreboardV2-Parsing (iterrows gegen
+    spaltenweise) und Latenz / Morgen-Abrufe sequentiell gegen gehedgt bei
+    simulierter API-Latenz
+    """
+    import contextlib
+    import io
+    from nba_games_loader import NBAGamesLoader
+    
+    print("\n" + "="*60)
+    print("⏱  GAMES FALLBACK BENCHMARK")
+    print("="*60 + "\n")
+    
+    for n_games in (15, 500):
+        board = _scheduled_board(n_games)
+        assert _parse_iterrows(board, 'D') == NBAGamesLoader.parse_scheduled_games(board, 'D')
+        old = _measure(lambda: _parse_iterrows(board, 'D'), repeat=3)
+        new = _measure(lambda: NBAGamesLoader.parse_scheduled_games(board, 'D'))
+        print(f"  Parsen {n_games:>3} Spiele: iterrows {_format_time(old)}, "
+              f"spaltenweise {_format_time(new)} ({old / new:.1f}x)")
+    
+    today_latency, tomorrow_latency = 0.3, 0.4
+    tomorrow_board = _scheduled_board(15)
+    
+    class SlowClient:
+        calls = 0
+        
+        def fetch(self, endpoint, **params):
+            self.calls += 1
+            time.sleep(tomorrow_latency)
+            return tomorrow_board
+    
+    class StubLoader(NBAGamesLoader):
+        today, today_latency = [], 0.0
+        
+        def get_todays_games(self, include_finished=False, raise_errors=False):
+            time.sleep(self.today_latency)
+            return list(self.today)
+    
+    print(f"\n  Simulierte Latenz: heute {today_latency * 1000:.0f} ms, "
+          f"morgen {tomorrow_latency * 1000:.0f} ms (vorher zusätzlich 1 s sleep)")
+    
+    scenarios = [
+        ('heute leer', [], today_latency, 15),
+        ('heute 2 Spiele', [{'game_id': 'g1'}, {'game_id': 'g2'}], today_latency, 15),
+        ('heute langsam (1.5 s), leer', [], 1.5, 15),
+        ('heute hängt (Timeout 1 s)', [{'game_id': 'g1'}], 3.0, 1)
+    ]
+    print("    (Spiele, Morgen-Abrufe; Hedge nach 1 s, Timeout heute -> letzter Stand bzw. Mock)")
+    for label, today, latency, timeout in scenarios:
+        row = []
+        for concurrent in (False, True):
+            client = SlowClient()
+            loader = StubLoader(concurrent=concurrent, timeout=timeout, client=client)
+            loader.today, loader.today_latency = today, latency
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                games = loader.get_games_with_fallback()
+            row.append(f"{_format_time(time.perf_counter() - start)} ({len(games)}, {client.calls})")
+        print(f"    {label:<29} sequentiell {row[0]:<20} gehedgt {row[1]}")
+    
+    print("\n" + "="*60)
+
+
+def _season_games(n_games, seed=3):
+    """Synthetische LeagueGameFinder-Saison: 2 Zeilen pro Spiel, ein paar unvollständige"""
+    import pandas as pd
+    from nba_teams import TEAMS
+    
+    rng = np.random.default_rng(seed)
+    abbrs = list(TEAMS)
+    start = np.datetime64('2023-10-24')
+    
+    rows = []
+    for i in range(n_games):
+        home, away = rng.choice(len(abbrs), 2, replace=False)
+        date = str(start + int(i * 170 / n_games))
+        home_won = rng.random() < 0.58
+        for team, is_home in ((home, True), (away, False)):
+            matchup = (f"{abbrs[home]} vs. {abbrs[away]}" if is_home
+                       else f"{abbrs[away]} @ {abbrs[home]}")
+            rows.append({
+                'SEASON_ID': '22023', 'TEAM_ID': 1610612737 + int(team), 'GAME_ID': f"{22300001 + i:010d}",
+                'GAME_DATE': date, 'MATCHUP': matchup, 'WL': 'W' if home_won == is_home else 'L',
+                'PTS': int(rng.integers(85, 140)), 'FG_PCT': round(rng.uniform(0.38, 0.55), 3),
+                'FG3_PCT': round(rng.uniform(0.25, 0.45), 3) if rng.random() > 0.01 else np.nan,
+                'FT_PCT': round(rng.uniform(0.65, 0.9), 3), 'REB': int(rng.integers(30, 60)),
+                'AST': int(rng.integers(15, 35)), 'STL': int(rng.integers(3, 14)),
+                'BLK': int(rng.integers(1, 10)), 'TOV': int(rng.integers(8, 22))
+            })
+    
+    games = pd.DataFrame(rows)
+    # ~1% der Spiele nur mit einer Zeile (wie bei abgebrochenen Abrufen)
+    return games.drop(index=rng.choice(len(games), n_games // 100, replace=False)).reset_index(drop=True)
+
+
+def _matchups_loop(games_df):
+    """Alte create_matchup_dataset-Logik: ein Filter über den ganzen Frame pro Spiel"""
+    import pandas as pd
+    
+    matchups = []
+    for game_id in games_df['GAME_ID'].unique():
+        game_data = games_df[games_df['GAME_ID'] == game_id]
+        if len(game_data) != 2:
+            continue
+        team1, team2 = game_data.iloc[0], game_data.iloc[1]
+        matchup = {'GAME_DATE': team1['GAME_DATE'], 'TEAM1_ID': team1['TEAM_ID'],
+                   'TEAM2_ID': team2['TEAM_ID'], 'TEAM1_HOME': team1['IS_HOME']}
+        for prefix, team in (('TEAM1', team1), ('TEAM2', team2)):
+            matchup.update({
+                f'{prefix}_PTS_AVG': team['PTS_ROLLING_5'], f'{prefix}_FG_PCT': team['FG_PCT_ROLLING_5'],
+                f'{prefix}_FG3_PCT': team['FG3_PCT_ROLLING_5'], f'{prefix}_REB_AVG': team['REB_ROLLING_5'],
+                f'{prefix}_AST_AVG': team['AST_ROLLING_5'], f'{prefix}_TOV_AVG': team['TOV_ROLLING_5']
+            })
+        matchup['TEAM1_WON'] = team1['WON']
+        matchups.append(matchup)
+    return pd.DataFrame(matchups)
+
+
+def benchmark_matchups():
+    """
+    Matchup-Dataset aus einer Saison: Filter pro Spiel (vorher, dazu 0.1s
+    sleep pro Spiel) gegen groupby/merge; die CSV muss byte-identisch sein
+    """
+    import contextlib
+    import io
+    from nba_data_collector import NBADataCollector
+    
+    print("\n" + "="*60)
+    print("⏱  MATCHUP DATASET BENCHMARK")
+    print("="*60 + "\n")
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        collector = NBADataCollector()
+    
+    for n_games in (1230, 5000):
+        games = collector.prepare_training_data(_season_games(n_games))
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            new = collector.create_matchup_dataset(games)
+        old = _matchups_loop(games)
+        assert old.to_csv(index=False) == new.to_csv(index=False), "CSV nicht identisch"
+        
+        def vectorized():
+            with contextlib.redirect_stdout(io.StringIO()):
+                collector.create_matchup_dataset(games)
+        
+        loop_time = _measure(lambda: _matchups_loop(games), repeat=1)
+        new_time = _measure(vectorized)
+        print(f"  {n_games} Spiele ({len(new)} Matchups), CSV byte-identisch:")
+        print(f"    Filter pro Spiel: {_format_time(loop_time)} "
+              f"(+ {_format_time(len(new) * 0.1)} sleep vorher)")
+        print(f"    groupby/merge:    {_format_time(new_time)} ({loop_time / new_time:.0f}x)")
+    
+    print("\n" + "="*60)
+
+
+def benchmark_model_serving():
+    """
+    ML-Modell aus nba_model.pkl: predict + predict_proba pro Spiel (vorher)
+    gegen ein predict_proba, Micro-Batching bei parallelen Requests und Batches
+    """
+    import contextlib
+    import io
+    import joblib
+    from concurrent.futures import ThreadPoolExecutor
+    from nba_ml_model import game_features
+    from nba_model_server import DEFAULT_MODEL_PATH, ModelServer
+    
+    rng = np.random.default_rng(5)
+    
+    def team():
+        return {'PTS_AVG': rng.uniform(100, 125), 'FG_PCT': rng.uniform(0.42, 0.5),
+                'FG3_PCT': rng.uniform(0.32, 0.4), 'REB_AVG': rng.uniform(40, 48),
+                'AST_AVG': rng.uniform(22, 30), 'TOV_AVG': rng.uniform(11, 16)}
+    
+    games = [(team(), team(), bool(i % 2)) for i in range(512)]
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        server = ModelServer()
+    
+    # Vorher: Modell wie gespeichert (n_jobs=-1), predict und predict_proba getrennt.
+    # Immer aus der .pkl - entry['path'] ist das Artifact-Verzeichnis, falls gebaut
+    model_path = os.environ.get('MODEL_PATH', DEFAULT_MODEL_PATH)
+    if os.path.isdir(model_path):
+        model_path = DEFAULT_MODEL_PATH
+    stored = joblib.load(model_path)
+    
+    def old_predict(game):
+        features = stored['scaler'].transform(np.array([game_features(*game)]))
+        return stored['model'].predict(features)[0], stored['model'].predict_proba(features)[0]
+    
+    predictor = server.predictor
+    for game in games[:20]:
+        label, proba = old_predict(game)
+        result = predictor.predict_game(*game)
+        assert np.allclose(proba, [result['team2_win_probability'], result['team1_win_probability']])
+        assert (label == 1) == (result['winner'] == 'Team 1')
+    
+    print("\n" + "="*60)
+    print(f"⏱  MODEL SERVING BENCHMARK ({type(stored['model']).__name__}, aus {server.entry['path']})")
+    print("="*60 + "\n")
+    
+    print("  Einzelnes Spiel (Latenz):")
+    print(f"    predict + predict_proba, n_jobs=-1 (vorher):  {_format_time(_measure(lambda: old_predict(games[0]), number=10))}")
+    print(f"    predict_game (kompiliert, ein predict_proba): {_format_time(_measure(lambda: predictor.predict_game(*games[0]), number=20))}")
+    print(f"    ModelServer.predict (Queue + Batch-Thread):   {_format_time(_measure(lambda: server.predict(*games[0]), number=20))}")
+    
+    print("\n  Batch (predict_many), Kosten pro Spiel:")
+    for size in (1, 16, 128, 512):
+        elapsed = _measure(lambda: server.predict_many(games[:size]), repeat=3)
+        print(f"    {size:>4} Spiele: {_format_time(elapsed / size)}")
+    
+    n_requests, concurrency = 512, 16
+    server = ModelServer()  # gleiches Modell aus der Registry, frische Statistik
+    print(f"\n  Durchsatz, {n_requests} Einzel-Requests aus {concurrency} Threads:")
+    for label, func in (('ohne Batching', lambda game: predictor.predict_game(*game)),
+                        ('Micro-Batching', lambda game: server.predict(*game))):
+        with ThreadPoolExecutor(concurrency) as pool:
+            start = time.perf_counter()
+            list(pool.map(func, games[:n_requests]))
+            elapsed = time.perf_counter() - start
+        print(f"    {label:<15} {n_requests / elapsed:>8.0f} req/s")
+    
+    info = server.info()
+    print(f"    Batches: {info['batches']}, Mittel {info['avg_batch']}, größter {info['largest_batch']}")
+    print("\n" + "="*60)
+
+
+def benchmark_compiled_model():
+    """
+    Flache Arrays (nba_tree_compiler) gegen sklearn predict_proba: Abweichung,
+    Latenz für eine Zeile und Kosten pro Zeile im Batch
+    """
+    import warnings
+    import joblib
+    import pandas as pd
+    from nba_tree_compiler import compile_ensemble
+    
+    # sklearn-Versions- und Feature-Namen-Warnungen (Modell mit älterem sklearn gespeichert)
+    warnings.filterwarnings('ignore')
+    
+    stored = joblib.load('nba_model.pkl')
+    model, scaler = stored['model'], stored['scaler']
+    model.n_jobs = 1
+    
+    X = pd.read_csv('nba_training_data.csv').dropna()[stored['feature_columns']].to_numpy(dtype=float)
+    
+    start = time.perf_counter()
+    compiled = compile_ensemble(model, scaler)
+    compile_time = time.perf_counter() - start
+    
+    max_diff = np.abs(model.predict_proba(scaler.transform(X)) - compiled.predict_proba(X)).max()
+    assert max_diff < 1e-9
+    
+    info = compiled.info()
+    print("\n" + "="*60)
+    print(f"⏱  COMPILED MODEL BENCHMARK ({info['trees']} Bäume, {info['nodes']} Knoten, "
+          f"{info['bytes'] / 1e6:.1f} MB)")
+    print("="*60 + "\n")
+    print(f"  Kompilieren:        {_format_time(compile_time)}")
+    print(f"  Max. Abweichung:    {max_diff:.1e} ({len(X)} Trainingszeilen)")
+    
+    row = X[:1]
+    sklearn_time = _measure(lambda: model.predict_proba(scaler.transform(row)), number=10)
+    compiled_time = _measure(lambda: compiled.predict_proba(row), number=200)
+    print("\n  Eine Zeile:")
+    print(f"    sklearn (Scaler + predict_proba): {_format_time(sklearn_time)}")
+    print(f"    kompiliert:                       {_format_time(compiled_time)} "
+          f"({sklearn_time / compiled_time:.0f}x)")
+    
+    print("\n  Batch, Kosten pro Zeile:")
+    for size in (16, 256, len(X)):
+        batch = X[:size]
+        sklearn_time = _measure(lambda: model.predict_proba(scaler.transform(batch)), repeat=3)
+        compiled_time = _measure(lambda: compiled.predict_proba(batch), repeat=3)
+        print(f"    {size:>5} Zeilen: sklearn {_format_time(sklearn_time / size)}, "
+              f"kompiliert {_format_time(compiled_time / size)}")
+    
+    print("\n" + "="*60)
+
+
+# Worker für benchmark_model_artifact: lädt das Modell, rechnet alle Zeilen
+# (alle Seiten angefasst), meldet "ready" und misst erst, wenn alle Worker laufen
+_ARTIFACT_WORKER = """
+import json, sys, time, warnings
+warnings.filterwarnings('ignore')
+import numpy as np
+import nba_model_artifact
+from nba_ml_model import NBAPredictor
+
+def memory(field, path='/proc/self/status'):
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+def barrier():
+    print('ready', flush=True)
+    sys.stdin.readline()
+    return memory('VmRSS'), memory('Pss', '/proc/self/smaps_rollup')
+
+variant, source, rows = sys.argv[1:4]
+X = np.load(rows)
+rss_before, pss_before = barrier()
+
+start = time.perf_counter()
+predictor = NBAPredictor()
+if variant == 'pickle':
+    predictor.load_model(source)
+    predictor.compile()
+else:
+    predictor.load_artifact(source)
+load_time = time.perf_counter() - start
+predictor.predict_proba(X)
+
+rss_after, pss_after = barrier()
+print(json.dumps({
+    'load': load_time,
+    'rss': rss_after - rss_before,
+    'pss': pss_after - pss_before if pss_before is not None else None
+}), flush=True)
+"""
+
+
+def _run_artifact_workers(variant, source, rows, n_workers):
+    """
+    Startet n_workers gleichzeitig, gibt ihre Messwerte zurück. Zwei Barrieren:
+    vor und nach dem Laden messen alle Worker, während alle laufen (PSS hängt
+    von der Zahl der Prozesse ab, die eine Seite teilen)
+    """
+    import json
+    import subprocess
+    
+    procs = [
+        subprocess.Popen([sys.executable, '-c', _ARTIFACT_WORKER, variant, source, rows],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(n_workers)
+    ]
+    
+    def barrier():
+        for proc in procs:
+            while proc.stdout.readline().strip() != 'ready':
+                if proc.poll() is not None:
+                    raise RuntimeError(f"Worker ({variant}) abgebrochen")
+        for proc in procs:
+            proc.stdin.write('\n')
+            proc.stdin.flush()
+    
+    try:
+        barrier()
+        barrier()
+        return [json.loads(proc.stdout.readline()) for proc in procs]
+    finally:
+        for proc in procs:
+            proc.kill()
+            proc.wait()
+
+
+def benchmark_model_artifact():
+    """
+    nba_model.pkl (joblib + kompilieren) gegen das Artifact-Verzeichnis (mmap):
+    Ladezeit und Speicher pro Worker-Prozess, mehrere Worker gleichzeitig
+    
+    RSS zählt gemeinsam genutzte Seiten in jedem Prozess voll, PSS teilt sie
+    durch die Zahl der Prozesse - die Summe der PSS ist der echte Verbrauch.
+    """
+    import tempfile
+    import warnings
+    import pandas as pd
+    from nba_model_artifact import convert
+    
+    warnings.filterwarnings('ignore')
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_dir = os.path.join(tmp, 'nba_model')
+        manifest = convert('nba_model.pkl', artifact_dir)
+        
+        X = pd.read_csv('nba_training_data.csv').dropna()[manifest['feature_columns']]
+        rows = os.path.join(tmp, 'rows.npy')
+        np.save(rows, X.to_numpy(dtype=float))
+        
+        print("\n" + "="*60)
+        print(f"⏱  MODEL ARTIFACT BENCHMARK ({n_workers} Worker-Prozesse gleichzeitig)")
+        print("="*60 + "\n")
+        print(f"  {'':<24}{'Laden':>12}{'RSS/Worker':>14}{'PSS/Worker':>14}{'PSS gesamt':>14}")
+        
+        def mb(value):
+            return f"{value / 1e6:.1f} MB" if value is not None else "n/a"
+        
+        for label, variant, source in (('pickle + kompilieren', 'pickle', 'nba_model.pkl'),
+                                       ('Artifact (mmap)', 'artifact', artifact_dir)):
+            results = _run_artifact_workers(variant, source, rows, n_workers)
+            pss = [r['pss'] for r in results]
+            pss_total = sum(pss) if None not in pss else None
+            print(f"  {label:<24}{_format_time(np.median([r['load'] for r in results])):>12}"
+                  f"{mb(np.median([r['rss'] for r in results])):>14}"
+                  f"{mb(pss_total / n_workers if pss_total is not None else None):>14}{mb(pss_total):>14}")
+    
+    print("\n  (Zuwachs durch Laden + einen Durchlauf über alle Trainingszeilen)")
+    print("\n" + "="*60)
+
+
+def benchmark_model_search():
+    """
+    Hyperparameter-Suche (nba_model_search): Fold-Cache kalt/warm und Wall Time
+    für dieselben Konfigurationen mit einem Worker gegen alle Kerne
+    """
+    import tempfile
+    import warnings
+    import pandas as pd
+    from nba_ml_model import NBAPredictor
+    from nba_model_search import ModelSearch, build_fold_cache, search_configs
+    
+    warnings.filterwarnings('ignore')
+    n_configs = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    workers = os.cpu_count() or 1
+    
+    df = pd.read_csv('nba_training_data.csv').sort_values('GAME_DATE', kind='stable')
+    features, labels = NBAPredictor().prepare_features(df)
+    dates = df.loc[features.index, 'GAME_DATE']
+    configs = search_configs()[:n_configs]
+    
+    print("\n" + "="*60)
+    print(f"⏱  MODEL SEARCH BENCHMARK ({n_configs} Konfigurationen, {len(features)} Spiele, {workers} Kerne)")
+    print("="*60 + "\n")
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        build_fold_cache(features.to_numpy(), labels.to_numpy(), dates, cache_dir=cache_dir)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        build_fold_cache(features.to_numpy(), labels.to_numpy(), dates, cache_dir=cache_dir)
+        warm = time.perf_counter() - start
+        print(f"  Fold-Cache: kalt {_format_time(cold)}, warm {_format_time(warm)}\n")
+        
+        timings = {}
+        for n in sorted({1, workers}):
+            search = ModelSearch(workers=n, patience=None, cache_dir=cache_dir)
+            search.run(df, configs)
+            timings[n] = search.wall_time
+    
+    print()
+    for n, wall in timings.items():
+        print(f"  {n:>2} Worker: {wall:.1f}s ({timings[1] / wall:.1f}x)")
+    print("\n" + "="*60)
+
+
+def benchmark_incremental_update():
+    """
+    Inkrementelles Update (nba_model_updater, warm_start auf den letzten Spielen)
+    gegen komplettes Neutraining, während die Daten über mehrere Saisons wachsen.
+    Mehr Saisons = Trainingsdaten vervielfacht mit leichtem Rauschen.
+    """
+    import copy
+    import warnings
+    import pandas as pd
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    from nba_ml_model import NBAPredictor
+    from nba_model_updater import STAGES, WINDOW, update_model
+    
+    warnings.filterwarnings('ignore')
+    max_seasons = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    
+    X, y = NBAPredictor().prepare_features(pd.read_csv('nba_training_data.csv'))
+    rng = np.random.default_rng(42)
+    
+    families = {
+        # Parameter wie in NBAPredictor.train_model, ein Kern
+        'Random Forest': lambda: RandomForestClassifier(n_estimators=200, max_depth=10, min_samples_split=10,
+                                                        random_state=42, n_jobs=1),
+        'Gradient Boosting': lambda: GradientBoostingClassifier(n_estimators=100, learning_rate=0.1,
+                                                                max_depth=5, random_state=42)
+    }
+    
+    print("\n" + "="*60)
+    print(f"⏱  INCREMENTAL UPDATE BENCHMARK (+{STAGES} Stufen auf den letzten {WINDOW} Spielen)")
+    print("="*60)
+    
+    for family, make_model in families.items():
+        print(f"\n  {family}:")
+        seasons = 1
+        while seasons <= max_seasons:
+            noise = rng.normal(1.0, 0.01, size=(len(X) * seasons, X.shape[1]))
+            X_all = pd.DataFrame(np.tile(X.to_numpy(), (seasons, 1)) * noise, columns=X.columns)
+            X_all['TEAM1_HOME'] = np.tile(X['TEAM1_HOME'].to_numpy(), seasons)
+            y_all = pd.Series(np.tile(y.to_numpy(), seasons))
+            
+            start = time.perf_counter()
+            predictor = NBAPredictor()
+            predictor.model = make_model().fit(predictor.scaler.fit_transform(X_all), y_all)
+            full_time = time.perf_counter() - start
+            
+            def update():
+                updated = copy.deepcopy(predictor)
+                update_model(updated, X_all.tail(WINDOW), y_all.tail(WINDOW))
+            update_time = _measure(update, repeat=3)
+            
+            print(f"    {seasons} Saison(s), {len(X_all):>6} Spiele: Neutraining {_format_time(full_time):>10}, "
+                  f"Update {_format_time(update_time):>10} ({full_time / update_time:.0f}x)")
+            seasons *= 2
+    
+    print("\n" + "="*60)
+
+
+def _run_load(base_url, predict_body, n_requests=400, concurrency=16):
+    """
+    Feuert gemischte Requests (/api/predict + /api/players) parallel ab.
+    Gibt (requests/s, p50, p95, Fehler) zurück.
+    """
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+    
+    def one(i):
+        if i % 2 == 0:
+            req = urllib.request.Request(
+                f"{base_url}/api/predict", data=predict_body,
+                headers={'Content-Type': 'application/json'}
+            )
+        else:
+            req = urllib.request.Request(f"{base_url}/api/players")
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                resp.read()
+                ok = resp.status == 200
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n_requests)))
+    elapsed = time.perf_counter() - start
+    
+    latencies = np.array([r[0] for r in results])
+    errors = sum(1 for r in results if not r[1])
+    return (n_requests / elapsed, np.percentile(latencies, 50),
+            np.percentile(latencies, 95), errors)
+
+
+def _start_server(cmd, port, env):
+    """Startet einen Server-Prozess und wartet bis /api/health antwortet"""
+    import subprocess
+    import urllib.request
+    
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=2):
+                return proc
+        except Exception:
+            if proc.poll() is not None:
+                break
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"Server startet nicht: {' '.join(cmd)}")
+
+
+def _free_port():
+    import socket
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def benchmark_load():
+    """
+    Durchsatz unter parallelen Requests: Flask Dev-Server gegen gunicorn.
+    Mit URL-Argument wird nur ein bereits laufender Server gemessen.
+    """
+    import json
+    import tempfile
+    from nba_synergy_system import TeamSynergyCalculator
+    
+    calc = TeamSynergyCalculator()
+    predict_body = json.dumps({
+        'team1_lineup': calc.get_default_lineup('LAL'),
+        'team2_lineup': calc.get_default_lineup('BOS'),
+        'team1_name': 'LAL',
+        'team2_name': 'BOS'
+    }).encode()
+    
+    print("\n" + "="*60)
+    print("⏱  LOAD BENCHMARK (/api/predict + /api/players)")
+    print("="*60 + "\n")
+    
+    def report(label, result):
+        rps, p50, p95, errors = result
+        print(f"  {label:<22} {rps:>8.1f} req/s   p50 {_format_time(p50):>10}   "
+              f"p95 {_format_time(p95):>10}   Fehler {errors}")
+    
+    if len(sys.argv) > 2:
+        report(sys.argv[2], _run_load(sys.argv[2].rstrip('/'), predict_body))
+        print("\n" + "="*60)
+        return
+    
+    servers = {
+        'Flask dev server': [sys.executable, 'nba_flask_api.py', '--warmup'],
+        'gunicorn': [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+    }
+    
+    for label, cmd in servers.items():
+        # Eigenes Datenverzeichnis pro Server, damit beide mit leerem Log starten
+        with tempfile.TemporaryDirectory() as data_dir:
+            port = _free_port()
+            env = dict(os.environ, PORT=str(port), PREDICTIONS_DATA_DIR=data_dir)
+            proc = _start_server(cmd, port, env)
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                _run_load(base_url, predict_body, n_requests=40)  # Warmup
+                report(label, _run_load(base_url, predict_body))
+            finally:
+                proc.terminate()
+                proc.wait()
+    
+    print("\n" + "="*60)
+
+
+BENCHMARKS = {
+    'synergy': benchmark_synergy,
+    'simulation': benchmark_simulation,
+    'prediction_log': benchmark_prediction_log,
+    'matching': benchmark_matching,
+    'games_fallback': benchmark_games_fallback,
+    'matchups': benchmark_matchups,
+    'model_serving': benchmark_model_serving,
+    'compiled_model': benchmark_compiled_model,
+    'model_artifact': benchmark_model_artifact,
+    'model_search': benchmark_model_search,
+    'incremental_update': benchmark_incremental_update,
+    'load': benchmark_load
+}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print("Usage: python nba_benchmarks.py <benchmark> [args]")
+        print(f"Benchmarks: {', '.join(BENCHMARKS)}")
+        print("  load [URL]  - ohne URL: Dev-Server und gunicorn im Vergleich")
+        sys.exit(1)
+    
+    BENCHMARKS[sys.argv[1]]()
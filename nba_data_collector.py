@@ -3,13 +3,25 @@ import numpy as np
 from nba_api.stats.endpoints import leaguegamefinder, teamgamelogs
 from nba_api.stats.static import teams
 from datetime import datetime, timedelta
-import time
+
+from nba_api_client import get_client
+
+# Matchup-Features pro Team: Spaltenname im Dataset -> Rolling-Spalte
+MATCHUP_FEATURES = [
+    ('PTS_AVG', 'PTS_ROLLING_5'),
+    ('FG_PCT', 'FG_PCT_ROLLING_5'),
+    ('FG3_PCT', 'FG3_PCT_ROLLING_5'),
+    ('REB_AVG', 'REB_ROLLING_5'),
+    ('AST_AVG', 'AST_ROLLING_5'),
+    ('TOV_AVG', 'TOV_ROLLING_5')
+]
 
 class NBADataCollector:
     """Sammelt NBA-Spieldaten für Machine Learning"""
     
-    def __init__(self):
+    def __init__(self, client=None):
         self.all_teams = teams.get_teams()
+        self.client = client or get_client()
         
     def get_team_id(self, team_name):
         """Findet Team ID anhand des Namens"""
@@ -22,39 +34,37 @@ class NBADataCollector:
         """
         Sammelt alle Spiele einer Saison
         Season Format: '2023-24'
+        
+        Abgeschlossene Saisons kommen nach dem ersten Abruf aus dem Cache,
+        Retries mit Backoff übernimmt der NBAApiClient.
         """
         print(f"Sammle Daten für Saison {season}...")
         
-        for attempt in range(max_retries):
-            try:
-                # Hole alle Spiele der Saison mit Timeout
-                print(f"Versuch {attempt + 1}/{max_retries}...")
-                gamefinder = leaguegamefinder.LeagueGameFinder(
-                    season_nullable=season,
-                    league_id_nullable='00',
-                    timeout=60
-                )
-                
-                games = gamefinder.get_data_frames()[0]
-                
-                # Filtere nur reguläre Season (ohne Playoffs)
-                games = games[games['SEASON_ID'].str.contains('2')]
-                
-                print(f"✓ Gefunden: {len(games)} Spiel-Einträge")
-                return games
-                
-            except Exception as e:
-                print(f"✗ Fehler beim Versuch {attempt + 1}: {str(e)[:100]}")
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 10
-                    print(f"Warte {wait_time} Sekunden und versuche erneut...")
-                    time.sleep(wait_time)
-                else:
-                    print("\n⚠ Konnte keine Daten laden. Alternativen:")
-                    print("1. Versuche eine ältere Saison: '2022-23' oder '2021-22'")
-                    print("2. Warte 5 Minuten und versuche es nochmal")
-                    print("3. Nutze die Beispiel-Daten (siehe unten)\n")
-                    raise
+        try:
+            # Hole alle Spiele der Saison mit Timeout
+            gamefinder = self.client.fetch(
+                leaguegamefinder.LeagueGameFinder,
+                max_attempts=max_retries,
+                season_nullable=season,
+                league_id_nullable='00',
+                timeout=60
+            )
+            
+            games = gamefinder.get_data_frames()[0]
+            
+            # Filtere nur reguläre Season (ohne Playoffs)
+            games = games[games['SEASON_ID'].str.contains('2')]
+            
+            print(f"✓ Gefunden: {len(games)} Spiel-Einträge")
+            return games
+            
+        except Exception as e:
+            print(f"✗ Fehler nach {max_retries} Versuchen: {str(e)[:100]}")
+            print("\n⚠ Konnte keine Daten laden. Alternativen:")
+            print("1. Versuche eine ältere Saison: '2022-23' oder '2021-22'")
+            print("2. Warte 5 Minuten und versuche es nochmal")
+            print("3. Nutze die Beispiel-Daten (siehe unten)\n")
+            raise
     
     def prepare_training_data(self, games_df):
         """
@@ -87,45 +97,28 @@ class NBADataCollector:
         """
         Erstellt Dataset mit beiden Teams pro Spiel
         Format: Team A Stats | Team B Stats | Winner
+        
+        Jedes Spiel hat 2 Einträge (ein Team pro Zeile): die erste Zeile wird
+        Team 1, die zweite Team 2 - per groupby/merge in einem Schritt statt
+        einem Filter über den ganzen Frame pro Spiel.
         """
-        # Gruppiere nach Game ID (jedes Spiel hat 2 Einträge - ein Team pro Zeile)
-        matchups = []
+        # Nur komplette Spiele, in Reihenfolge ihres ersten Auftretens
+        game_size = games_df.groupby('GAME_ID', sort=False)['GAME_ID'].transform('size')
+        complete = games_df[game_size == 2]
+        position = complete.groupby('GAME_ID', sort=False).cumcount()
         
-        for game_id in games_df['GAME_ID'].unique():
-            game_data = games_df[games_df['GAME_ID'] == game_id]
-            
-            if len(game_data) != 2:
-                continue  # Überspringe inkomplette Spiele
-            
-            team1 = game_data.iloc[0]
-            team2 = game_data.iloc[1]
-            
-            # Features für Team 1
-            matchup = {
-                'GAME_DATE': team1['GAME_DATE'],
-                'TEAM1_ID': team1['TEAM_ID'],
-                'TEAM2_ID': team2['TEAM_ID'],
-                'TEAM1_HOME': team1['IS_HOME'],
-                'TEAM1_PTS_AVG': team1['PTS_ROLLING_5'],
-                'TEAM1_FG_PCT': team1['FG_PCT_ROLLING_5'],
-                'TEAM1_FG3_PCT': team1['FG3_PCT_ROLLING_5'],
-                'TEAM1_REB_AVG': team1['REB_ROLLING_5'],
-                'TEAM1_AST_AVG': team1['AST_ROLLING_5'],
-                'TEAM1_TOV_AVG': team1['TOV_ROLLING_5'],
-                'TEAM2_PTS_AVG': team2['PTS_ROLLING_5'],
-                'TEAM2_FG_PCT': team2['FG_PCT_ROLLING_5'],
-                'TEAM2_FG3_PCT': team2['FG3_PCT_ROLLING_5'],
-                'TEAM2_REB_AVG': team2['REB_ROLLING_5'],
-                'TEAM2_AST_AVG': team2['AST_ROLLING_5'],
-                'TEAM2_TOV_AVG': team2['TOV_ROLLING_5'],
-                'TEAM1_WON': team1['WON']
-            }
-            
-            matchups.append(matchup)
-            
-            time.sleep(0.1)  # Rate limiting
+        feature_cols = [col for _, col in MATCHUP_FEATURES]
+        team1 = complete[position == 0]
+        team2 = complete.loc[position == 1, ['GAME_ID', 'TEAM_ID'] + feature_cols]
+        merged = team1.merge(team2, on='GAME_ID', how='left', suffixes=('_1', '_2'))
+        
+        columns = {'GAME_DATE': 'GAME_DATE', 'TEAM_ID_1': 'TEAM1_ID',
+                   'TEAM_ID_2': 'TEAM2_ID', 'IS_HOME': 'TEAM1_HOME'}
+        for team in (1, 2):
+            columns.update({f'{col}_{team}': f'TEAM{team}_{name}' for name, col in MATCHUP_FEATURES})
+        columns['WON'] = 'TEAM1_WON'
         
-        matchups_df = pd.DataFrame(matchups)
+        matchups_df = merged[list(columns)].rename(columns=columns) if len(merged) else pd.DataFrame()
         print(f"Erstellt: {len(matchups_df)} Matchup-Datensätze")
         
         return matchups_df
@@ -1,20 +1,132 @@
-from nba_games_loader import NBAGamesLoader
-games_loader = NBAGamesLoader()
-from flask import Flask, request, jsonify
+import time
+_boot_start = time.perf_counter()
+
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import json
 import numpy as np
 from datetime import datetime, timedelta
-from nba_synergy_system import TeamSynergyCalculator
 from nba_lineup_predictor import NBALineupPredictor
+from nba_lineup_optimizer import LineupOptimizer
+from nba_game_simulator import GameSimulator
 import os
+import queue
+import sys
+import threading
+
+# Startzeit-Aufschlüsselung (wird beim Boot ausgegeben und in /api/health gezeigt)
+boot_timings = {'imports_ms': round((time.perf_counter() - _boot_start) * 1000, 1)}
 
 app = Flask(__name__)
 CORS(app)
 
 # Initialisiere Predictor
-predictor = NBALineupPredictor()
+_phase_start = time.perf_counter()
+predictor = NBALineupPredictor(cache_size=int(os.environ.get('SYNERGY_CACHE_SIZE', 4096)))
 players_data = predictor.players
+optimizer = LineupOptimizer(predictor)
+simulator = GameSimulator(predictor)
+boot_timings['players_ms'] = round((time.perf_counter() - _phase_start) * 1000, 1)
+
+# Games Loader (inkl. nba_api) erst bei Bedarf oder beim Warmup laden
+_games_loader = None
+_games_loader_lock = threading.Lock()
+
+def get_games_loader():
+    """Gibt den Games Loader zurück, erstellt ihn beim ersten Aufruf"""
+    global _games_loader
+    
+    with _games_loader_lock:
+        if _games_loader is None:
+            from nba_games_loader import NBAGamesLoader
+            _games_loader = NBAGamesLoader()
+    return _games_loader
+
+# Live-Poller (ein Thread pro Worker) erst beim ersten SSE-Client starten
+_live_poller = None
+_live_poller_lock = threading.Lock()
+
+def get_live_poller():
+    """Gibt den Scoreboard-Poller zurück, erstellt ihn beim ersten Aufruf"""
+    global _live_poller
+    
+    loader = get_games_loader()
+    with _live_poller_lock:
+        if _live_poller is None:
+            from nba_live_poller import ScoreboardPoller
+            _live_poller = ScoreboardPoller(
+                loader, interval=float(os.environ.get('LIVE_POLL_INTERVAL', 10)),
+                max_subscribers=int(os.environ.get('LIVE_STREAM_MAX', 4))
+            )
+    return _live_poller
+
+# ML-Modell (nba_model.pkl) einmal laden, Requests laufen gebatcht über den ModelServer
+_model_server = None
+_model_server_lock = threading.Lock()
+
+def get_model_server():
+    """Gibt den Model Server zurück, lädt das Modell beim ersten Aufruf"""
+    global _model_server
+    
+    with _model_server_lock:
+        if _model_server is None:
+            from nba_model_server import ModelServer
+            _model_server = ModelServer()
+    return _model_server
+
+def warmup():
+    """
+    Lädt alles Schwere vorab, damit der erste Request nicht darauf wartet:
+    Tracker-Modul, nba_api-Endpoints, Games Loader und eine Beispiel-Vorhersage
+    """
+    phase_start = time.perf_counter()
+    
+    import nba_prediction_tracker
+    from nba_api.stats.endpoints import ScoreboardV2
+    from nba_api.live.nba.endpoints import scoreboard
+    from nba_api.stats.library.http import NBAStatsHTTP
+    from nba_api.live.nba.library.http import NBALiveHTTP
+    get_games_loader()
+    
+    try:
+        get_model_server()
+    except Exception as e:
+        print(f"⚠️ ML-Modell nicht geladen: {e}")
+    
+    lineup1 = predictor.synergy_calc.get_default_lineup('LAL')
+    lineup2 = predictor.synergy_calc.get_default_lineup('BOS')
+    if lineup1 and lineup2:
+        predictor.predict_game(lineup1, lineup2)
+    
+    boot_timings['warmup_ms'] = round((time.perf_counter() - phase_start) * 1000, 1)
+
+def print_boot_timings():
+    """Zeigt die Startzeit-Aufschlüsselung"""
+    print("\n⏱  Startzeit:")
+    for phase, ms in boot_timings.items():
+        print(f"   {phase[:-3]:<10} {ms:>8.1f} ms")
+    total = sum(boot_timings.values())
+    print(f"   {'gesamt':<10} {total:>8.1f} ms")
+
+_warmed_up = False
+
+def create_app(run_warmup=None):
+    """
+    App-Factory für WSGI-Server (gunicorn/waitress).
+    Wärmt standardmäßig vor, damit jeder Worker (bzw. der Master bei
+    preload_app) den ersten Request nicht bezahlt. Abschalten mit WARMUP=0.
+    """
+    global _warmed_up
+    
+    if run_warmup is None:
+        run_warmup = os.environ.get('WARMUP', '1') == '1'
+    
+    if run_warmup and not _warmed_up:
+        warmup()
+        _warmed_up = True
+        print_boot_timings()
+    
+    return app
 
 class NumpyEncoder(json.JSONEncoder):
     """JSON Encoder für NumPy types"""
@@ -41,10 +153,17 @@ def home():
             '/api/players': 'GET - Liste aller Spieler',
             '/api/players/search': 'GET - Spieler suchen',
             '/api/predict': 'POST - Vorhersage machen',
+            '/api/predict/batch': 'POST - Vorhersagen für viele Matchups',
+            '/api/predict/team-stats': 'POST - ML-Modell mit Team-Durchschnitten (einzeln oder games-Array)',
+            '/api/optimize-lineup': 'POST - Beste Starting-5 aus einem Kader',
+            '/api/simulate': 'POST - Monte-Carlo-Simulation eines Spiels',
+            '/api/league-matrix': 'GET - Alle Teams gegeneinander + Power-Ranking',
+            '/api/substitutions': 'POST - Was-wäre-wenn-Wechsel und bester Ersatz',
             '/api/prediction-stats': 'GET - Prediction Accuracy Stats',
             '/api/predictions-history': 'GET - Alle Vorhersagen',
-            '/api/check-predictions': 'POST - Manueller Prediction Check',
+            '/api/check-predictions': 'POST - Manueller Prediction Check (?backfill=1: alle offenen Tage)',
             '/api/today-games': 'GET - Heutige NBA-Spiele',
+            '/api/live-games/stream': 'GET - Live-Spielstände als Server-Sent Events',
             '/api/health': 'GET - Health Check'
         }
     })
@@ -165,27 +284,6 @@ def make_prediction():
                 'error': 'Prediction failed'
             }), 500
         
-        comparison = result['comparison']
-        
-        matchups_t1 = []
-        matchups_t2 = []
-        
-        for player in team1_lineup:
-            p_data = players_data[player]
-            matchups_t1.append({
-                'player': player,
-                'pts': round(p_data['stats'].get('PTS', 0), 1),
-                'type': p_data['type']
-            })
-        
-        for player in team2_lineup:
-            p_data = players_data[player]
-            matchups_t2.append({
-                'player': player,
-                'pts': round(p_data['stats'].get('PTS', 0), 1),
-                'type': p_data['type']
-            })
-        
         # PREDICTION TRACKING
         print("=" * 60)
         print("🔵 STARTING PREDICTION TRACKING")
@@ -235,28 +333,7 @@ def make_prediction():
         
         return jsonify({
             'success': True,
-            'prediction': {
-                'team1_name': team1_name,
-                'team2_name': team2_name,
-                'team1_score': result['team1_score'],
-                'team2_score': result['team2_score'],
-                'winner': team1_name if result['winner'] == 1 else team2_name,
-                'team1_win_prob': round(result['team1_win_prob'] * 100, 1),
-                'team2_win_prob': round(result['team2_win_prob'] * 100, 1),
-                'confidence': round(result['confidence'] * 100, 1)
-            },
-            'synergies': {
-                'team1': {
-                    name: round(val, 1) for name, val in comparison['team1']['synergies'].items()
-                },
-                'team2': {
-                    name: round(val, 1) for name, val in comparison['team2']['synergies'].items()
-                }
-            },
-            'lineups': {
-                'team1': matchups_t1,
-                'team2': matchups_t2
-            }
+            **_prediction_payload(result, team1_lineup, team2_lineup, team1_name, team2_name)
         })
     
     except Exception as e:
@@ -268,6 +345,426 @@ def make_prediction():
             'error': str(e)
         }), 500
 
+def _prediction_payload(result, team1_lineup, team2_lineup, team1_name, team2_name):
+    """Baut die Antwort-Felder für eine einzelne Vorhersage"""
+    comparison = result['comparison']
+    
+    def lineup_details(lineup):
+        details = []
+        for player in lineup:
+            p_data = players_data[player]
+            details.append({
+                'player': player,
+                'pts': round(p_data['stats'].get('PTS', 0), 1),
+                'type': p_data['type']
+            })
+        return details
+    
+    return {
+        'prediction': {
+            'team1_name': team1_name,
+            'team2_name': team2_name,
+            'team1_score': result['team1_score'],
+            'team2_score': result['team2_score'],
+            'winner': team1_name if result['winner'] == 1 else team2_name,
+            'team1_win_prob': round(result['team1_win_prob'] * 100, 1),
+            'team2_win_prob': round(result['team2_win_prob'] * 100, 1),
+            'confidence': round(result['confidence'] * 100, 1)
+        },
+        'synergies': {
+            'team1': {
+                name: round(val, 1) for name, val in comparison['team1']['synergies'].items()
+            },
+            'team2': {
+                name: round(val, 1) for name, val in comparison['team2']['synergies'].items()
+            }
+        },
+        'lineups': {
+            'team1': lineup_details(team1_lineup),
+            'team2': lineup_details(team2_lineup)
+        }
+    }
+
+def _validate_matchup(matchup):
+    """Prüft ein Matchup, gibt Fehlermeldung oder None zurück"""
+    if not isinstance(matchup, dict) or 'team1_lineup' not in matchup or 'team2_lineup' not in matchup:
+        return 'team1_lineup and team2_lineup required'
+    
+    team1_lineup = matchup['team1_lineup']
+    team2_lineup = matchup['team2_lineup']
+    
+    if not isinstance(team1_lineup, list) or not isinstance(team2_lineup, list):
+        return 'Lineups must be lists of player names'
+    
+    if len(team1_lineup) != 5 or len(team2_lineup) != 5:
+        return 'Each lineup must have exactly 5 players'
+    
+    missing = [player for player in team1_lineup + team2_lineup if player not in players_data]
+    if missing:
+        return f'Player not found: {", ".join(missing)}'
+    
+    return None
+
+def _validate_team_stats(game):
+    """Prüft ein Spiel mit Team-Durchschnitten, gibt Fehlermeldung oder None zurück"""
+    from nba_ml_model import TEAM_STAT_KEYS
+    
+    if not isinstance(game, dict):
+        return 'team1_stats and team2_stats required'
+    
+    for team in ('team1_stats', 'team2_stats'):
+        stats = game.get(team)
+        if not isinstance(stats, dict):
+            return 'team1_stats and team2_stats required'
+        # bool ist in Python ein int - true/false sind aber keine Statistiken
+        missing = [key for key in TEAM_STAT_KEYS
+                   if not isinstance(stats.get(key), (int, float)) or isinstance(stats.get(key), bool)]
+        if missing:
+            return f'{team}: numeric {", ".join(missing)} required'
+    
+    return None
+
+def _team_stats_result(game, result):
+    """API-Format einer Modell-Vorhersage"""
+    team1_name = game.get('team1_name', 'Team 1')
+    team2_name = game.get('team2_name', 'Team 2')
+    return {
+        'winner': team1_name if result['winner'] == 'Team 1' else team2_name,
+        'team1_win_probability': round(float(result['team1_win_probability']), 4),
+        'team2_win_probability': round(float(result['team2_win_probability']), 4),
+        'confidence': round(float(result['confidence']), 4)
+    }
+
+@app.route('/api/predict/team-stats', methods=['POST'])
+def predict_team_stats():
+    """
+    Vorhersage mit dem trainierten ML-Modell aus Team-Durchschnitten
+    (PTS_AVG, FG_PCT, FG3_PCT, REB_AVG, AST_AVG, TOV_AVG).
+    Einzelnes Spiel oder {"games": [...]} als ein Batch.
+    """
+    data = request.get_json(silent=True)
+    
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'error': 'JSON body required'}), 400
+    
+    batch = 'games' in data
+    if batch and not isinstance(data['games'], list):
+        return jsonify({'success': False, 'error': 'games must be an array'}), 400
+    
+    games = data['games'] if batch else [data]
+    for i, game in enumerate(games):
+        error = _validate_team_stats(game)
+        if error:
+            return jsonify({'success': False, 'index': i, 'error': error}), 400
+    
+    try:
+        server = get_model_server()
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Model not available: {e}'}), 503
+    
+    try:
+        if batch:
+            results = server.predict_many([
+                (game['team1_stats'], game['team2_stats'], game.get('team1_home', True))
+                for game in games
+            ])
+        else:
+            results = [server.predict(data['team1_stats'], data['team2_stats'],
+                                      data.get('team1_home', True))]
+    except Exception as e:
+        print(f"❌ TEAM STATS PREDICTION ERROR: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    predictions = [_team_stats_result(game, result) for game, result in zip(games, results)]
+    
+    response = {'success': True, 'model_accuracy': server.entry['accuracy']}
+    if batch:
+        response['predictions'] = predictions
+    else:
+        response['prediction'] = predictions[0]
+    return jsonify(response)
+
+@app.route('/api/predict/batch', methods=['POST'])
+def make_batch_prediction():
+    """Macht Vorhersagen für viele Matchups in einem Request"""
+    data = request.get_json(silent=True)
+    
+    if not isinstance(data, dict) or not isinstance(data.get('matchups'), list):
+        return jsonify({
+            'success': False,
+            'error': 'matchups array required'
+        }), 400
+    
+    matchups = data['matchups']
+    print(f"🔵 BATCH PREDICTION: {len(matchups)} Matchups")
+    
+    # Validierung in einem Durchlauf
+    results = [None] * len(matchups)
+    errors = []
+    valid = []
+    
+    for i, matchup in enumerate(matchups):
+        error = _validate_matchup(matchup)
+        if error:
+            results[i] = {'index': i, 'success': False, 'error': error}
+            errors.append({'index': i, 'error': error})
+        else:
+            valid.append(i)
+    
+    try:
+        predictions = predictor.predict_games([
+            {
+                'team1_lineup': matchups[i]['team1_lineup'],
+                'team2_lineup': matchups[i]['team2_lineup'],
+                'team1_home': matchups[i].get('team1_home', True)
+            }
+            for i in valid
+        ])
+    except Exception as e:
+        print(f"❌ BATCH PREDICTION ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    
+    tracking_entries = []
+    default_date = datetime.now().strftime('%Y-%m-%d')
+    
+    for i, result in zip(valid, predictions):
+        matchup = matchups[i]
+        
+        if not result:
+            results[i] = {'index': i, 'success': False, 'error': 'Prediction failed'}
+            errors.append({'index': i, 'error': 'Prediction failed'})
+            continue
+        
+        team1_name = matchup.get('team1_name', 'Team 1')
+        team2_name = matchup.get('team2_name', 'Team 2')
+        
+        results[i] = {
+            'index': i,
+            'success': True,
+            **_prediction_payload(
+                result, matchup['team1_lineup'], matchup['team2_lineup'], team1_name, team2_name
+            )
+        }
+        
+        tracking_entries.append({
+            'team1': matchup.get('team1_abbr', team1_name),
+            'team2': matchup.get('team2_abbr', team2_name),
+            'predicted_winner': team1_name if result['winner'] == 1 else team2_name,
+            'predicted_score': f"{result['team1_score']}-{result['team2_score']}",
+            'confidence': result['confidence'],
+            'game_date': matchup.get('game_date', default_date),
+            'team1_name': team1_name,
+            'team2_name': team2_name
+        })
+    
+    # Alle Vorhersagen mit einem Schreibvorgang tracken
+    try:
+        from nba_prediction_tracker import PredictionTracker
+        
+        PredictionTracker().log_predictions(tracking_entries)
+    except Exception as e:
+        print(f"❌ TRACKING ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    return jsonify({
+        'success': True,
+        'count': len(matchups),
+        'predicted': len(tracking_entries),
+        'results': results,
+        'errors': errors
+    })
+
+@app.route('/api/simulate', methods=['POST'])
+def simulate_game():
+    """Monte-Carlo-Simulation eines Spiels"""
+    data = request.get_json(silent=True)
+    
+    if not isinstance(data, dict) or 'team1_lineup' not in data or 'team2_lineup' not in data:
+        return jsonify({
+            'success': False,
+            'error': 'team1_lineup and team2_lineup required'
+        }), 400
+    
+    team1_lineup = data['team1_lineup']
+    team2_lineup = data['team2_lineup']
+    
+    if not isinstance(team1_lineup, list) or not isinstance(team2_lineup, list):
+        return jsonify({
+            'success': False,
+            'error': 'Lineups must be lists of player names'
+        }), 400
+    
+    if len(team1_lineup) != 5 or len(team2_lineup) != 5:
+        return jsonify({
+            'success': False,
+            'error': 'Each lineup must have exactly 5 players'
+        }), 400
+    
+    for player in team1_lineup + team2_lineup:
+        if player not in players_data:
+            return jsonify({
+                'success': False,
+                'error': f'Player not found: {player}'
+            }), 404
+    
+    try:
+        n_sims = max(1, min(int(data.get('n_sims', 10000)), 1_000_000))
+        result = simulator.simulate(
+            team1_lineup, team2_lineup,
+            team1_home=data.get('team1_home', True),
+            n_sims=n_sims,
+            seed=data.get('seed'),
+            spread=data.get('spread'),
+            total=data.get('total')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'team1_name': data.get('team1_name', 'Team 1'),
+        'team2_name': data.get('team2_name', 'Team 2'),
+        'simulation': result
+    })
+
+@app.route('/api/optimize-lineup', methods=['POST'])
+def optimize_lineup():
+    """Findet die besten 5 Spieler eines Kaders gegen ein Gegner-Lineup"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    
+    if not data.get('team') and not data.get('roster'):
+        return jsonify({
+            'success': False,
+            'error': 'team or roster required'
+        }), 400
+    
+    if not data.get('opponent_lineup') and not data.get('opponent_team'):
+        return jsonify({
+            'success': False,
+            'error': 'opponent_lineup or opponent_team required'
+        }), 400
+    
+    def is_names(value):
+        return isinstance(value, list) and all(isinstance(name, str) for name in value)
+    
+    if data.get('roster') is not None and not is_names(data['roster']):
+        return jsonify({
+            'success': False,
+            'error': 'roster must be a list of player names'
+        }), 400
+    
+    opponent_lineup = data.get('opponent_lineup')
+    if opponent_lineup is not None and (not is_names(opponent_lineup) or len(opponent_lineup) != 5):
+        return jsonify({
+            'success': False,
+            'error': 'opponent_lineup must be a list of exactly 5 player names'
+        }), 400
+    
+    try:
+        result = optimizer.optimize(
+            roster=data.get('roster'),
+            team=data.get('team'),
+            opponent_lineup=data.get('opponent_lineup'),
+            opponent_team=data.get('opponent_team'),
+            team1_home=data.get('team1_home', True),
+            top_k=max(1, min(int(data.get('top_k', 5)), 50))
+        )
+    except KeyError as e:
+        return jsonify({'success': False, 'error': str(e).strip("'")}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    for entry in result['top']:
+        entry['win_prob'] = round(entry['win_prob'] * 100, 1)
+        entry['synergy_total'] = round(entry['synergy_total'], 1)
+    
+    return jsonify({
+        'success': True,
+        **result
+    })
+
+@app.route('/api/substitutions', methods=['POST'])
+def rank_substitutions():
+    """
+    Was-wäre-wenn-Wechsel: einzelner Tausch (player_out + player_in)
+    oder Ranking aller möglichen Einzel-Wechsel
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    lineup = data.get('lineup')
+    opponent_lineup = data.get('opponent_lineup')
+    
+    if (not isinstance(lineup, list) or not all(isinstance(name, str) for name in lineup)
+            or len(lineup) != 5 or len(set(lineup)) != 5):
+        return jsonify({
+            'success': False,
+            'error': 'lineup with exactly 5 different players required'
+        }), 400
+    
+    if opponent_lineup is not None and (not isinstance(opponent_lineup, list) or len(opponent_lineup) != 5):
+        return jsonify({
+            'success': False,
+            'error': 'opponent_lineup must have exactly 5 players'
+        }), 400
+    
+    try:
+        if data.get('player_in'):
+            if not data.get('player_out'):
+                return jsonify({'success': False, 'error': 'player_out required'}), 400
+            
+            result = optimizer.apply_substitution(lineup, data['player_out'], data['player_in'])
+            return jsonify({'success': True, 'substitution': result})
+        
+        candidates = data.get('candidates')
+        if candidates is None and data.get('candidate_team'):
+            candidates = [name for name in predictor.synergy_calc.get_team_roster(data['candidate_team'])
+                          if name not in lineup]
+        
+        result = optimizer.rank_substitutions(
+            lineup,
+            opponent_lineup=opponent_lineup,
+            player_out=data.get('player_out'),
+            candidates=candidates,
+            team1_home=data.get('team1_home', True),
+            top_k=max(1, min(int(data.get('top_k', 5)), 50))
+        )
+    except KeyError as e:
+        return jsonify({'success': False, 'error': str(e).strip("'")}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({'success': True, **result})
+
+# League-Matrix ändert sich nur mit den Spieler-Daten
+_league_matrix_cache = {'version': None, 'result': None}
+_league_matrix_lock = threading.Lock()
+
+@app.route('/api/league-matrix', methods=['GET'])
+def get_league_matrix():
+    """Round-Robin aller Teams (Standard-Starting-5) mit Power-Ranking"""
+    version = predictor.synergy_calc.data_version
+    
+    with _league_matrix_lock:
+        if _league_matrix_cache['version'] != version:
+            _league_matrix_cache['result'] = predictor.league_matrix()
+            _league_matrix_cache['version'] = version
+        result = _league_matrix_cache['result']
+    
+    return jsonify({
+        'success': True,
+        'count': len(result['teams']),
+        **result
+    })
+
 @app.route('/api/teams', methods=['GET'])
 def get_teams():
     """Gibt alle NBA Teams zurück"""
@@ -297,14 +794,51 @@ def get_teams():
 
 @app.route('/api/today-games', methods=['GET'])
 def get_today_games():
-    """Lädt heutige NBA-Spiele"""
-    games = games_loader.get_games_with_fallback()
+    """Lädt heutige NBA-Spiele (TTL-Cache im Loader, ein Upstream-Abruf für alle Clients)"""
+    games = get_games_loader().get_games_cached()
     return jsonify({
         'success': True,
         'count': len(games),
         'games': games
     })
 
+@app.route('/api/live-games/stream', methods=['GET'])
+def stream_live_games():
+    """
+    Server-Sent Events mit Live-Änderungen (Status, Spielstand) pro game_id.
+    Erst ein 'snapshot'-Event, danach nur 'added' / 'update' / 'removed'.
+    Jeder Stream belegt einen Server-Thread, daher maximal LIVE_STREAM_MAX pro Prozess.
+    """
+    from nba_live_poller import CLOSED, TooManySubscribers
+    
+    poller = get_live_poller()
+    try:
+        subscriber = poller.subscribe()
+    except TooManySubscribers as e:
+        response = jsonify({'success': False, 'error': str(e)})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+    
+    def events():
+        try:
+            while True:
+                try:
+                    event = subscriber.get(timeout=15)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, cls=NumpyEncoder)}\n\n"
+                if event is CLOSED:
+                    # Abgehängt (zu langsam) - Stream beenden, der Client verbindet sich neu
+                    return
+        finally:
+            poller.unsubscribe(subscriber)
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/predictions-history', methods=['GET'])
 def get_predictions_history():
     """Gibt alle Vorhersagen zurück"""
@@ -332,31 +866,11 @@ def get_prediction_stats():
     """Gibt Prediction-Tracking Statistiken zurück"""
     try:
         from nba_prediction_tracker import PredictionTracker
-        import os
         
         tracker = PredictionTracker()
         
-        if os.path.exists(tracker.stats_file):
-            try:
-                stats = tracker.stats
-            except:
-                stats = {
-                    'total_predictions': 0,
-                    'correct_predictions': 0,
-                    'accuracy': 0.0,
-                    'last_7_days': [],
-                    'best_day': None,
-                    'worst_day': None
-                }
-        else:
-            stats = {
-                'total_predictions': 0,
-                'correct_predictions': 0,
-                'accuracy': 0.0,
-                'last_7_days': [],
-                'best_day': None,
-                'worst_day': None
-            }
+        # Aus dem inkrementellen Stats-Aggregat des Stores (inkl. by_confidence)
+        stats = tracker.stats
         
         return jsonify({
             'success': True,
@@ -382,6 +896,8 @@ def trigger_check_predictions():
     """
     🔍 MANUELLER PREDICTION CHECK
     Checkt alle ausstehenden Vorhersagen gegen echte NBA Ergebnisse
+    
+    ?backfill=1 checkt alle Tage mit offenen Vorhersagen statt nur gestern
     """
     print("\n" + "="*60)
     print("🔍 MANUELLER PREDICTION CHECK GESTARTET")
@@ -411,12 +927,12 @@ def trigger_check_predictions():
             })
         
         # Check predictions against real results
-        print("\n🔍 Starte Checking...")
-        tracker.check_predictions()
+        backfill = request.args.get('backfill', '0').lower() in ('1', 'true', 'yes')
+        print(f"\n🔍 Starte Checking{' (Backfill)' if backfill else ''}...")
+        tracker.check_predictions(backfill=backfill)
         
-        # Update stats
-        print("📊 Aktualisiere Statistiken...")
-        tracker.update_stats()
+        # Stats wurden beim Checken mitgezählt - nur die Historie neu laden
+        tracker.load_data()
         
         # Get results
         newly_checked = [p for p in tracker.predictions if p['checked']]
@@ -457,6 +973,12 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'players_loaded': len(players_data),
+        'synergy_cache': predictor.synergy_calc.cache.info(),
+        'games_cache': _games_loader.cache_info() if _games_loader is not None else None,
+        'live_poller': _live_poller.info() if _live_poller is not None else None,
+        'nba_api': _games_loader.client.info() if _games_loader is not None else None,
+        'model_server': _model_server.info() if _model_server is not None else None,
+        'startup': boot_timings,
         'timestamp': datetime.now().isoformat()
     })
 
@@ -464,8 +986,12 @@ def health_check():
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5001))
     
+    # Nur für lokale Entwicklung - Produktion läuft über gunicorn (wsgi.py)
+    if '--warmup' in sys.argv or os.environ.get('WARMUP') == '1':
+        warmup()
+    
     print("\n" + "="*60)
-    print("🏀 NBA PREDICTOR API - RAILWAY DEPLOYMENT")
+    print("🏀 NBA PREDICTOR API - DEV SERVER")
     print("="*60)
     print(f"\nPort: {port}")
     print(f"Spieler geladen: {len(players_data)}")
@@ -475,12 +1001,20 @@ if __name__ == '__main__':
     print("  GET  /api/players/search?q=LeBron")
     print("  GET  /api/player/<n>")
     print("  POST /api/predict")
+    print("  POST /api/predict/batch")
+    print("  POST /api/predict/team-stats")
+    print("  POST /api/optimize-lineup")
+    print("  POST /api/simulate")
+    print("  POST /api/substitutions")
     print("  GET  /api/teams")
+    print("  GET  /api/league-matrix")
     print("  GET  /api/today-games")
+    print("  GET  /api/live-games/stream  (SSE)")
     print("  GET  /api/predictions-history")
     print("  GET  /api/prediction-stats")
-    print("  POST /api/check-predictions  ← NEU!")
+    print("  POST /api/check-predictions[?backfill=1]")
     print("  GET  /api/health")
+    print_boot_timings()
     print("\n" + "="*60 + "\n")
     
     app.run(debug=False, host='0.0.0.0', port=port)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+NBA Game Simulator
+Monte-Carlo-Simulation eines Spiels auf Basis der Spieler-Stats
+"""
+
+import time
+
+import numpy as np
+
+from nba_lineup_predictor import NBALineupPredictor, _stack
+from nba_synergy_system import STAT_INDEX
+
+
+class GameSimulator:
+    """
+    Simuliert N Spiele zweier Lineups vollständig als NumPy-Operationen
+    
+    Pro Simulation und Spieler werden 2er, 3er und Freiwurf-Treffer aus
+    Poisson-Verteilungen gezogen (Versuche pro Spiel mal Trefferquote),
+    Turnovers über dem Schnitt kosten Punkte. Die Roh-Punkte werden anschließend mit dem
+    Faktor aus predict_game (Synergien, Effizienz, Defense, Heimvorteil)
+    skaliert, die Verteilung ist also um die Punkt-Vorhersage zentriert.
+    """
+    
+    # Punkte pro Ballbesitz, die ein zusätzlicher Turnover kostet
+    POINTS_PER_POSSESSION = 1.1
+    
+    def __init__(self, predictor=None):
+        self.predictor = predictor or NBALineupPredictor()
+        self.engine = self.predictor.synergy_calc.engine
+    
+    def _player_rates(self, lineup):
+        """
+        Erwartete Treffer (2er, 3er, Freiwürfe) und Turnovers pro Spiel
+        für die 5 Spieler, Form (5, 4)
+        """
+        indices = np.array([self.engine.index[name] for name in lineup], dtype=np.intp)
+        col = lambda stat: self.engine.stats[indices, STAT_INDEX[stat]]
+        
+        fga = col('FGA')
+        fg3a = np.minimum(col('FG3A'), fga)
+        fg2a = fga - fg3a
+        fg2m = np.clip(col('FGM') - col('FG3M'), 0, None)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fg2_pct = np.where(fg2a > 0, np.clip(fg2m / fg2a, 0, 1), 0.0)
+        
+        return np.column_stack([
+            fg2a * fg2_pct,
+            fg3a * np.clip(col('FG3_PCT'), 0, 1),
+            col('FTA') * np.clip(col('FT_PCT'), 0, 1),
+            col('TOV')
+        ])
+    
+    def _sample_points(self, rng, rates, n_sims):
+        """
+        Roh-Punkte pro Simulation für ein Lineup, Form (n_sims,)
+        
+        Versuche ~ Poisson(A) und Treffer ~ Binomial(Versuche, p) ergibt
+        Treffer ~ Poisson(A * p). Die Summe unabhängiger Poisson-Variablen
+        ist wieder Poisson, die Team-Summen der 5 Spieler werden deshalb
+        direkt mit einem Zug pro Kategorie gezogen (gleiche Verteilung,
+        5x weniger Züge).
+        """
+        team_rates = rates.sum(axis=0)
+        draws = rng.poisson(team_rates, (n_sims, len(team_rates)))
+        weights = np.array([2.0, 3.0, 1.0, -self.POINTS_PER_POSSESSION])
+        
+        # Turnovers kosten nur, soweit sie über dem Schnitt liegen
+        baseline = team_rates[3] * self.POINTS_PER_POSSESSION
+        
+        return draws @ weights + baseline
+    
+    def simulate(self, lineup1_names, lineup2_names, team1_home=True,
+                 n_sims=10000, seed=None, spread=None, total=None):
+        """
+        Simuliert n_sims Spiele
+        
+        Args:
+            lineup1_names, lineup2_names: je 5 Spielernamen
+            team1_home: Ob Team 1 Heimvorteil hat
+            n_sims: Anzahl Simulationen
+            seed: Seed für den Zufallsgenerator (reproduzierbar)
+            spread: Spread aus Sicht von Team 1 (z.B. -5.5 = Team 1 favorisiert)
+            total: Over/Under-Linie für die Gesamtpunkte
+        
+        Returns:
+            Dict mit Score-Verteilungen, Gewinnwahrscheinlichkeit inkl.
+            95%-Konfidenzintervall und ggf. Cover/Over-Under-Wahrscheinlichkeiten
+        """
+        start = time.perf_counter()
+        
+        comparison = self.predictor.synergy_calc.compare_lineups(lineup1_names, lineup2_names)
+        if not comparison:
+            return None
+        
+        team1 = comparison['team1']
+        team2 = comparison['team2']
+        
+        # Punkt-Vorhersage als Zentrum der Verteilung
+        scores = self.predictor._score_matchups(
+            _stack([team1['stats']]), _stack([team1['synergies']]),
+            _stack([team2['stats']]), _stack([team2['synergies']]),
+            np.array([team1_home], dtype=bool)
+        )
+        team1_factor = scores['team1_pts'][0] / team1['stats']['PTS']
+        team2_factor = scores['team2_pts'][0] / team2['stats']['PTS']
+        
+        rng = np.random.default_rng(seed)
+        team1_pts = self._sample_points(rng, self._player_rates(lineup1_names), n_sims) * team1_factor
+        team2_pts = self._sample_points(rng, self._player_rates(lineup2_names), n_sims) * team2_factor
+        
+        team1_pts = np.round(team1_pts)
+        team2_pts = np.round(team2_pts)
+        margin = team1_pts - team2_pts
+        game_total = team1_pts + team2_pts
+        
+        # Unentschieden -> Overtime, als 50/50 gewertet
+        wins = (margin > 0).sum() + 0.5 * (margin == 0).sum()
+        win_prob = wins / n_sims
+        ci_low, ci_high = _wilson_interval(win_prob, n_sims)
+        
+        result = {
+            'n_sims': n_sims,
+            'seed': seed,
+            'team1_score': _distribution(team1_pts),
+            'team2_score': _distribution(team2_pts),
+            'margin': _distribution(margin),
+            'total': _distribution(game_total),
+            'team1_win_prob': float(win_prob),
+            'team2_win_prob': float(1 - win_prob),
+            'team1_win_prob_ci': [ci_low, ci_high],
+            'point_estimate': {
+                'team1_score': round(float(scores['team1_pts'][0])),
+                'team2_score': round(float(scores['team2_pts'][0])),
+                'team1_win_prob': float(scores['team1_win_prob'][0])
+            }
+        }
+        
+        if spread is not None:
+            covered = margin + spread
+            result['spread'] = {
+                'line': spread,
+                'team1_cover_prob': float((covered > 0).mean()),
+                'team2_cover_prob': float((covered < 0).mean()),
+                'push_prob': float((covered == 0).mean())
+            }
+        
+        if total is not None:
+            result['over_under'] = {
+                'line': total,
+                'over_prob': float((game_total > total).mean()),
+                'under_prob': float((game_total < total).mean()),
+                'push_prob': float((game_total == total).mean())
+            }
+        
+        result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+    
+    def print_result(self, result, team1_name="Team 1", team2_name="Team 2"):
+        """Zeigt das Simulations-Ergebnis"""
+        if not result:
+            return
+        
+        print("\n" + "="*70)
+        print(f"🎲 MONTE-CARLO-SIMULATION ({result['n_sims']} Spiele, {result['elapsed_ms']} ms)")
+        print("="*70)
+        
+        for key, name in (('team1_score', team1_name), ('team2_score', team2_name)):
+            dist = result[key]
+            print(f"\n   {name}: Ø {dist['mean']:.1f} (±{dist['std']:.1f}) | "
+                  f"90%: {dist['p5']:.0f}-{dist['p95']:.0f}")
+        
+        low, high = result['team1_win_prob_ci']
+        print(f"\n📈 {team1_name} gewinnt: {result['team1_win_prob']*100:.1f}% "
+              f"(95% KI: {low*100:.1f}-{high*100:.1f}%)")
+        print(f"   Punkt-Vorhersage: {result['point_estimate']['team1_win_prob']*100:.1f}%")
+        
+        if 'spread' in result:
+            print(f"\n   Spread {result['spread']['line']:+}: "
+                  f"{team1_name} covert {result['spread']['team1_cover_prob']*100:.1f}%")
+        
+        if 'over_under' in result:
+            print(f"   Total {result['over_under']['line']}: "
+                  f"Over {result['over_under']['over_prob']*100:.1f}% | "
+                  f"Under {result['over_under']['under_prob']*100:.1f}%")
+        
+        print("\n" + "="*70)
+
+
+def _distribution(values):
+    """Kennzahlen einer simulierten Verteilung"""
+    p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'p5': float(p5),
+        'p25': float(p25),
+        'p50': float(p50),
+        'p75': float(p75),
+        'p95': float(p95)
+    }
+
+
+def _wilson_interval(p, n, z=1.96):
+    """95%-Konfidenzintervall (Wilson) für eine Wahrscheinlichkeit"""
+    denominator = 1 + z**2 / n
+    center = (p + z**2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / denominator
+    return float(max(0.0, center - half_width)), float(min(1.0, center + half_width))
+
+
+# Beispiel-Nutzung
+if __name__ == "__main__":
+    import sys
+    
+    n_sims = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    
+    simulator = GameSimulator()
+    
+    lakers = [
+        'LeBron James',
+        'Anthony Davis',
+        'Austin Reaves',
+        'Rui Hachimura',
+        "D'Angelo Russell"
+    ]
+    
+    warriors = [
+        'Stephen Curry',
+        'Andrew Wiggins',
+        'Draymond Green',
+        'Trayce Jackson-Davis',
+        'Gary Payton II'
+    ]
+    
+    result = simulator.simulate(lakers, warriors, team1_home=True, n_sims=n_sims,
+                                seed=42, spread=-5.5, total=220.5)
+    simulator.print_result(result, "Lakers", "Warriors")
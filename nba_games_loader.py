@@ -4,22 +4,73 @@ NBA Games Loader - ROBUST VERSION
 Lädt heutige Spiele, morgen nur als Fallback mit Error Handling
 """
 
-from nba_api.live.nba.endpoints import scoreboard
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
 from datetime import datetime, timedelta
+import threading
 import time
 
+import pandas as pd
+
+from nba_api_client import get_client
+from nba_teams import TEAM_NAMES
+
+# Cache-Laufzeiten (Sekunden) je nach Zustand des Spieltags
+LIVE_TTL = 20         # mindestens ein Spiel läuft - Spielstände ändern sich
+IDLE_TTL = 600        # nur geplante/beendete Spiele
+FALLBACK_TTL = 60     # Mock-Daten nach Fehlern - bald erneut versuchen
+STALE_WINDOW = 300    # so lange nach Ablauf wird noch stale ausgeliefert (mit Refresh im Hintergrund)
+
+# gameStatus im Live-Scoreboard
+STATUS_LIVE = 2
+
+# Timeout (Sekunden) für einen Ladevorgang heute/morgen
+FETCH_TIMEOUT = 15
+
+# Vorsprung für heute: erst danach startet morgen spekulativ (Hedge)
+HEDGE_DELAY = 1.0
+
 class NBAGamesLoader:
     """Lädt heutige NBA Spiele (morgen nur als Safe Fallback)"""
     
-    def __init__(self):
+    def __init__(self, concurrent=True, timeout=FETCH_TIMEOUT, client=None, hedge_delay=HEDGE_DELAY):
+        """
+        Args:
+            concurrent: Morgen gehedgt laden, wenn heute länger als hedge_delay braucht
+                        (statt morgen erst nach leerem Heute)
+            timeout: Timeout pro Ladevorgang in Sekunden
+            client: Ersatz für den NBAApiClient (z.B. Stub mit fetch(endpoint, **params))
+            hedge_delay: Sekunden Vorsprung für heute, bevor morgen startet
+        """
         self.games = []
+        self.concurrent = concurrent
+        self.timeout = timeout
+        self.hedge_delay = hedge_delay
+        self.client = client or get_client()
+        self.load_timings = {}
+        
+        # TTL-Cache für get_games_cached: (Datum, Spiele, Abrufzeit, TTL)
+        self._cache = None
+        self._cache_lock = threading.Lock()
+        self._inflight = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.fetches = 0
     
-    def get_todays_games(self):
-        """Holt heutige NBA Spiele (Live API)"""
+    def get_todays_games(self, include_finished=False, raise_errors=False):
+        """
+        Holt heutige NBA Spiele (Live API)
+        
+        Args:
+            include_finished: Auch beendete Spiele (Status 3) liefern, z.B. für den Live-Poller
+            raise_errors: Fehler beim Abruf weiterreichen statt [] zu liefern
+                          (leer und fehlgeschlagen sind dann unterscheidbar)
+        """
         try:
             print("📡 Lade heutige NBA Spiele...")
             
-            board = scoreboard.ScoreBoard()
+            from nba_api.live.nba.endpoints import scoreboard
+            
+            board = self.client.fetch(scoreboard.ScoreBoard, timeout=self.timeout)
             games_data = board.games.get_dict()
             
             parsed_games = []
@@ -32,7 +83,7 @@ class NBAGamesLoader:
                     game_status_num = game.get('gameStatus', 0)
                     
                     # Skip finished games (Status 3)
-                    if game_status_num == 3:
+                    if game_status_num == 3 and not include_finished:
                         continue
                     
                     home_team = game.get('homeTeam', {})
@@ -62,7 +113,10 @@ class NBAGamesLoader:
                         'team1_name': home_name,
                         'team2_name': away_name,
                         'matchup': f"{home_abbr} vs {away_abbr}",
-                        'status': game_status
+                        'status': game_status,
+                        'status_code': game_status_num,
+                        'team1_score': home_team.get('score', 0),
+                        'team2_score': away_team.get('score', 0)
                     })
                     
                 except Exception as e:
@@ -74,8 +128,77 @@ class NBAGamesLoader:
             
         except Exception as e:
             print(f"❌ Fehler beim Laden heutiger Spiele: {e}")
+            if raise_errors:
+                raise
             return []
     
+    @staticmethod
+    def parse_scheduled_games(board, date):
+        """
+        Parst geplante Spiele aus ScoreboardV2 - spaltenweise statt Zeile für Zeile
+        
+        Tricodes kommen per TEAM_ID aus series_standings bzw. line_score, sonst
+        aus dem MATCHUP-String ('AWY @ HOM', 'HOM vs. AWY').
+        """
+        games_df = board.game_header.get_data_frame()
+        if len(games_df) == 0:
+            return []
+        
+        # TEAM_ID -> Tricode aus allen Frames, die beides haben
+        id_frames = []
+        for name in ('series_standings', 'line_score'):
+            try:
+                frame = getattr(board, name).get_data_frame()
+            except Exception:
+                continue
+            if {'TEAM_ID', 'TEAM_ABBREVIATION'} <= set(frame.columns):
+                id_frames.append(frame[['TEAM_ID', 'TEAM_ABBREVIATION']])
+        
+        home = pd.Series(None, index=games_df.index, dtype=object)
+        away = pd.Series(None, index=games_df.index, dtype=object)
+        
+        # Methode 1: TEAM_ID Lookup
+        if id_frames:
+            abbr_by_id = (pd.concat(id_frames).dropna()
+                          .drop_duplicates('TEAM_ID').set_index('TEAM_ID')['TEAM_ABBREVIATION'])
+            home = games_df['HOME_TEAM_ID'].map(abbr_by_id)
+            away = games_df['VISITOR_TEAM_ID'].map(abbr_by_id)
+        
+        # Methode 2: Matchup String für alle Spiele ohne beide Tricodes
+        missing = home.isna() | away.isna() | (home == '') | (away == '')
+        if missing.any() and 'MATCHUP' in games_df.columns:
+            matchup = games_df.loc[missing, 'MATCHUP'].fillna('').astype(str).str.strip()
+            at = matchup.str.extract(r'^(?P<away>.+?) @ (?P<home>.+)$')
+            vs = matchup.str.extract(r'^(?P<home>.+?) vs\.? (?P<away>.+)$')
+            home.loc[missing] = at['home'].fillna(vs['home']).str.strip()
+            away.loc[missing] = at['away'].fillna(vs['away']).str.strip()
+        
+        found = home.notna() & away.notna() & (home != '') & (away != '')
+        for game_id in games_df.loc[~found, 'GAME_ID']:
+            print(f"⚠️ Kann Teams nicht finden für Game: {game_id}")
+        
+        if 'GAME_STATUS_TEXT' in games_df.columns:
+            times = games_df['GAME_STATUS_TEXT'].fillna('TBD')
+        else:
+            times = pd.Series('TBD', index=games_df.index)
+        
+        return [
+            {
+                'game_id': game_id,
+                'date': date,
+                'time': game_time,
+                'team1_abbr': home_abbr,
+                'team2_abbr': away_abbr,
+                'team1_name': TEAM_NAMES.get(home_abbr, home_abbr),
+                'team2_name': TEAM_NAMES.get(away_abbr, away_abbr),
+                'matchup': f"{home_abbr} vs {away_abbr}",
+                'status': 'Scheduled'
+            }
+            for game_id, game_time, home_abbr, away_abbr in zip(
+                games_df.loc[found, 'GAME_ID'], times[found], home[found], away[found]
+            )
+        ]
+    
     def get_tomorrows_games_safe(self):
         """
         Versucht morgige Spiele zu laden (mit Safe Error Handling)
@@ -89,103 +212,13 @@ class NBAGamesLoader:
             tomorrow = (datetime.now() + timedelta(days=1)).strftime('%m/%d/%Y')
             tomorrow_date = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
             
-            board = ScoreboardV2(game_date=tomorrow)
-            time.sleep(1)
-            
-            games_df = board.game_header.get_data_frame()
+            board = self.client.fetch(ScoreboardV2, game_date=tomorrow, timeout=self.timeout)
+            parsed_games = self.parse_scheduled_games(board, tomorrow_date)
             
-            if len(games_df) == 0:
+            if not parsed_games:
                 print("⚠️ Keine Spiele morgen in API")
                 return []
             
-            # Versuche Series Standings
-            try:
-                series_df = board.series_standings.get_data_frame()
-            except:
-                print("⚠️ Series Standings nicht verfügbar")
-                series_df = None
-            
-            parsed_games = []
-            
-            for _, game in games_df.iterrows():
-                try:
-                    game_id = game['GAME_ID']
-                    home_team_id = game['HOME_TEAM_ID']
-                    visitor_team_id = game['VISITOR_TEAM_ID']
-                    game_time = game.get('GAME_STATUS_TEXT', 'TBD')
-                    
-                    away_abbr = None
-                    home_abbr = None
-                    
-                    # Methode 1: Series Standings
-                    if series_df is not None and len(series_df) > 0:
-                        try:
-                            home_team_row = series_df[series_df['TEAM_ID'] == home_team_id]
-                            visitor_team_row = series_df[series_df['TEAM_ID'] == visitor_team_id]
-                            
-                            if not home_team_row.empty:
-                                home_abbr = home_team_row.iloc[0].get('TEAM_ABBREVIATION', '')
-                            
-                            if not visitor_team_row.empty:
-                                away_abbr = visitor_team_row.iloc[0].get('TEAM_ABBREVIATION', '')
-                        except:
-                            pass
-                    
-                    # Methode 2: Matchup String
-                    if not away_abbr or not home_abbr:
-                        matchup = game.get('MATCHUP', '').strip()
-                        
-                        if ' @ ' in matchup:
-                            parts = matchup.split(' @ ')
-                            away_abbr = parts[0].strip()
-                            home_abbr = parts[1].strip()
-                        elif ' vs. ' in matchup:
-                            parts = matchup.split(' vs. ')
-                            home_abbr = parts[0].strip()
-                            away_abbr = parts[1].strip()
-                        elif ' vs ' in matchup:
-                            parts = matchup.split(' vs ')
-                            home_abbr = parts[0].strip()
-                            away_abbr = parts[1].strip()
-                    
-                    # Wenn immer noch nicht gefunden - skip
-                    if not away_abbr or not home_abbr:
-                        print(f"⚠️ Kann Teams nicht finden für Game: {game_id}")
-                        continue
-                    
-                    # Team Namen
-                    team_name_map = {
-                        'LAL': 'Lakers', 'GSW': 'Warriors', 'BOS': 'Celtics',
-                        'MIA': 'Heat', 'PHX': 'Suns', 'LAC': 'Clippers',
-                        'DEN': 'Nuggets', 'DAL': 'Mavericks', 'MIL': 'Bucks',
-                        'PHI': '76ers', 'BKN': 'Nets', 'NYK': 'Knicks',
-                        'TOR': 'Raptors', 'CHI': 'Bulls', 'CLE': 'Cavaliers',
-                        'ATL': 'Hawks', 'CHA': 'Hornets', 'WAS': 'Wizards',
-                        'ORL': 'Magic', 'IND': 'Pacers', 'DET': 'Pistons',
-                        'MEM': 'Grizzlies', 'NOP': 'Pelicans', 'SAS': 'Spurs',
-                        'HOU': 'Rockets', 'OKC': 'Thunder', 'UTA': 'Jazz',
-                        'SAC': 'Kings', 'POR': 'Trail Blazers', 'MIN': 'Timberwolves'
-                    }
-                    
-                    home_name = team_name_map.get(home_abbr, home_abbr)
-                    away_name = team_name_map.get(away_abbr, away_abbr)
-                    
-                    parsed_games.append({
-                        'game_id': game_id,
-                        'date': tomorrow_date,
-                        'time': game_time,
-                        'team1_abbr': home_abbr,
-                        'team2_abbr': away_abbr,
-                        'team1_name': home_name,
-                        'team2_name': away_name,
-                        'matchup': f"{home_abbr} vs {away_abbr}",
-                        'status': 'Scheduled'
-                    })
-                    
-                except Exception as e:
-                    print(f"⚠️ Fehler bei morgen Spiel: {e}")
-                    continue
-            
             print(f"✅ Morgen: {len(parsed_games)} Spiele")
             return parsed_games
             
@@ -194,28 +227,120 @@ class NBAGamesLoader:
             print("⚠️ Fahre nur mit heutigen Spielen fort")
             return []
     
-    def get_games_with_fallback(self):
+    def _load_sequential(self):
         """
-        Holt Spiele mit robustem Fallback:
-        1. Heute (Live API)
-        2. Falls leer: Versuche morgen (mit Error Handling)
-        3. Falls beide leer: Mock
+        Heute, danach morgen nur wenn heute leer.
+        None wenn der Abruf für heute fehlschlägt (kein Morgen als Ersatz für einen Ausfall).
+        """
+        start = time.perf_counter()
+        try:
+            today_games = self.get_todays_games(raise_errors=True)
+        except Exception:
+            return None
+        finally:
+            timings = self.load_timings = {'today_ms': round((time.perf_counter() - start) * 1000, 1)}
+        
+        if today_games:
+            timings['wait_ms'] = timings['today_ms']
+            return today_games
+        
+        print("⚠️ Keine Spiele heute, versuche morgen...")
+        tomorrow_start = time.perf_counter()
+        tomorrow_games = self.get_tomorrows_games_safe()
+        timings['tomorrow_ms'] = round((time.perf_counter() - tomorrow_start) * 1000, 1)
+        timings['wait_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return tomorrow_games
+    
+    def _load_concurrent(self):
+        """
+        Heute zuerst, morgen gehedgt: morgen startet erst, wenn heute leer ist
+        oder nach hedge_delay noch keine Antwort hat. Gemeinsame Deadline von
+        self.timeout. Ist heute nicht leer, wird ein gehedgter Morgen-Abruf
+        ignoriert (er endet über sein Timeout).
+        
+        Returns:
+            Spiele, oder None wenn heute fehlschlägt bzw. in das Timeout läuft
+        """
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.timeout
+        
+        # Eigenes Dict pro Ladevorgang: ein verworfener Abruf schreibt nicht in den nächsten
+        timings = self.load_timings = {}
+        
+        def timed(loader, key):
+            def run():
+                begin = time.perf_counter()
+                try:
+                    return loader()
+                finally:
+                    timings[key] = round((time.perf_counter() - begin) * 1000, 1)
+            return run
+        
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='games-loader')
+        today_future = pool.submit(timed(lambda: self.get_todays_games(raise_errors=True), 'today_ms'))
+        tomorrow_future = None
+        
+        def submit_tomorrow():
+            return pool.submit(timed(self.get_tomorrows_games_safe, 'tomorrow_ms'))
+        
+        hedge = self.hedge_delay < self.timeout
+        try:
+            try:
+                today_games = today_future.result(timeout=self.hedge_delay if hedge else self.timeout)
+            except FuturesTimeout:
+                if not hedge:
+                    raise
+                # Heute ist langsam - morgen schon mal anstoßen
+                tomorrow_future = submit_tomorrow()
+                today_games = today_future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            print(f"⚠️ Heutige Spiele: Timeout nach {self.timeout}s")
+            today_games = None
+        except Exception:
+            today_games = None
+        
+        if today_games is None or today_games:
+            # Nicht auf verworfene Abrufe warten
+            pool.shutdown(wait=False)
+            timings['wait_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            return today_games
+        
+        print("⚠️ Keine Spiele heute, verwende morgen...")
+        if tomorrow_future is None:
+            tomorrow_future = submit_tomorrow()
+        pool.shutdown(wait=False)
+        try:
+            tomorrow_games = tomorrow_future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FuturesTimeout:
+            print(f"⚠️ Morgige Spiele: Timeout nach {self.timeout}s")
+            tomorrow_games = []
+        
+        timings['wait_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return tomorrow_games
+    
+    def _load_with_fallback(self, concurrent=None):
         """
-        all_games = []
+        Returns:
+            (Spiele, ok) - ok ist False, wenn der Abruf für heute fehlgeschlagen ist
+            und stale bzw. Mock-Daten geliefert werden
+        """
+        if concurrent is None:
+            concurrent = self.concurrent
         
         print("\n" + "="*60)
         print("🏀 LADE SPIELE")
         print("="*60)
         
-        # Heute
-        today_games = self.get_todays_games()
-        all_games.extend(today_games)
+        all_games = self._load_concurrent() if concurrent else self._load_sequential()
+        ok = all_games is not None
         
-        # Morgen nur wenn heute leer
-        if len(today_games) == 0:
-            print("⚠️ Keine Spiele heute, versuche morgen...")
-            tomorrow_games = self.get_tomorrows_games_safe()
-            all_games.extend(tomorrow_games)
+        if not ok:
+            # Letzter Stand von heute statt der Spiele von morgen
+            with self._cache_lock:
+                cached = self._cache
+            today = datetime.now().strftime('%Y-%m-%d')
+            all_games = list(cached[1]) if cached is not None and cached[0] == today else []
+            print(f"⚠️ Abruf für heute fehlgeschlagen - verwende letzten Stand ({len(all_games)} Spiele)")
         
         print("\n" + "="*60)
         print(f"📊 GESAMT: {len(all_games)} Spiele")
@@ -226,7 +351,97 @@ class NBAGamesLoader:
             print("⚠️ Keine Spiele gefunden - verwende Mock-Daten")
             all_games = self._get_mock_games()
         
-        return all_games
+        return all_games, ok
+    
+    def get_games_with_fallback(self, concurrent=None):
+        """
+        Holt Spiele mit robustem Fallback:
+        1. Heute (Live API)
+        2. Falls leer: Versuche morgen (mit Error Handling)
+        3. Falls heute fehlschlägt: letzter Stand von heute (nicht morgen)
+        4. Falls nichts da ist: Mock
+        
+        Args:
+            concurrent: Morgen gehedgt laden (Default: self.concurrent)
+        """
+        return self._load_with_fallback(concurrent)[0]
+    
+    @staticmethod
+    def _ttl_for(games):
+        """Cache-Laufzeit je nach Spieltag: kurz bei Live-Spielen, lang sonst"""
+        if any(str(game.get('game_id', '')).startswith('mock_') for game in games):
+            return FALLBACK_TTL
+        if any(game.get('status_code') == STATUS_LIVE for game in games):
+            return LIVE_TTL
+        return IDLE_TTL
+    
+    def _refresh(self, future):
+        """Holt die Spiele und schreibt sie in den Cache (nur ein Refresh gleichzeitig)"""
+        try:
+            games, ok = self._load_with_fallback()
+            # Nach einem Fehlschlag bald erneut versuchen, auch wenn stale Daten geliefert werden
+            ttl = self._ttl_for(games) if ok else FALLBACK_TTL
+            with self._cache_lock:
+                self._cache = (datetime.now().strftime('%Y-%m-%d'), games, time.monotonic(), ttl)
+                self.fetches += 1
+            future.set_result(games)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._cache_lock:
+                self._inflight = None
+    
+    def get_games_cached(self):
+        """
+        Spiele aus dem TTL-Cache:
+        - frisch: direkt aus dem Cache
+        - abgelaufen (bis STALE_WINDOW): alter Stand sofort, Refresh im Hintergrund
+        - sonst / neuer Tag: synchron laden
+        Gleichzeitige Misses teilen sich einen einzigen Upstream-Abruf.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        with self._cache_lock:
+            if self._cache is not None and self._cache[0] == today:
+                _, games, fetched_at, ttl = self._cache
+                age = time.monotonic() - fetched_at
+                
+                if age < ttl:
+                    self.hits += 1
+                    return games
+                
+                if age < ttl + STALE_WINDOW:
+                    self.stale_hits += 1
+                    if self._inflight is None:
+                        self._inflight = Future()
+                        threading.Thread(target=self._refresh, args=(self._inflight,),
+                                         daemon=True).start()
+                    return games
+            
+            # Miss: an laufenden Abruf anhängen oder selbst abrufen
+            future = self._inflight
+            leader = future is None
+            if leader:
+                future = self._inflight = Future()
+        
+        if leader:
+            self._refresh(future)
+        return future.result()
+    
+    def cache_info(self):
+        """Cache-Statistiken für /api/health"""
+        with self._cache_lock:
+            info = {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'fetches': self.fetches,
+                'refreshing': self._inflight is not None,
+                'load_timings': dict(self.load_timings)
+            }
+            if self._cache is not None:
+                info['age_s'] = round(time.monotonic() - self._cache[2], 1)
+                info['ttl_s'] = self._cache[3]
+            return info
     
     def _get_mock_games(self):
         """Mock-Daten als letzter Fallback"""
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+NBA Lineup Optimizer
+Findet die besten 5 Spieler eines Kaders gegen ein gegnerisches Lineup
+"""
+
+import itertools
+import time
+from math import comb
+
+import numpy as np
+
+from nba_lineup_predictor import NBALineupPredictor
+
+
+class LineupOptimizer:
+    """Bewertet alle 5er-Kombinationen eines Kaders vektorisiert"""
+    
+    def __init__(self, predictor=None, chunk_size=50000, max_combinations=500_000):
+        self.predictor = predictor or NBALineupPredictor()
+        self.synergy_calc = self.predictor.synergy_calc
+        self.chunk_size = chunk_size
+        self.max_combinations = max_combinations
+    
+    def _prune_pool(self, pool):
+        """
+        Verkleinert sehr große Spieler-Pools (z.B. alle Free Agents einer
+        Conference), bis die Anzahl Kombinationen unter max_combinations
+        liegt. Heuristik: Die Basis-Punkte dominieren den Score, also
+        bleiben die Spieler mit den meisten PTS im Pool. Synergien können
+        einen Spieler mit weniger PTS ins beste Lineup bringen - nach dem
+        Kürzen ist das Ergebnis also nicht garantiert optimal.
+        """
+        if comb(len(pool), 5) <= self.max_combinations:
+            return pool, False
+        
+        engine = self.synergy_calc.engine
+        pts = engine.column(np.array(pool), 'PTS')
+        keep = len(pool)
+        while keep > 5 and comb(keep, 5) > self.max_combinations:
+            keep -= 1
+        order = np.argsort(-pts, kind='stable')[:keep]
+        return [pool[i] for i in sorted(order)], True
+    
+    def optimize(self, roster=None, team=None, opponent_lineup=None,
+                 opponent_team=None, team1_home=True, top_k=5):
+        """
+        Sucht die besten Lineups aus einem Kader
+        
+        Args:
+            roster: Liste von Spielernamen (alternativ team)
+            team: Team-Abkürzung aus der Spieler-JSON
+            opponent_lineup: 5 Spielernamen des Gegners (alternativ opponent_team)
+            opponent_team: Team-Abkürzung, Gegner spielt mit seiner Standard-Starting-5
+            team1_home: Ob der eigene Kader Heimvorteil hat
+            top_k: Anzahl der zurückgegebenen Lineups
+        
+        Returns:
+            Dict mit den Top-k Lineups und Laufzeit-Infos. search ist 'exhaustive'
+            (alle Kombinationen, optimal) oder 'heuristic' (Pool nach PTS gekürzt)
+        """
+        start = time.perf_counter()
+        
+        if roster is None:
+            if not team:
+                raise ValueError("roster oder team erforderlich")
+            roster = self.synergy_calc.get_team_roster(team)
+        
+        if opponent_lineup is None:
+            if not opponent_team:
+                raise ValueError("opponent_lineup oder opponent_team erforderlich")
+            opponent_lineup = self.synergy_calc.get_default_lineup(opponent_team)
+            if opponent_lineup is None:
+                raise ValueError(f"Kein vollständiges Lineup für {opponent_team}")
+        
+        self._check_players(list(roster) + list(opponent_lineup))
+        
+        roster = list(dict.fromkeys(roster))
+        if len(roster) < 5:
+            raise ValueError("Kader braucht mindestens 5 Spieler")
+        
+        engine = self.synergy_calc.engine
+        pool, pruned = self._prune_pool([engine.index[name] for name in roster])
+        
+        # Gegner-Profil einmal (aus dem Lineup-Cache)
+        opponent = self.synergy_calc.get_lineup_profiles([opponent_lineup])[0]
+        
+        best_combos = np.empty((0, 5), dtype=np.intp)
+        best_prob = np.empty(0)
+        best_margin = np.empty(0)
+        evaluated = 0
+        
+        combos = itertools.combinations(pool, 5)
+        while True:
+            chunk = np.fromiter(
+                itertools.islice(combos, self.chunk_size),
+                dtype=np.dtype((np.intp, 5))
+            )
+            if len(chunk) == 0:
+                break
+            evaluated += len(chunk)
+            
+            scores = self._score_chunk(chunk, opponent, team1_home)
+            margin = scores['team1_pts'] - scores['team2_pts']
+            
+            # Top-k dieses Chunks mit den bisherigen Besten zusammenführen
+            best_combos = np.vstack([best_combos, chunk])
+            best_prob = np.concatenate([best_prob, scores['team1_win_prob']])
+            best_margin = np.concatenate([best_margin, margin])
+            order = np.lexsort((-best_margin, -best_prob))[:top_k]
+            best_combos = best_combos[order]
+            best_prob = best_prob[order]
+            best_margin = best_margin[order]
+        
+        # Details für die Top-k (inkl. Synergien) über den normalen Pfad
+        lineups = [[engine.names[i] for i in combo] for combo in best_combos]
+        results = self.predictor.predict_games([
+            {'team1_lineup': lineup, 'team2_lineup': list(opponent_lineup), 'team1_home': team1_home}
+            for lineup in lineups
+        ])
+        
+        top = []
+        for rank, (lineup, result) in enumerate(zip(lineups, results), 1):
+            top.append({
+                'rank': rank,
+                'lineup': lineup,
+                'win_prob': result['team1_win_prob'],
+                'team_score': result['team1_score'],
+                'opponent_score': result['team2_score'],
+                'synergy_total': result['comparison']['team1']['synergies']['total']
+            })
+        
+        return {
+            'opponent_lineup': list(opponent_lineup),
+            'roster_size': len(roster),
+            'pool_size': len(pool),
+            'pruned': pruned,
+            'search': 'heuristic' if pruned else 'exhaustive',
+            'combinations': evaluated,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+            'top': top
+        }
+    
+    def apply_substitution(self, lineup, player_out, player_in):
+        """
+        Einzelner Wechsel auf Basis des gecachten Lineup-Zustands
+        
+        Returns:
+            Dict mit neuem Lineup, Team-Stats und Synergien
+        """
+        engine = self.synergy_calc.engine
+        self._check_lineup(lineup)
+        self._check_players(list(lineup) + [player_in])
+        if player_out not in lineup:
+            raise ValueError(f"{player_out} steht nicht im Lineup")
+        if player_in in lineup:
+            raise ValueError(f"{player_in} steht bereits im Lineup")
+        
+        state = self.synergy_calc.get_lineup_state(lineup)
+        new_state = engine.substitute(state, engine.index[player_out], engine.index[player_in])
+        stats, synergies = engine.evaluate_states(
+            new_state['sums'], new_state['counts'], new_state['volume_sq']
+        )
+        
+        return {
+            'lineup': [player_in if name == player_out else name for name in lineup],
+            'stats': {key: float(value) for key, value in stats.items()},
+            'synergies': {key: float(value) for key, value in synergies.items()}
+        }
+    
+    def rank_substitutions(self, lineup, opponent_lineup=None, player_out=None,
+                           candidates=None, team1_home=True, top_k=5):
+        """
+        Bewertet alle 5 x N Einzel-Wechsel auf einmal ("bester Ersatz")
+        
+        Ohne Gegner wird nach Synergy-Total sortiert, mit Gegner nach
+        Gewinnwahrscheinlichkeit. slots kommen in der Reihenfolge des Lineups.
+        
+        Args:
+            lineup: 5 Spielernamen
+            opponent_lineup: Optional 5 Spielernamen des Gegners
+            player_out: Optional nur diesen Spieler ersetzen
+            candidates: Optional Liste von Kandidaten (Default: alle Spieler)
+            top_k: Anzahl Vorschläge pro Position
+        """
+        start = time.perf_counter()
+        engine = self.synergy_calc.engine
+        
+        if candidates is None:
+            candidates = engine.names
+        self._check_lineup(lineup)
+        self._check_players(list(lineup) + list(candidates) + list(opponent_lineup or []))
+        if player_out is not None and player_out not in lineup:
+            raise ValueError(f"{player_out} steht nicht im Lineup")
+        
+        state = self.synergy_calc.get_lineup_state(lineup)
+        candidate_idx = np.array([engine.index[name] for name in candidates], dtype=np.intp)
+        stats, synergies = engine.substitution_deltas(state, candidate_idx)
+        
+        base = self.synergy_calc.get_lineup_profiles([lineup])[0]
+        base_info = {'synergy_total': base['synergies']['total']}
+        metric = synergies['total']
+        win_prob = None
+        
+        if opponent_lineup is not None:
+            opponent = self.synergy_calc.get_lineup_profiles([opponent_lineup])[0]
+            opp_stats = {key: np.float64(value) for key, value in opponent['stats'].items()}
+            opp_synergies = {key: np.float64(value) for key, value in opponent['synergies'].items()}
+            win_prob = self.predictor._score_matchups(
+                stats, synergies, opp_stats, opp_synergies, bool(team1_home)
+            )['team1_win_prob']
+            metric = win_prob
+            base_info['win_prob'] = self.predictor.predict_games([{
+                'team1_lineup': list(lineup),
+                'team2_lineup': list(opponent_lineup),
+                'team1_home': team1_home
+            }])[0]['team1_win_prob']
+        
+        # Der Lineup-Zustand ist nach Spieler-ID sortiert, ausgegeben wird in Lineup-Reihenfolge
+        slot_of = {engine.names[player_idx]: slot for slot, player_idx in enumerate(state['indices'])}
+        slots = []
+        for name in lineup:
+            if player_out is not None and name != player_out:
+                continue
+            slot = slot_of[name]
+            
+            values = np.where(np.isnan(metric[slot]), -np.inf, metric[slot])
+            order = np.argsort(-values, kind='stable')[:top_k]
+            substitutes = []
+            for j in order:
+                if not np.isfinite(values[j]):
+                    break
+                entry = {
+                    'player_in': candidates[j],
+                    'synergy_total': float(synergies['total'][slot, j]),
+                    'synergy_delta': float(synergies['total'][slot, j] - base_info['synergy_total'])
+                }
+                if win_prob is not None:
+                    entry['win_prob'] = float(win_prob[slot, j])
+                    entry['win_prob_delta'] = float(win_prob[slot, j] - base_info['win_prob'])
+                substitutes.append(entry)
+            
+            slots.append({'player_out': name, 'substitutes': substitutes})
+        
+        return {
+            'lineup': list(lineup),
+            'base': base_info,
+            'candidates': len(candidates),
+            'slots': slots,
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1)
+        }
+    
+    @staticmethod
+    def _check_lineup(lineup):
+        """Wirft ValueError, wenn das Lineup nicht aus 5 verschiedenen Spielern besteht"""
+        if len(lineup) != 5 or len(set(lineup)) != 5:
+            raise ValueError("Lineup braucht 5 verschiedene Spieler")
+    
+    def _check_players(self, names):
+        """Wirft KeyError für unbekannte Spieler"""
+        missing = [name for name in names if name not in self.synergy_calc.players]
+        if missing:
+            raise KeyError(f"Spieler nicht gefunden: {', '.join(missing)}")
+    
+    def _score_chunk(self, indices, opponent, team1_home):
+        """Bewertet einen Block von Lineups gegen das Gegner-Profil"""
+        engine = self.synergy_calc.engine
+        n = len(indices)
+        
+        team_stats, team_synergies = engine.evaluate(indices)
+        opp_stats = {key: np.full(n, value) for key, value in opponent['stats'].items()}
+        opp_synergies = {key: np.full(n, value) for key, value in opponent['synergies'].items()}
+        
+        return self.predictor._score_matchups(
+            team_stats, team_synergies, opp_stats, opp_synergies,
+            np.full(n, bool(team1_home))
+        )
+    
+    def print_result(self, result):
+        """Zeigt die besten Lineups"""
+        print("\n" + "="*70)
+        print("🧠 LINEUP OPTIMIZER")
+        print("="*70)
+        print(f"\nGegner: {', '.join(result['opponent_lineup'])}")
+        print(f"Kader: {result['roster_size']} Spieler | "
+              f"{result['combinations']} Kombinationen | {result['elapsed_ms']} ms")
+        if result['pruned']:
+            print(f"⚠ Pool nach PTS auf {result['pool_size']} Spieler reduziert - "
+                  f"heuristisch, nicht garantiert optimal")
+        
+        for entry in result['top']:
+            print(f"\n#{entry['rank']}  {entry['win_prob']*100:.1f}% "
+                  f"({entry['team_score']}-{entry['opponent_score']}, "
+                  f"Synergy {entry['synergy_total']:.1f})")
+            for name in entry['lineup']:
+                print(f"   - {name}")
+        
+        print("\n" + "="*70)
+
+
+# CLI
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) < 3:
+        print("Usage: python nba_lineup_optimizer.py <TEAM> <OPPONENT_TEAM> [top_k] [away]")
+        print("Beispiel: python nba_lineup_optimizer.py LAL GSW 5")
+        sys.exit(1)
+    
+    team = sys.argv[1].upper()
+    opponent_team = sys.argv[2].upper()
+    top_k = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    team1_home = not (len(sys.argv) > 4 and sys.argv[4] == 'away')
+    
+    optimizer = LineupOptimizer()
+    result = optimizer.optimize(
+        team=team, opponent_team=opponent_team, team1_home=team1_home, top_k=top_k
+    )
+    optimizer.print_result(result)
@@ -2,15 +2,25 @@ import json
 import numpy as np
 from nba_synergy_system import TeamSynergyCalculator
 
+
+def _stack(dicts):
+    """Dicts mit gleichen Keys -> Dict von Arrays (ein Eintrag pro Dict)"""
+    return {key: np.array([d[key] for d in dicts], dtype=np.float64) for key in dicts[0]}
+
+
 class NBALineupPredictor:
     """
     Advanced NBA Predictor basierend auf Spieler-Lineups mit Synergien
     """
     
-    def __init__(self):
-        self.synergy_calc = TeamSynergyCalculator()
-        self.players = self.synergy_calc.players
-        
+    def __init__(self, cache_size=1024):
+        self.synergy_calc = TeamSynergyCalculator(cache_size=cache_size)
+    
+    @property
+    def players(self):
+        """Spieler-Daten (bleibt nach reload_players aktuell)"""
+        return self.synergy_calc.players
+    
     def predict_game(self, lineup1_names, lineup2_names, team1_home=True):
         """
         Macht Vorhersage basierend auf zwei 5-Spieler-Lineups
@@ -24,45 +34,185 @@ class NBALineupPredictor:
         team1 = comparison['team1']
         team2 = comparison['team2']
         
+        # Stats und Synergien kommen aus dem Lineup-Cache, hier nur noch
+        # der günstige Kreuz-Team-Teil
+        scores = self._score_matchups(
+            _stack([team1['stats']]), _stack([team1['synergies']]),
+            _stack([team2['stats']]), _stack([team2['synergies']]),
+            np.array([team1_home], dtype=bool)
+        )
+        
+        return self._build_result(scores, 0, comparison)
+    
+    def predict_games(self, matchups):
+        """
+        Batch-Variante von predict_game für viele Matchups auf einmal
+        
+        Args:
+            matchups: Liste von Dicts mit 'team1_lineup', 'team2_lineup'
+                      und optional 'team1_home' (Default True)
+        
+        Returns:
+            Liste mit einem Ergebnis pro Matchup (wie predict_game),
+            None für Matchups mit unbekannten Spielern
+        """
+        results = [None] * len(matchups)
+        
+        valid = [
+            i for i, m in enumerate(matchups)
+            if all(name in self.players for name in m['team1_lineup'] + m['team2_lineup'])
+        ]
+        if not valid:
+            return results
+        
+        # Team-Stats und Synergien aus dem Lineup-Cache, Misses in einem
+        # Durchlauf durch die Synergy-Engine
+        profiles = self.synergy_calc.get_lineup_profiles(
+            [matchups[i]['team1_lineup'] for i in valid] +
+            [matchups[i]['team2_lineup'] for i in valid]
+        )
+        n = len(valid)
+        team1_stats = _stack([p['stats'] for p in profiles[:n]])
+        team2_stats = _stack([p['stats'] for p in profiles[n:]])
+        team1_synergies = _stack([p['synergies'] for p in profiles[:n]])
+        team2_synergies = _stack([p['synergies'] for p in profiles[n:]])
+        team1_home = np.array([matchups[i].get('team1_home', True) for i in valid], dtype=bool)
+        
+        scores = self._score_matchups(
+            team1_stats, team1_synergies, team2_stats, team2_synergies, team1_home
+        )
+        
+        for row, i in enumerate(valid):
+            comparison = {
+                'team1': {
+                    'lineup': matchups[i]['team1_lineup'],
+                    'stats': profiles[row]['stats'],
+                    'synergies': profiles[row]['synergies']
+                },
+                'team2': {
+                    'lineup': matchups[i]['team2_lineup'],
+                    'stats': profiles[n + row]['stats'],
+                    'synergies': profiles[n + row]['synergies']
+                }
+            }
+            results[i] = self._build_result(scores, row, comparison)
+        
+        return results
+    
+    def league_matrix(self):
+        """
+        Round-Robin aller Teams mit ihren Standard-Starting-5
+        
+        Die Synergien jedes Teams werden einmal berechnet (Lineup-Cache),
+        alle Paarungen dann in einer einzigen Broadcast-Rechnung (T x T).
+        
+        Returns:
+            Dict mit Teams, Lineups, Gewinnwahrscheinlichkeits-Matrix
+            (Zeile = Heimteam) und aggregiertem Ranking
+        """
+        teams = sorted({p['team'] for p in self.players.values()})
+        lineups = {team: self.synergy_calc.get_default_lineup(team) for team in teams}
+        teams = [team for team in teams if lineups[team]]
+        
+        profiles = self.synergy_calc.get_lineup_profiles([lineups[team] for team in teams])
+        stats = _stack([p['stats'] for p in profiles])
+        synergies = _stack([p['synergies'] for p in profiles])
+        
+        # Zeile i = Team i zu Hause, Spalte j = Gegner j
+        row = lambda d: {key: values[:, None] for key, values in d.items()}
+        col = lambda d: {key: values[None, :] for key, values in d.items()}
+        scores = self._score_matchups(row(stats), row(synergies), col(stats), col(synergies), True)
+        
+        home_prob = scores['team1_win_prob']
+        np.fill_diagonal(home_prob, np.nan)
+        
+        # Auswärts: i gewinnt bei j, wenn j zu Hause verliert
+        away_prob = 1 - home_prob.T
+        home_avg = np.nanmean(home_prob, axis=1)
+        away_avg = np.nanmean(away_prob, axis=1)
+        overall = (home_avg + away_avg) / 2
+        
+        ranking = [
+            {
+                'rank': rank,
+                'team': teams[i],
+                'win_prob': float(overall[i]),
+                'home_win_prob': float(home_avg[i]),
+                'away_win_prob': float(away_avg[i]),
+                'synergy_total': float(synergies['total'][i])
+            }
+            for rank, i in enumerate(np.argsort(-overall, kind='stable'), 1)
+        ]
+        
+        return {
+            'teams': teams,
+            'lineups': {team: lineups[team] for team in teams},
+            'home_win_prob': [
+                [None if i == j else float(home_prob[i, j]) for j in range(len(teams))]
+                for i in range(len(teams))
+            ],
+            'ranking': ranking
+        }
+    
+    def _score_matchups(self, team1_stats, team1_synergies,
+                        team2_stats, team2_synergies, team1_home):
+        """
+        Kreuz-Team-Teil der Vorhersage (Scoring, Heimvorteil, Defense, Sigmoid)
+        
+        Alle Eingaben sind Arrays gleicher (oder broadcastbarer) Form, damit
+        ein einzelnes Spiel und ein ganzer Batch exakt dieselbe Rechnung
+        durchlaufen.
+        """
         # === SCORING PREDICTION ===
         # Basis: Durchschnittliche Punkte der Spieler
-        team1_base_pts = team1['stats']['PTS']
-        team2_base_pts = team2['stats']['PTS']
+        team1_base_pts = team1_stats['PTS']
+        team2_base_pts = team2_stats['PTS']
         
         # Synergy-Multiplikatoren
-        team1_synergy_mult = 1 + (team1['synergies']['total'] / 500)
-        team2_synergy_mult = 1 + (team2['synergies']['total'] / 500)
+        team1_synergy_mult = 1 + (team1_synergies['total'] / 500)
+        team2_synergy_mult = 1 + (team2_synergies['total'] / 500)
         
         # Effizienz-Faktor (FG%)
-        team1_efficiency = team1['stats']['FG_PCT']
-        team2_efficiency = team2['stats']['FG_PCT']
+        team1_efficiency = team1_stats['FG_PCT']
+        team2_efficiency = team2_stats['FG_PCT']
         
         # Predicted Scores
         team1_predicted_pts = team1_base_pts * team1_synergy_mult * (0.9 + team1_efficiency * 0.2)
         team2_predicted_pts = team2_base_pts * team2_synergy_mult * (0.9 + team2_efficiency * 0.2)
         
         # Heimvorteil
-        if team1_home:
-            team1_predicted_pts += 3.5
-        else:
-            team2_predicted_pts += 3.5
+        team1_predicted_pts = np.where(team1_home, team1_predicted_pts + 3.5, team1_predicted_pts)
+        team2_predicted_pts = np.where(team1_home, team2_predicted_pts, team2_predicted_pts + 3.5)
         
         # Defense-Anpassung
-        team1_defense_factor = team1['synergies']['defense'] / 100
-        team2_defense_factor = team2['synergies']['defense'] / 100
+        team1_defense_factor = team1_synergies['defense'] / 100
+        team2_defense_factor = team2_synergies['defense'] / 100
         
         team1_predicted_pts = team1_predicted_pts * (1 - team2_defense_factor * 0.1)
         team2_predicted_pts = team2_predicted_pts * (1 - team1_defense_factor * 0.1)
         
         # === WIN PROBABILITY ===
         score_diff = team1_predicted_pts - team2_predicted_pts
-        synergy_diff = team1['synergies']['total'] - team2['synergies']['total']
+        synergy_diff = team1_synergies['total'] - team2_synergies['total']
         
         total_advantage = score_diff * 2 + synergy_diff / 10
         
         # Sigmoid für Wahrscheinlichkeit
         team1_win_prob = 1 / (1 + np.exp(-total_advantage / 10))
-        team2_win_prob = 1 - team1_win_prob
+        
+        return {
+            'team1_pts': team1_predicted_pts,
+            'team2_pts': team2_predicted_pts,
+            'team1_win_prob': team1_win_prob,
+            'team2_win_prob': 1 - team1_win_prob
+        }
+    
+    def _build_result(self, scores, row, comparison):
+        """Baut das Ergebnis-Dict für ein Matchup aus den Score-Arrays"""
+        team1_predicted_pts = float(scores['team1_pts'][row])
+        team2_predicted_pts = float(scores['team2_pts'][row])
+        team1_win_prob = float(scores['team1_win_prob'][row])
+        team2_win_prob = float(scores['team2_win_prob'][row])
         
         return {
             'team1_score': round(team1_predicted_pts),
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+NBA Live Poller
+Pollt das Live-Scoreboard in festem Intervall und verteilt nur die
+Änderungen (Status, Spielstand) an alle Abonnenten - z.B. per SSE
+
+Ein Poller pro Prozess: die Last auf die NBA API hängt nur vom Intervall ab,
+nicht von der Anzahl verbundener Clients.
+"""
+
+import queue
+import threading
+import time
+
+from nba_games_loader import NBAGamesLoader
+
+# Felder, deren Änderung als Update gemeldet wird
+TRACKED_FIELDS = ('status', 'status_code', 'team1_score', 'team2_score')
+
+# Letztes Event an einen abgehängten Abonnenten: Stream beenden
+CLOSED = {'type': 'closed'}
+
+
+class TooManySubscribers(RuntimeError):
+    """max_subscribers erreicht - jeder Stream belegt einen Server-Thread"""
+
+
+def diff_games(old, new):
+    """
+    Änderungen zwischen zwei Ständen des Scoreboards
+
+    Args:
+        old, new: Dicts game_id -> game
+
+    Returns:
+        Liste von Events ('added', 'update', 'removed')
+    """
+    events = []
+
+    for game_id, game in new.items():
+        previous = old.get(game_id)
+        if previous is None:
+            events.append({'type': 'added', 'game_id': game_id, 'game': game})
+            continue
+
+        changes = {
+            field: game.get(field)
+            for field in TRACKED_FIELDS
+            if game.get(field) != previous.get(field)
+        }
+        if changes:
+            events.append({'type': 'update', 'game_id': game_id, 'changes': changes, 'game': game})
+
+    for game_id in old.keys() - new.keys():
+        events.append({'type': 'removed', 'game_id': game_id})
+
+    return events
+
+
+class ScoreboardPoller:
+    """Hintergrund-Thread, der das Scoreboard pollt und Diffs an Queues verteilt"""
+
+    def __init__(self, loader=None, interval=10, queue_size=100, max_subscribers=None):
+        """
+        Args:
+            loader: NBAGamesLoader (Default: eigener)
+            interval: Poll-Intervall in Sekunden
+            queue_size: Maximal gepufferte Events pro Abonnent
+            max_subscribers: Maximal gleichzeitige Abonnenten (None = unbegrenzt)
+        """
+        self.loader = loader or NBAGamesLoader()
+        self.interval = interval
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+
+        self.games = {}
+        self.polls = 0
+        self.last_poll = None
+
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Startet den Poll-Thread (idempotent, im Worker-Prozess nach dem fork)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='scoreboard-poller', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def subscribe(self):
+        """
+        Neuer Abonnent. Die Queue startet mit einem 'snapshot'-Event des
+        aktuellen Stands, danach kommen nur noch Änderungen. Wird der
+        Abonnent abgehängt, kommt als letztes Event CLOSED.
+
+        Raises:
+            TooManySubscribers: max_subscribers erreicht
+        """
+        # Ein Platz mehr als queue_size, reserviert für CLOSED
+        subscriber = queue.Queue(maxsize=self.queue_size + 1)
+
+        with self._lock:
+            if self.max_subscribers is not None and len(self._subscribers) >= self.max_subscribers:
+                raise TooManySubscribers(f"Maximal {self.max_subscribers} Live-Streams pro Prozess")
+            subscriber.put({'type': 'snapshot', 'games': list(self.games.values())})
+            self._subscribers.add(subscriber)
+
+        self.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _broadcast_locked(self, events):
+        """Verteilt events an alle Abonnenten, Aufrufer hält self._lock"""
+        for subscriber in list(self._subscribers):
+            for event in events:
+                if subscriber.qsize() >= self.queue_size:
+                    # Zu langsamer Client - abhängen und den Stream beenden (reservierter
+                    # Platz für CLOSED), EventSource verbindet sich neu und bekommt einen Snapshot
+                    self._subscribers.discard(subscriber)
+                    subscriber.put_nowait(CLOSED)
+                    break
+                subscriber.put_nowait(event)
+
+    def poll_once(self):
+        """
+        Ein Poll: Scoreboard laden, diffen, Änderungen verteilen.
+        Schlägt der Abruf fehl, wirft der Loader und der alte Stand bleibt -
+        sonst gingen an alle Clients 'removed' und danach wieder 'added' raus.
+        """
+        games = {
+            game['game_id']: game
+            for game in self.loader.get_todays_games(include_finished=True, raise_errors=True)
+        }
+
+        # Stand und Verteilung in einem Lock: ein subscribe() dazwischen bekäme
+        # den neuen Stand als Snapshot und dieselben Änderungen noch einmal als Diff
+        with self._lock:
+            events = diff_games(self.games, games)
+            self.games = games
+            self.polls += 1
+            self.last_poll = time.time()
+            if events:
+                self._broadcast_locked(events)
+        return events
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Ohne Abonnenten nicht pollen
+            if self._subscribers:
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    print(f"⚠️ Scoreboard-Poll fehlgeschlagen: {e}")
+            self._stop.wait(self.interval)
+
+    def info(self):
+        """Poller-Statistiken"""
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'games': len(self.games),
+                'polls': self.polls,
+                'interval_s': self.interval,
+                'last_poll': self.last_poll
+            }
@@ -9,6 +9,28 @@ import joblib
 import warnings
 warnings.filterwarnings('ignore')
 
+# Team-Stats pro Team in Reihenfolge der Feature-Spalten (nach TEAM1_HOME)
+TEAM_STAT_KEYS = ['PTS_AVG', 'FG_PCT', 'FG3_PCT', 'REB_AVG', 'AST_AVG', 'TOV_AVG']
+
+
+def game_features(team1_stats, team2_stats, team1_home=True):
+    """Feature-Zeile (13 Werte) für ein Spiel aus den Team-Durchschnitten"""
+    return ([1 if team1_home else 0] +
+            [team1_stats[key] for key in TEAM_STAT_KEYS] +
+            [team2_stats[key] for key in TEAM_STAT_KEYS])
+
+
+def game_result(probabilities, classes):
+    """Ergebnis-Dict aus einer Zeile predict_proba; das Label ist die wahrscheinlichste Klasse"""
+    prediction = classes[np.argmax(probabilities)]
+    return {
+        'winner': 'Team 1' if prediction == 1 else 'Team 2',
+        'team1_win_probability': probabilities[1],
+        'team2_win_probability': probabilities[0],
+        'confidence': max(probabilities)
+    }
+
+
 class NBAPredictor:
     """Machine Learning Modell für NBA-Spielvorhersagen"""
     
@@ -17,6 +39,8 @@ class NBAPredictor:
         self.scaler = StandardScaler()
         self.feature_columns = None
         self.accuracy = None
+        self.compiled = None  # CompiledEnsemble (nba_tree_compiler), siehe compile()
+        self.base_estimators = None  # Ensemble-Größe beim letzten Neutraining (nba_model_updater)
         
     def load_data(self, filename='nba_training_data.csv'):
         """Lädt die vorbereiteten Trainingsdaten"""
@@ -92,6 +116,8 @@ class NBAPredictor:
         print(f"Gradient Boosting Accuracy: {gb_accuracy:.2%}")
         
         # Wähle bestes Modell
+        self.compiled = None
+        self.base_estimators = None
         if rf_accuracy > gb_accuracy:
             self.model = rf_model
             self.accuracy = rf_accuracy
@@ -131,49 +157,54 @@ class NBAPredictor:
         Returns:
             Dict mit Vorhersage und Wahrscheinlichkeiten
         """
-        if self.model is None:
-            raise ValueError("Modell muss erst trainiert werden!")
-        
-        # Erstelle Feature-Array
-        features = np.array([[
-            1 if team1_home else 0,
-            team1_stats['PTS_AVG'],
-            team1_stats['FG_PCT'],
-            team1_stats['FG3_PCT'],
-            team1_stats['REB_AVG'],
-            team1_stats['AST_AVG'],
-            team1_stats['TOV_AVG'],
-            team2_stats['PTS_AVG'],
-            team2_stats['FG_PCT'],
-            team2_stats['FG3_PCT'],
-            team2_stats['REB_AVG'],
-            team2_stats['AST_AVG'],
-            team2_stats['TOV_AVG']
-        ]])
-        
-        # Skaliere Features
-        features_scaled = self.scaler.transform(features)
-        
-        # Vorhersage
-        prediction = self.model.predict(features_scaled)[0]
-        probabilities = self.model.predict_proba(features_scaled)[0]
+        features = np.array([game_features(team1_stats, team2_stats, team1_home)])
+        return game_result(self.predict_proba(features)[0], self.classes)
+    
+    def predict_proba(self, features):
+        """
+        Wahrscheinlichkeiten für viele Spiele auf einmal
         
-        result = {
-            'winner': 'Team 1' if prediction == 1 else 'Team 2',
-            'team1_win_probability': probabilities[1],
-            'team2_win_probability': probabilities[0],
-            'confidence': max(probabilities)
-        }
+        Args:
+            features: Matrix (n_games x 13), Zeilen aus game_features
         
-        return result
+        Returns:
+            predict_proba-Matrix (n_games x 2) - ein Durchlauf durch das Modell
+        """
+        if self.compiled is not None:
+            return self.compiled.predict_proba(features)
+        if self.model is None:
+            raise ValueError("Modell muss erst trainiert werden!")
+        return self.model.predict_proba(self.scaler.transform(features))
+    
+    @property
+    def classes(self):
+        """Klassen-Labels (Spalten von predict_proba)"""
+        if self.compiled is not None:
+            return self.compiled.classes
+        if self.model is None:
+            raise ValueError("Modell muss erst trainiert werden!")
+        return self.model.classes_
+    
+    def compile(self):
+        """
+        Übersetzt Modell + Scaler in flache Arrays (nba_tree_compiler) - gleiche
+        Wahrscheinlichkeiten, aber Mikrosekunden statt Millisekunden pro Spiel
+        """
+        from nba_tree_compiler import compile_ensemble
+        self.compiled = compile_ensemble(self.model, self.scaler)
+        return self.compiled
     
     def save_model(self, filename='nba_model.pkl'):
         """Speichert trainiertes Modell"""
+        if self.model is None:
+            raise ValueError("Kein sklearn-Modell zum Speichern - aus einem Artifact geladene "
+                             "Predictors sind nur kompiliert, bitte load_model() mit der .pkl verwenden")
         model_data = {
             'model': self.model,
             'scaler': self.scaler,
             'feature_columns': self.feature_columns,
-            'accuracy': self.accuracy
+            'accuracy': self.accuracy,
+            'base_estimators': self.base_estimators
         }
         joblib.dump(model_data, filename)
         print(f"\nModell gespeichert: {filename}")
@@ -185,7 +216,23 @@ class NBAPredictor:
         self.scaler = model_data['scaler']
         self.feature_columns = model_data['feature_columns']
         self.accuracy = model_data['accuracy']
+        self.base_estimators = model_data.get('base_estimators')
+        self.compiled = None
         print(f"Modell geladen (Accuracy: {self.accuracy:.2%})")
+    
+    def load_artifact(self, directory='nba_model', mmap_mode='r'):
+        """
+        Lädt ein Modell-Verzeichnis (nba_model_artifact) - nur die kompilierten
+        Arrays, ohne sklearn-Objekte; predict_proba läuft über self.compiled
+        """
+        from nba_model_artifact import load_artifact
+        self.compiled, manifest = load_artifact(directory, mmap_mode=mmap_mode)
+        self.model = None
+        self.scaler = None
+        self.feature_columns = manifest['feature_columns']
+        self.accuracy = manifest['accuracy']
+        print(f"Modell-Artifact geladen (Accuracy: {self.accuracy:.2%})")
+        return manifest
 
 
 # Beispiel-Nutzung
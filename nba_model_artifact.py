@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+NBA Model Artifact
+Modell als Verzeichnis statt joblib-Blob: manifest.json (Metadaten) plus die
+kompilierten Baum-Arrays (nba_tree_compiler) als .npy-Dateien
+
+Die Arrays werden mit mmap_mode='r' geladen: kein Unpickling des Forests,
+und alle Worker-Prozesse teilen sich dieselben Seiten im Page Cache.
+
+nba_model ist ein Symlink auf die aktuelle Version (nba_model.v<ns>-<pid>).
+Ein Build schreibt eine neue Version und tauscht den Link atomar aus, Leser
+sehen also immer ein vollständiges Artifact. Die vorherige Version bleibt
+liegen (Leser, die gerade laden), ältere werden gelöscht.
+
+Build-Schritt:  python nba_model_artifact.py build [nba_model.pkl] [training.csv]
+Info:           python nba_model_artifact.py info [nba_model]
+"""
+
+import hashlib
+import json
+import os
+import glob
+import shutil
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from nba_prediction_store import atomic_write_json
+from nba_tree_compiler import ARRAY_NAMES, CompiledEnsemble
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+
+def artifact_path(model_file):
+    """Artifact-Verzeichnis zu einer Modell-Datei (gleicher Name ohne .pkl)"""
+    return os.path.splitext(model_file)[0]
+
+
+def is_fresh(model_file, artifact_dir):
+    """True wenn das Artifact existiert und nicht älter als die Modell-Datei ist"""
+    manifest = os.path.join(artifact_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest):
+        return False
+    if not os.path.exists(model_file):
+        return True
+    return os.path.getmtime(manifest) >= os.path.getmtime(model_file)
+
+
+def file_sha256(path):
+    """SHA-256 einer Datei (in Blöcken gelesen)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_artifact(predictor, artifact_dir, training_data=None, sklearn_version=None):
+    """
+    Schreibt Manifest + Arrays eines NBAPredictor
+
+    Args:
+        predictor: NBAPredictor mit trainiertem oder kompiliertem Modell
+        training_data: CSV, deren Hash ins Manifest kommt (optional)
+        sklearn_version: sklearn-Version, mit der das Modell trainiert wurde
+                         (Default: installierte Version)
+    """
+    import sklearn
+
+    compiled = predictor.compiled or predictor.compile()
+
+    # Neue Version komplett schreiben, dann den Link austauschen
+    artifact_dir = artifact_dir.rstrip(os.sep)
+    tmp_dir = f"{artifact_dir}.v{time.time_ns()}-{os.getpid()}"
+    os.makedirs(tmp_dir)
+
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(compiled.arrays[name]))
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'sklearn_version': sklearn_version or sklearn.__version__,
+        'model_type': type(predictor.model).__name__ if predictor.model is not None else None,
+        'kind': compiled.kind,
+        'classes': [int(c) for c in compiled.classes],
+        'max_depth': compiled.max_depth,
+        'n_features': compiled.n_features,
+        'init_raw': compiled.init_raw,
+        'feature_columns': list(predictor.feature_columns),
+        'accuracy': predictor.accuracy,
+        'training_data': None,
+        'arrays': {
+            name: {'dtype': str(array.dtype), 'shape': list(array.shape)}
+            for name, array in compiled.arrays.items()
+        }
+    }
+    if training_data and os.path.exists(training_data):
+        manifest['training_data'] = {
+            'file': os.path.basename(training_data),
+            'sha256': file_sha256(training_data)
+        }
+    atomic_write_json(os.path.join(tmp_dir, MANIFEST_FILE), manifest)
+
+    _swap_link(artifact_dir, tmp_dir)
+    return manifest
+
+
+def _swap_link(artifact_dir, version_dir):
+    """Zeigt artifact_dir atomar auf version_dir und räumt alte Versionen auf"""
+    previous = os.path.realpath(artifact_dir) if os.path.islink(artifact_dir) else None
+
+    # Altes Layout (echtes Verzeichnis) einmalig zur Version machen - nur hier
+    # gibt es einen kurzen Moment ohne nba_model/, der Registry-Load wiederholt dann
+    if os.path.isdir(artifact_dir) and not os.path.islink(artifact_dir):
+        previous = f"{artifact_dir}.v0-{os.getpid()}"
+        os.rename(artifact_dir, previous)
+
+    link = f"{artifact_dir}.link.{os.getpid()}"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(version_dir), link)
+    os.replace(link, artifact_dir)
+
+    keep = {os.path.realpath(version_dir), previous}
+    for old in glob.glob(f"{glob.escape(artifact_dir)}.v*"):
+        if os.path.realpath(old) not in keep:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def load_artifact(artifact_dir, mmap_mode='r'):
+    """
+    Lädt ein Artifact
+
+    Args:
+        mmap_mode: 'r' = Arrays nur einblenden (geteilt zwischen Prozessen), None = in den Speicher lesen
+
+    Returns:
+        (CompiledEnsemble, manifest)
+    """
+    # Link einmal auflösen: Manifest und Arrays aus derselben Version
+    artifact_dir = os.path.realpath(artifact_dir)
+    with open(os.path.join(artifact_dir, MANIFEST_FILE), 'r') as f:
+        manifest = json.load(f)
+
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Artifact-Format {manifest.get('format_version')} wird nicht unterstützt "
+                         f"(erwartet {FORMAT_VERSION})")
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        array = np.load(os.path.join(artifact_dir, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+        if str(array.dtype) != spec['dtype'] or list(array.shape) != spec['shape']:
+            raise ValueError(f"{name}.npy passt nicht zum Manifest")
+        # Plain ndarray über dem Mapping (keine Kopie) - memmap-Indexing ist ~3x langsamer
+        arrays[name] = np.asarray(array)
+
+    compiled = CompiledEnsemble(manifest['kind'], arrays, manifest['max_depth'],
+                                manifest['n_features'], manifest['init_raw'], manifest['classes'])
+    return compiled, manifest
+
+
+def convert(model_file='nba_model.pkl', artifact_dir=None, training_data='nba_training_data.csv'):
+    """Konvertiert ein joblib-Modell (NBAPredictor.save_model) in ein Artifact"""
+    from nba_ml_model import NBAPredictor
+
+    artifact_dir = artifact_dir or artifact_path(model_file)
+
+    # Trainings-Version aus der sklearn-Warnung beim Laden älterer Pickles
+    sklearn_version = None
+    predictor = NBAPredictor()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        predictor.load_model(model_file)
+    for warning in caught:
+        sklearn_version = getattr(warning.message, 'original_sklearn_version', sklearn_version)
+
+    manifest = save_artifact(predictor, artifact_dir, training_data, sklearn_version)
+
+    size = sum(os.path.getsize(os.path.join(artifact_dir, f)) for f in os.listdir(artifact_dir))
+    print(f"✓ Artifact gebaut: {artifact_dir} ({manifest['kind']}, "
+          f"{size / 1e6:.1f} MB, sklearn {manifest['sklearn_version']})")
+    return manifest
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        model_file = sys.argv[2] if len(sys.argv) > 2 else 'nba_model.pkl'
+        training_data = sys.argv[3] if len(sys.argv) > 3 else 'nba_training_data.csv'
+        convert(model_file, training_data=training_data)
+    elif len(sys.argv) > 1 and sys.argv[1] == "info":
+        _, manifest = load_artifact(sys.argv[2] if len(sys.argv) > 2 else 'nba_model')
+        print(json.dumps({k: v for k, v in manifest.items() if k != 'arrays'}, indent=2))
+    else:
+        print("Usage: python nba_model_artifact.py build [nba_model.pkl] [training.csv]")
+        print("       python nba_model_artifact.py info [nba_model]")
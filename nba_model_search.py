@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+NBA Model Search
+Hyperparameter-Suche über Random Forest und Gradient Boosting mit
+zeitlicher Kreuzvalidierung (TimeSeriesSplit über GAME_DATE)
+
+- Folds nach Spieltagen: trainiert wird nur auf Spielen vor dem Testzeitraum,
+  Spiele desselben Tages landen nie auf beiden Seiten
+- Fold-Matrizen (pro Fold skaliert) werden einmal gebaut, als .npy gecacht und
+  von den Worker-Prozessen per mmap gelesen; nur der aktuelle Datenstand bleibt
+  im Cache, ältere werden gelöscht
+- Konfigurationen laufen parallel über joblib (workers, Default: alle Kerne);
+  jedes Ergebnis wird ausgewertet, sobald es fertig ist (ein freier Worker
+  startet sofort die nächste), die Suche stoppt, wenn sich der beste Score
+  über patience Konfigurationen nicht mehr verbessert - noch offene
+  Konfigurationen werden dann abgebrochen
+- Auswahl nach log_loss, brier oder accuracy
+
+Nutzung:  python nba_model_search.py [metric] [workers] [training.csv]
+"""
+
+import hashlib
+import os
+import random
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score, brier_score_loss, log_loss
+from sklearn.model_selection import ParameterGrid, TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+
+from nba_ml_model import NBAPredictor
+from nba_prediction_store import default_data_dir
+
+MODEL_FAMILIES = {
+    'random_forest': RandomForestClassifier,
+    'gradient_boosting': GradientBoostingClassifier
+}
+
+SEARCH_SPACE = {
+    'random_forest': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [6, 10, None],
+        'min_samples_leaf': [1, 5, 20],
+        'max_features': ['sqrt', 0.5]
+    },
+    'gradient_boosting': {
+        'n_estimators': [100, 200],
+        'learning_rate': [0.03, 0.1],
+        'max_depth': [2, 3, 5],
+        'subsample': [1.0, 0.8]
+    }
+}
+
+# Metrik -> True wenn größer besser
+METRICS = {'log_loss': False, 'brier': False, 'accuracy': True}
+
+N_SPLITS = 5
+PATIENCE = 12          # Konfigurationen ohne Verbesserung bis zum Abbruch
+MIN_DELTA = 1e-4       # kleinere Verbesserungen zählen als Plateau
+
+
+def default_cache_dir():
+    """model_search_cache im Daten-Verzeichnis"""
+    return os.path.join(default_data_dir(), 'model_search_cache')
+
+
+def time_folds(dates, n_splits=N_SPLITS):
+    """
+    TimeSeriesSplit über die Spieltage
+
+    Args:
+        dates: GAME_DATE pro Zeile (aufsteigend sortiert)
+
+    Returns:
+        Liste von (train_index, test_index) über die Zeilen
+    """
+    days, day_of_row = np.unique(np.asarray(dates), return_inverse=True)
+    folds = []
+    for train_days, test_days in TimeSeriesSplit(n_splits=n_splits).split(days):
+        folds.append((np.flatnonzero(day_of_row <= train_days[-1]),
+                      np.flatnonzero((day_of_row >= test_days[0]) & (day_of_row <= test_days[-1]))))
+    return folds
+
+
+def build_fold_cache(X, y, dates, n_splits=N_SPLITS, cache_dir=None):
+    """
+    Skalierte Fold-Matrizen als .npy (einmal pro Datenstand und n_splits)
+
+    Returns:
+        Verzeichnis mit X_train_<i>.npy, y_train_<i>.npy, X_test_<i>.npy, y_test_<i>.npy
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.int64)
+    dates = np.asarray(dates).astype(str)
+    key = hashlib.sha256(X.tobytes() + y.tobytes() + '|'.join(dates).encode()
+                         + str(n_splits).encode()).hexdigest()[:16]
+    root = cache_dir or default_cache_dir()
+    folder = os.path.join(root, key)
+    if os.path.exists(os.path.join(folder, 'complete')):
+        prune_fold_cache(root, key)
+        return folder
+
+    os.makedirs(folder, exist_ok=True)
+    for i, (train, test) in enumerate(time_folds(dates, n_splits)):
+        # Scaler nur auf dem Trainingsteil, wie im späteren Betrieb
+        scaler = StandardScaler().fit(X[train])
+        np.save(os.path.join(folder, f"X_train_{i}.npy"), scaler.transform(X[train]))
+        np.save(os.path.join(folder, f"y_train_{i}.npy"), y[train])
+        np.save(os.path.join(folder, f"X_test_{i}.npy"), scaler.transform(X[test]))
+        np.save(os.path.join(folder, f"y_test_{i}.npy"), y[test])
+    with open(os.path.join(folder, 'complete'), 'w') as f:
+        f.write(str(n_splits))
+    prune_fold_cache(root, key)
+    return folder
+
+
+def prune_fold_cache(root, keep):
+    """
+    Löscht die Fold-Matrizen älterer Datenstände (jedes Update der
+    Trainingsdaten ergibt einen neuen Key), nur keep bleibt
+    """
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name != keep and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def evaluate_config(family, params, fold_dir, n_splits=N_SPLITS):
+    """
+    Eine Konfiguration über alle Folds (läuft im Worker-Prozess)
+
+    Returns:
+        Dict mit family, params, Mittelwerten der Metriken und seconds
+    """
+    start = time.perf_counter()
+    scores = {metric: [] for metric in METRICS}
+
+    for i in range(n_splits):
+        def load(name):
+            return np.load(os.path.join(fold_dir, f"{name}_{i}.npy"), mmap_mode='r')
+
+        model = MODEL_FAMILIES[family](random_state=42, **params)
+        if hasattr(model, 'n_jobs'):
+            model.n_jobs = 1  # Parallelität kommt aus den Worker-Prozessen
+        model.fit(load('X_train'), load('y_train'))
+
+        y_test = load('y_test')
+        proba = model.predict_proba(load('X_test'))
+        win = proba[:, list(model.classes_).index(1)]
+        scores['log_loss'].append(log_loss(y_test, win, labels=[0, 1]))
+        scores['brier'].append(brier_score_loss(y_test, win))
+        scores['accuracy'].append(accuracy_score(y_test, (win > 0.5).astype(int)))
+
+    result = {'family': family, 'params': params}
+    result.update({metric: float(np.mean(values)) for metric, values in scores.items()})
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def search_configs(seed=42):
+    """Alle Konfigurationen, zufällig gemischt (Plateau-Abbruch trifft keine Familie systematisch)"""
+    configs = [(family, params) for family, space in SEARCH_SPACE.items() for params in ParameterGrid(space)]
+    random.Random(seed).shuffle(configs)
+    return configs
+
+
+class ModelSearch:
+    """Parallele Hyperparameter-Suche mit zeitlicher Kreuzvalidierung"""
+
+    def __init__(self, metric='log_loss', workers=None, n_splits=N_SPLITS,
+                 patience=PATIENCE, min_delta=MIN_DELTA, cache_dir=None):
+        """
+        Args:
+            metric: 'log_loss', 'brier' oder 'accuracy'
+            workers: Worker-Prozesse (Default: SEARCH_WORKERS bzw. alle Kerne)
+            patience: Konfigurationen ohne Verbesserung bis zum Abbruch (None = alle)
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unbekannte Metrik: {metric} (erlaubt: {', '.join(METRICS)})")
+        if workers is None:
+            workers = int(os.environ.get('SEARCH_WORKERS', os.cpu_count() or 1))
+
+        self.metric = metric
+        self.workers = max(1, workers)
+        self.n_splits = n_splits
+        self.patience = patience
+        self.min_delta = min_delta
+        self.cache_dir = cache_dir
+
+        self.results = []
+        self.best = None
+        self.wall_time = None
+
+    def _better(self, score, best):
+        if best is None:
+            return True
+        if METRICS[self.metric]:
+            return score > best + self.min_delta
+        return score < best - self.min_delta
+
+    def run(self, df, configs=None):
+        """
+        Sucht die beste Konfiguration
+
+        Args:
+            df: Trainingsdaten (nba_training_data.csv) mit GAME_DATE
+
+        Returns:
+            Bestes Ergebnis (Dict aus evaluate_config)
+        """
+        start = time.perf_counter()
+        predictor = NBAPredictor()
+        df = df.sort_values('GAME_DATE', kind='stable')
+        X, y = predictor.prepare_features(df)
+        dates = df.loc[X.index, 'GAME_DATE']
+
+        fold_dir = build_fold_cache(X.to_numpy(), y.to_numpy(), dates, self.n_splits, self.cache_dir)
+        configs = configs if configs is not None else search_configs()
+        print(f"🔍 {len(configs)} Konfigurationen, {self.n_splits} Folds, "
+              f"{self.workers} Worker, Auswahl nach {self.metric}")
+
+        self.results, self.best = [], None
+        since_improvement = 0
+        # Ergebnisse in Fertigstellungs-Reihenfolge statt in Runden: ein
+        # langsamer Forest blockiert die übrigen Worker nicht
+        parallel = Parallel(n_jobs=self.workers, return_as='generator_unordered')
+        results = parallel(delayed(evaluate_config)(family, params, fold_dir, self.n_splits)
+                           for family, params in configs)
+        try:
+            for result in results:
+                self.results.append(result)
+                improved = self._better(result[self.metric], None if self.best is None else self.best[self.metric])
+                if improved:
+                    self.best = result
+                    since_improvement = 0
+                else:
+                    since_improvement += 1
+                print(f"  {'★' if improved else ' '} {result['family']:<18} "
+                      f"log_loss {result['log_loss']:.4f}  brier {result['brier']:.4f}  "
+                      f"acc {result['accuracy']:.2%}  {result['seconds']:.2f}s  {result['params']}")
+
+                if self.patience is not None and since_improvement >= self.patience:
+                    print(f"⏹  Plateau: {since_improvement} Konfigurationen ohne Verbesserung")
+                    break
+        finally:
+            # Bricht noch laufende bzw. wartende Konfigurationen ab
+            results.close()
+
+        self.wall_time = time.perf_counter() - start
+        cpu_time = sum(result['seconds'] for result in self.results)
+        print(f"\n✓ {len(self.results)}/{len(configs)} Konfigurationen in {self.wall_time:.1f}s "
+              f"(Summe pro Konfiguration {cpu_time:.1f}s)")
+        print(f"✓ Beste: {self.best['family']} {self.best['params']} "
+              f"({self.metric} {self.best[self.metric]:.4f}, Accuracy {self.best['accuracy']:.2%})")
+        return self.best
+
+    def fit_best(self, df):
+        """
+        Trainiert die beste Konfiguration auf allen Daten
+
+        Returns:
+            NBAPredictor (accuracy = mittlere Fold-Accuracy der Suche)
+        """
+        if self.best is None:
+            raise ValueError("Erst run() ausführen!")
+
+        predictor = NBAPredictor()
+        X, y = predictor.prepare_features(df.sort_values('GAME_DATE', kind='stable'))
+        predictor.model = MODEL_FAMILIES[self.best['family']](random_state=42, **self.best['params'])
+        predictor.model.fit(predictor.scaler.fit_transform(X), y)
+        predictor.accuracy = self.best['accuracy']
+        return predictor
+
+
+if __name__ == "__main__":
+    import sys
+
+    metric = sys.argv[1] if len(sys.argv) > 1 else 'log_loss'
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    training_data = sys.argv[3] if len(sys.argv) > 3 else 'nba_training_data.csv'
+
+    df = pd.read_csv(training_data)
+    search = ModelSearch(metric=metric, workers=workers)
+    search.run(df)
+    predictor = search.fit_best(df)
+    predictor.save_model()
+    print("Artifact neu bauen: python nba_model_artifact.py build")
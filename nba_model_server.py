@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+NBA Model Server
+Serviert das trainierte NBAPredictor-Modell (nba_model.pkl) aus der API
+
+- ModelRegistry: lädt jedes Modell einmal und gibt es nur noch lesend heraus,
+  bevorzugt das Artifact-Verzeichnis (nba_model/, siehe nba_model_artifact)
+- ModelServer: sammelt gleichzeitige Einzel-Requests zu einem Batch, ein
+  predict_proba pro Batch statt predict + predict_proba pro Request
+
+Der Batch-Thread wartet nicht auf weitere Requests: was sich in der Queue
+angesammelt hat, während der letzte Batch lief, wird zusammen gerechnet.
+Einzelne Requests zahlen so keine Latenz, unter Last wachsen die Batches.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from types import MappingProxyType
+
+import numpy as np
+
+from nba_ml_model import NBAPredictor, game_features, game_result
+from nba_model_artifact import artifact_path, is_fresh
+
+DEFAULT_MODEL_PATH = 'nba_model.pkl'
+ARTIFACT_RETRIES = 3         # Artifact fehlt kurz, während ein Build den Link tauscht
+ARTIFACT_RETRY_DELAY = 0.05
+
+
+class ModelRegistry:
+    """Geladene Modelle nach Name - einmal geladen, danach nur gelesen"""
+
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def load(self, name, path):
+        """Lädt ein Modell (idempotent pro Name)"""
+        with self._lock:
+            if name in self._models:
+                return self._models[name]
+
+            start = time.perf_counter()
+            predictor = NBAPredictor()
+            compiled_enabled = os.environ.get('MODEL_COMPILED', '1') == '1'
+
+            # Artifact-Verzeichnis (mmap, ohne Unpickling) wenn vorhanden und aktuell
+            artifact = path if os.path.isdir(path) else artifact_path(path)
+            source = None
+            if os.path.isdir(path) or (compiled_enabled and is_fresh(path, artifact)):
+                source = self._load_artifact(predictor, artifact)
+            if source is None:
+                predictor.load_model(path)
+                source = path
+                # Parallelität kommt aus den Batches, nicht aus joblib pro Request
+                if hasattr(predictor.model, 'n_jobs'):
+                    predictor.model.n_jobs = 1
+                # Flache Arrays statt sklearn-Aufruf (MODEL_COMPILED=0 schaltet ab)
+                if compiled_enabled:
+                    try:
+                        predictor.compile()
+                    except (TypeError, ValueError) as e:
+                        print(f"⚠️ Modell nicht kompilierbar, verwende sklearn: {e}")
+
+            self._models[name] = MappingProxyType({
+                'predictor': predictor,
+                'path': source,
+                'accuracy': predictor.accuracy,
+                'feature_columns': tuple(predictor.feature_columns),
+                'compiled': predictor.compiled.info() if predictor.compiled is not None else None,
+                'load_ms': round((time.perf_counter() - start) * 1000, 1)
+            })
+            return self._models[name]
+
+    @staticmethod
+    def _load_artifact(predictor, artifact, retries=ARTIFACT_RETRIES):
+        """
+        Lädt das Artifact, bei fehlenden Dateien (Build tauscht gerade aus)
+        mit kurzen Wiederholungen. None = .pkl verwenden
+        """
+        for attempt in range(retries + 1):
+            try:
+                predictor.load_artifact(artifact)
+                return artifact
+            except FileNotFoundError as e:
+                if attempt == retries:
+                    print(f"⚠️ Artifact nicht lesbar, verwende .pkl: {e}")
+                    return None
+                time.sleep(ARTIFACT_RETRY_DELAY)
+
+    def get(self, name):
+        return self._models[name]
+
+    def __contains__(self, name):
+        return name in self._models
+
+    def info(self):
+        return {
+            name: {'path': entry['path'], 'accuracy': entry['accuracy'],
+                   'compiled': entry['compiled'], 'load_ms': entry['load_ms']}
+            for name, entry in self._models.items()
+        }
+
+
+registry = ModelRegistry()
+
+
+class ModelServer:
+    """Micro-Batching vor einem Modell aus der Registry"""
+
+    def __init__(self, name='default', path=None, max_batch=64):
+        """
+        Args:
+            name: Name in der Registry
+            path: Modell-Datei oder Artifact-Verzeichnis (Default: MODEL_PATH bzw. nba_model.pkl)
+            max_batch: Maximale Batch-Größe
+        """
+        self.entry = registry.load(name, path or os.environ.get('MODEL_PATH', DEFAULT_MODEL_PATH))
+        self.predictor = self.entry['predictor']
+        self.classes = self.predictor.classes
+        self.max_batch = max_batch
+
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_thread(self):
+        """Batch-Thread starten (im Worker-Prozess, Threads überleben den fork nicht)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='model-batcher', daemon=True)
+                self._thread.start()
+
+    def _count(self, batch_size):
+        with self._stats_lock:
+            self.requests += batch_size
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, batch_size)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                probabilities = self.predictor.predict_proba(np.array([features for features, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self._count(len(batch))
+            for (_, future), row in zip(batch, probabilities):
+                future.set_result(game_result(row, self.classes))
+
+    def predict(self, team1_stats, team2_stats, team1_home=True, timeout=10):
+        """Einzelnes Spiel - wird mit gleichzeitigen Requests gebatcht"""
+        self._ensure_thread()
+        future = Future()
+        self._queue.put((game_features(team1_stats, team2_stats, team1_home), future))
+        return future.result(timeout=timeout)
+
+    def predict_many(self, games):
+        """
+        Viele Spiele direkt als ein Batch (ohne Queue)
+
+        Args:
+            games: Liste von (team1_stats, team2_stats, team1_home)
+        """
+        if not games:
+            return []
+        features = np.array([game_features(*game) for game in games])
+        probabilities = self.predictor.predict_proba(features)
+        self._count(len(games))
+        return [game_result(row, self.classes) for row in probabilities]
+
+    def info(self):
+        """Batching-Statistiken für /api/health"""
+        with self._stats_lock:
+            return {
+                'path': self.entry['path'],
+                'accuracy': self.entry['accuracy'],
+                'compiled': self.entry['compiled'],
+                'load_ms': self.entry['load_ms'],
+                'requests': self.requests,
+                'batches': self.batches,
+                'avg_batch': round(self.requests / self.batches, 2) if self.batches else None,
+                'largest_batch': self.largest_batch
+            }
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+NBA Model Updater
+Inkrementelle Updates für nba_model.pkl statt Neutraining auf der ganzen Historie
+
+- TrainingStore: nba_training_data.csv als Append-Store, neue Spiele werden
+  angehängt (Key: GAME_DATE, TEAM1_ID, TEAM2_ID), vorhandene nicht dupliziert
+- update_model: warm_start - zusätzliche Bäume (Random Forest) bzw. Boosting-
+  Stufen (Gradient Boosting), trainiert nur auf den letzten window Spielen.
+  Der Scaler bleibt fix, sonst passen die Schwellen der alten Bäume nicht mehr.
+- IncrementalUpdater: neue Spiele aus den Game Logs der Saison (NBADataCollector)
+  -> Update -> nba_model.pkl -> Store (+ Artifact, falls vorhanden). Angehängt
+  wird erst nach dem Speichern, ein fehlgeschlagenes Update verliert also
+  keine Spiele für den nächsten Lauf
+
+Jedes Update vergrößert das Modell; nach max_growth zusätzlichen Stufen
+(gegenüber dem letzten Neutraining) wird ein komplettes Neutraining verlangt
+(nba_ml_model.py bzw. nba_model_search.py).
+
+Nutzung:  python nba_model_updater.py [season]
+"""
+
+import os
+import time
+
+import pandas as pd
+
+from nba_ml_model import NBAPredictor
+
+KEY_COLUMNS = ['GAME_DATE', 'TEAM1_ID', 'TEAM2_ID']
+
+STAGES = 10             # neue Bäume / Boosting-Stufen pro Update
+WINDOW = 500            # Trainingsfenster für die neuen Stufen (letzte Spiele)
+MAX_GROWTH = 200        # zusätzliche Stufen seit dem Neutraining, danach komplett neu trainieren
+
+
+class TrainingStore:
+    """Trainingsdaten als CSV, nur anhängen"""
+
+    def __init__(self, path='nba_training_data.csv'):
+        self.path = path
+
+    @staticmethod
+    def _normalize(rows):
+        rows = rows.copy()
+        rows['GAME_DATE'] = pd.to_datetime(rows['GAME_DATE']).dt.strftime('%Y-%m-%d')
+        return rows
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return pd.DataFrame()
+        return pd.read_csv(self.path)
+
+    def new_rows(self, rows):
+        """
+        Die noch nicht gespeicherten Spiele aus rows (ohne zu schreiben)
+
+        Returns:
+            DataFrame, Spalten wie in der CSV
+        """
+        if rows is None or len(rows) == 0:
+            return pd.DataFrame()
+
+        rows = self._normalize(rows).drop_duplicates(subset=KEY_COLUMNS)
+        if os.path.exists(self.path):
+            stored = pd.read_csv(self.path, usecols=KEY_COLUMNS)
+            known = pd.MultiIndex.from_frame(stored.astype({'GAME_DATE': str}))
+            rows = rows[~pd.MultiIndex.from_frame(rows[KEY_COLUMNS]).isin(known)]
+            rows = rows.reindex(columns=pd.read_csv(self.path, nrows=0).columns)
+        return rows
+
+    def append(self, rows):
+        """
+        Hängt noch nicht gespeicherte Spiele an
+
+        Returns:
+            DataFrame der tatsächlich neuen Zeilen
+        """
+        exists = os.path.exists(self.path)
+        rows = self.new_rows(rows)
+        if len(rows):
+            rows.to_csv(self.path, mode='a', header=not exists, index=False)
+        return rows
+
+    def recent(self, n):
+        """Die letzten n Spiele nach GAME_DATE"""
+        rows = self.load()
+        if rows.empty:
+            return rows
+        return rows.sort_values('GAME_DATE', kind='stable').tail(n)
+
+
+def update_model(predictor, X, y, stages=STAGES, max_growth=MAX_GROWTH):
+    """
+    Ergänzt das Ensemble um stages Bäume/Stufen, trainiert auf (X, y)
+
+    Args:
+        predictor: NBAPredictor mit trainiertem RandomForest/GradientBoosting
+        X, y: Trainingsfenster (Rohwerte, Scaler des Modells wird angewendet)
+        max_growth: Stufen über predictor.base_estimators hinaus (Größe beim
+                    Neutraining; ältere .pkl ohne Angabe: aktuelle Größe)
+    """
+    model = predictor.model
+    if model is None:
+        raise ValueError("Modell muss erst trainiert werden!")
+    base = predictor.base_estimators or model.n_estimators
+    if model.n_estimators + stages > base + max_growth:
+        raise ValueError(f"Modell hat {model.n_estimators} Stufen ({base} beim Neutraining, "
+                         f"Limit +{max_growth}) - bitte komplett neu trainieren")
+
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + stages)
+    model.fit(predictor.scaler.transform(X), y)
+    model.set_params(warm_start=False)
+    predictor.base_estimators = base
+    predictor.compiled = None
+    return model
+
+
+def blend_accuracy(accuracy, prequential, n_new, window=WINDOW):
+    """
+    Fortgeschriebene Modell-Accuracy: bisheriger Wert mit Gewicht window,
+    prequential Accuracy auf den n_new neuen Spielen mit Gewicht n_new
+    (gleitender Schnitt über ungefähr die letzten window Spiele)
+    """
+    if prequential is None or n_new == 0:
+        return accuracy
+    if accuracy is None:
+        return prequential
+    return (accuracy * window + prequential * n_new) / (window + n_new)
+
+
+class IncrementalUpdater:
+    """Neue Spiele anhängen und das gespeicherte Modell fortschreiben"""
+
+    def __init__(self, model_file='nba_model.pkl', store=None, stages=STAGES,
+                 window=WINDOW, max_growth=MAX_GROWTH):
+        self.model_file = model_file
+        self.store = store or TrainingStore()
+        self.stages = stages
+        self.window = window
+        self.max_growth = max_growth
+
+    def collect_new_games(self, season):
+        """Matchup-Zeilen aus den Game Logs der Saison (Rolling Averages brauchen die ganze Saison)"""
+        from nba_data_collector import NBADataCollector
+
+        collector = NBADataCollector()
+        games = collector.collect_season_games(season)
+        return collector.create_matchup_dataset(collector.prepare_training_data(games))
+
+    def update(self, rows):
+        """
+        Aktualisiert das Modell mit den neuen Spielen aus rows und hängt sie
+        danach an den Store an
+
+        Returns:
+            Dict mit new_games, prequential_accuracy (Modell vor dem Update auf
+            den neuen Spielen), accuracy (fortgeschrieben, siehe blend_accuracy),
+            n_estimators und seconds - oder None ohne neue Spiele
+        """
+        predictor = NBAPredictor()
+        predictor.load_model(self.model_file)
+
+        new = self.store.new_rows(rows)
+        if len(new) == 0:
+            print("✓ Keine neuen Spiele")
+            return None
+
+        X_new, y_new = predictor.prepare_features(new)
+        prequential = None
+        if len(X_new):
+            predicted = predictor.classes[predictor.predict_proba(X_new.to_numpy()).argmax(axis=1)]
+            prequential = float((predicted == y_new.to_numpy()).mean())
+
+        # Trainingsfenster: gespeicherte plus neue Spiele, Store bleibt bis zum Speichern unverändert
+        window = pd.concat([self.store.recent(self.window), new], ignore_index=True)
+        window = window.sort_values('GAME_DATE', kind='stable').tail(self.window)
+
+        start = time.perf_counter()
+        X, y = predictor.prepare_features(window)
+        update_model(predictor, X, y, self.stages, self.max_growth)
+        seconds = time.perf_counter() - start
+
+        predictor.accuracy = blend_accuracy(predictor.accuracy, prequential, len(X_new), self.window)
+        predictor.save_model(self.model_file)
+        self.store.append(new)
+
+        # Ein vorhandenes Artifact wäre jetzt älter als die .pkl -> neu bauen
+        # (nach dem Anhängen, der Daten-Hash im Manifest gehört zum neuen Stand)
+        from nba_model_artifact import artifact_path, convert
+        if os.path.isdir(artifact_path(self.model_file)):
+            convert(self.model_file, training_data=self.store.path)
+
+        print(f"✓ {len(new)} neue Spiele, Modell auf {predictor.model.n_estimators} Stufen "
+              f"in {seconds:.2f}s" + (f" (Accuracy vorher auf den neuen Spielen: {prequential:.2%})"
+                                      if prequential is not None else ""))
+        return {
+            'new_games': len(new),
+            'prequential_accuracy': prequential,
+            'accuracy': predictor.accuracy,
+            'n_estimators': predictor.model.n_estimators,
+            'seconds': seconds
+        }
+
+if __name__ == "__main__":
+    import sys
+    from nba_api_client import current_season
+
+    season = sys.argv[1] if len(sys.argv) > 1 else current_season()
+    updater = IncrementalUpdater()
+    updater.update(updater.collect_new_games(season))
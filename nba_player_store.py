@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+NBA Player Store
+Binäre, vorverarbeitete Variante von nba_players_2024-25.json für schnelle Starts
+
+Build-Schritt:  python nba_player_store.py build [players.json]
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+def store_path(json_file):
+    """Pfad des binären Stores zu einer Spieler-JSON (gleicher Name, .npz)"""
+    return os.path.splitext(json_file)[0] + '.npz'
+
+
+def is_fresh(json_file, store_file):
+    """True wenn der Store existiert und nicht älter als die JSON ist"""
+    if not os.path.exists(store_file):
+        return False
+    if not os.path.exists(json_file):
+        return True
+    return os.path.getmtime(store_file) >= os.path.getmtime(json_file)
+
+
+def build_store(json_file, store_file=None):
+    """Liest die Spieler-JSON und schreibt den binären Store"""
+    from nba_synergy_system import STAT_COLUMNS
+    
+    store_file = store_file or store_path(json_file)
+    
+    with open(json_file, 'r') as f:
+        players = json.load(f)
+    
+    names = list(players.keys())
+    stats = np.zeros((len(names), len(STAT_COLUMNS)), dtype=np.float64)
+    for row, name in enumerate(names):
+        for col, stat in enumerate(STAT_COLUMNS):
+            stats[row, col] = players[name]['stats'].get(stat, 0)
+    
+    # Schreiben über eine temporäre Datei, damit parallel startende
+    # Prozesse nie einen halb geschriebenen Store sehen
+    tmp_file = store_file + '.tmp.npz'
+    np.savez(
+        tmp_file,
+        names=np.array(names),
+        ids=np.array([players[name]['id'] for name in names], dtype=np.int64),
+        teams=np.array([players[name]['team'] for name in names]),
+        types=np.array([players[name]['type'] for name in names]),
+        stat_columns=np.array(STAT_COLUMNS),
+        stats=stats
+    )
+    os.replace(tmp_file, store_file)
+    
+    print(f"✓ Player-Store gebaut: {store_file} ({len(names)} Spieler)")
+    return store_file
+
+
+def load_store(store_file):
+    """
+    Lädt den binären Store
+    
+    Returns:
+        Dict mit names, ids, teams, types (Listen/Arrays) und stats-Matrix,
+        oder None wenn die Stat-Spalten nicht mehr zum Code passen
+    """
+    from nba_synergy_system import STAT_COLUMNS
+    
+    with np.load(store_file, allow_pickle=False) as data:
+        if data['stat_columns'].tolist() != STAT_COLUMNS:
+            return None
+        
+        return {
+            'names': data['names'].tolist(),
+            'ids': data['ids'],
+            'teams': data['teams'].tolist(),
+            'types': data['types'].tolist(),
+            'stats': data['stats']
+        }
+
+
+def to_player_dict(store):
+    """Baut das gewohnte players-Dict (wie aus der JSON) aus dem Store"""
+    from nba_synergy_system import STAT_COLUMNS
+    
+    stats_rows = store['stats'].tolist()
+    ids = store['ids'].tolist()
+    
+    return {
+        name: {
+            'id': ids[i],
+            'team': store['teams'][i],
+            'stats': dict(zip(STAT_COLUMNS, stats_rows[i])),
+            'type': store['types'][i]
+        }
+        for i, name in enumerate(store['names'])
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        json_file = sys.argv[2] if len(sys.argv) > 2 else 'nba_players_2024-25.json'
+        build_store(json_file)
+    else:
+        print("Usage: python nba_player_store.py build [players.json]")
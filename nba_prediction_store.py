@@ -0,0 +1,742 @@
+#!/usr/bin/env python3
+"""
+NBA Prediction Store
+Austauschbare Storage-Backends für die Vorhersage-Historie
+
+Backend-Wahl über PREDICTIONS_BACKEND:
+  jsonl  (Default) - Append-only Log (JSON Lines) mit periodischer Kompaktierung
+  sqlite           - SQLite im WAL-Modus mit Indizes für Matching und Stats
+
+Dateien im Datenverzeichnis:
+  predictions_snapshot.json  - kompaktierter Stand {"last_seq": S, "predictions": [...]}
+  predictions_log.jsonl      - Operationen seit dem Snapshot, eine Zeile pro Operation
+  predictions.db             - SQLite-Backend
+  predictions_history.json   - altes Format, wird beim ersten Öffnen migriert
+
+Jede Log-Zeile trägt eine fortlaufende Seq. Beim Einlesen werden Zeilen mit
+seq <= last_seq des Snapshots übersprungen, ein Absturz zwischen Snapshot-
+und Log-Rotation kann also nichts doppelt anwenden.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: kein flock, nur ein Prozess
+    fcntl = None
+
+SNAPSHOT_FILE = 'predictions_snapshot.json'
+LOG_FILE = 'predictions_log.jsonl'
+LEGACY_FILE = 'predictions_history.json'
+SQLITE_FILE = 'predictions.db'
+
+# Kompaktieren, sobald das Log größer als der Snapshot ist (mind. 1 MB) -
+# der Aufwand pro Append bleibt so amortisiert O(1)
+COMPACT_MIN_BYTES = 1 << 20
+
+
+def atomic_write_json(path, data, indent=2, fsync=False):
+    """Schreibt JSON über eine temporäre Datei + os.replace (nie halb geschrieben)"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        if indent is None:
+            json.dump(data, f, separators=(',', ':'))
+        else:
+            json.dump(data, f, indent=indent)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def default_data_dir():
+    """Persistentes Volume (PREDICTIONS_DATA_DIR, Default /data), sonst das aktuelle Verzeichnis"""
+    data_dir = os.environ.get('PREDICTIONS_DATA_DIR', '/data')
+
+    if not os.path.exists(data_dir):
+        try:
+            os.makedirs(data_dir, exist_ok=True)
+        except OSError:
+            data_dir = '.'  # Fallback
+
+    return data_dir
+
+
+def confidence_bucket(confidence):
+    """
+    Konfidenz-Bucket ('50-60' ... '90-100'). Akzeptiert Anteil (0.62, API)
+    und Prozent (62.0, CLI); der Gewinner hat immer >= 50%.
+    """
+    if confidence is None:
+        return 'unknown'
+    percent = confidence * 100 if confidence <= 1 else confidence
+    lower = min(90, max(50, int(percent // 10) * 10))
+    return f"{lower}-{lower + 10}"
+
+
+def build_stats(aggregate):
+    """
+    Baut das Stats-Dict (Format von prediction_stats.json) aus dem Aggregat
+    eines Stores - Aufwand hängt nur von der Anzahl Tage/Buckets ab
+    """
+    by_day = aggregate['by_day']
+    by_confidence = aggregate['by_confidence']
+
+    def cell(data):
+        return {
+            'accuracy': round(data['correct'] / data['total'] * 100, 1),
+            'correct': data['correct'],
+            'total': data['total']
+        }
+
+    total = sum(data['total'] for data in by_confidence.values())
+    correct = sum(data['correct'] for data in by_confidence.values())
+
+    last_7_days = [
+        {'date': date, **cell(data)}
+        for date, data in sorted(by_day.items(), reverse=True)[:7]
+    ]
+
+    return {
+        'total_predictions': total,
+        'correct_predictions': correct,
+        'accuracy': round(correct / total * 100, 2) if total > 0 else 0.0,
+        'by_confidence': {
+            bucket: cell(data) for bucket, data in sorted(by_confidence.items())
+        },
+        'last_7_days': last_7_days,
+        'best_day': max(last_7_days, key=lambda x: x['accuracy']) if last_7_days else None,
+        'worst_day': min(last_7_days, key=lambda x: x['accuracy']) if last_7_days else None
+    }
+
+
+def _encode(op):
+    return json.dumps(op, separators=(',', ':')).encode() + b'\n'
+
+
+class PredictionStore(ABC):
+    """
+    Schnittstelle der Storage-Backends.
+
+    Vorhersagen werden über einen Backend-spezifischen Key adressiert, den
+    find_unchecked liefert und update wieder entgegennimmt.
+    """
+
+    path = None
+
+    @abstractmethod
+    def locked(self):
+        """Reentranter Kontext: alles darin ist atomar gegenüber anderen Writern"""
+
+    @abstractmethod
+    def append(self, predictions):
+        """Hängt neue Vorhersagen an"""
+
+    @abstractmethod
+    def update(self, changes):
+        """Aktualisiert Felder, changes: Liste von (key, fields)"""
+
+    @abstractmethod
+    def predictions(self):
+        """Komplette Historie in Einfüge-Reihenfolge"""
+
+    @abstractmethod
+    def find_unchecked(self, date, team1, team2):
+        """Ungecheckte Vorhersagen für ein Spiel als Liste von (key, prediction)"""
+
+    @abstractmethod
+    def unchecked(self):
+        """Alle ungecheckten Vorhersagen als Liste von (key, prediction)"""
+
+    @abstractmethod
+    def accuracy_stats(self):
+        """
+        Inkrementell gepflegtes Aggregat der gecheckten Vorhersagen:
+        {'by_day': {date: {'total', 'correct'}}, 'by_confidence': {bucket: {...}}}
+        """
+
+    def compact(self):
+        """Räumt den Speicher auf (optional)"""
+
+    @abstractmethod
+    def __len__(self):
+        """Anzahl gespeicherter Vorhersagen"""
+
+
+class PredictionLog(PredictionStore):
+    """
+    Vorhersagen als Append-only Log mit In-Memory-Index.
+
+    Schreiben hängt nur Zeilen an (fsync), Lesen baut den Index lazy aus
+    Snapshot + Log auf und liest danach nur noch neu angehängte Bytes.
+    Key einer Vorhersage ist ihre Position im Log.
+    """
+
+    def __init__(self, data_dir, compact_min_bytes=COMPACT_MIN_BYTES, fsync=True):
+        self.data_dir = data_dir
+        self.snapshot_path = os.path.join(data_dir, SNAPSHOT_FILE)
+        self.log_path = os.path.join(data_dir, LOG_FILE)
+        self.path = self.log_path
+        self.legacy_path = os.path.join(data_dir, LEGACY_FILE)
+        self.compact_min_bytes = compact_min_bytes
+        self.fsync = fsync
+
+        self._mutex = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+
+        # In-Memory-Index (wird lazy aufgebaut)
+        self._predictions = []
+        self._unchecked = {}
+        self._by_day = {}
+        self._by_confidence = {}
+        self._last_seq = 0
+        self._snapshot_sig = None
+        self._log_ino = None
+        self._log_offset = 0
+
+        with self.locked():
+            if not os.path.exists(self.snapshot_path):
+                self._create()
+
+    @contextmanager
+    def locked(self):
+        """
+        Reentranter Schreib-Lock: RLock für Threads, flock für Prozesse.
+        Die Lock-Datei wird pro Lock geöffnet, damit geforkte Worker keine
+        gemeinsame File Description (und damit denselben flock) erben.
+        """
+        with self._mutex:
+            if self._lock_depth == 0:
+                self._lock_file = open(self.log_path + '.lock', 'a')
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def _create(self):
+        """Legt Snapshot + Log an und migriert ggf. predictions_history.json"""
+        predictions = []
+        if os.path.exists(self.legacy_path):
+            with open(self.legacy_path, 'r') as f:
+                predictions = json.load(f)
+
+        atomic_write_json(self.snapshot_path, {'last_seq': 0, 'predictions': predictions},
+                          indent=None, fsync=True)
+        self._reset_log(0)
+
+        if os.path.exists(self.legacy_path):
+            os.replace(self.legacy_path, self.legacy_path + '.migrated')
+            print(f"✅ {len(predictions)} Vorhersagen aus {LEGACY_FILE} migriert")
+
+    def _reset_log(self, seq):
+        """Ersetzt das Log atomar durch eine Marker-Zeile mit der aktuellen Seq"""
+        tmp_path = f"{self.log_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_encode({'seq': seq, 'op': 'compact'}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.log_path)
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _tail_seq(f):
+        """
+        Seq der letzten vollständigen Zeile. Zweiter Rückgabewert: True, wenn
+        die Datei mit einer abgebrochenen Zeile endet (Absturz beim Schreiben)
+        """
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0, False
+
+        chunk = 4096
+        while True:
+            start = max(0, size - chunk)
+            f.seek(start)
+            data = f.read(size - start)
+            torn = not data.endswith(b'\n')
+
+            lines = data.split(b'\n')[:-1]
+            if start > 0:
+                lines = lines[1:]  # erste Zeile ist evtl. abgeschnitten
+            for line in reversed(lines):
+                try:
+                    return json.loads(line)['seq'], torn
+                except (ValueError, KeyError):
+                    continue
+
+            if start == 0:
+                return 0, torn
+            chunk *= 4
+
+    def _append_ops(self, ops):
+        """Hängt Operationen ans Log an (Aufrufer hält den Lock)"""
+        with open(self.log_path, 'a+b') as f:
+            seq, torn = self._tail_seq(f)
+
+            # Abgebrochene letzte Zeile abschließen, sie wird beim Lesen übersprungen
+            chunks = [b'\n'] if torn else []
+            for op in ops:
+                seq += 1
+                chunks.append(_encode({'seq': seq, **op}))
+
+            f.write(b''.join(chunks))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def append(self, predictions):
+        """Hängt neue Vorhersagen an (ein Write + ein fsync für alle)"""
+        if not predictions:
+            return
+
+        with self.locked():
+            self._append_ops([{'op': 'add', 'data': p} for p in predictions])
+            self._maybe_compact()
+
+    def update(self, changes):
+        """
+        Aktualisiert Felder bestehender Vorhersagen
+
+        Args:
+            changes: Liste von (key, fields) - key ist die Position in predictions()
+        """
+        if not changes:
+            return
+
+        with self.locked():
+            self._append_ops([
+                {'op': 'update', 'index': index, 'data': fields}
+                for index, fields in changes
+            ])
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        log_size = os.path.getsize(self.log_path)
+        if log_size >= max(self.compact_min_bytes, os.path.getsize(self.snapshot_path)):
+            self.compact()
+
+    def compact(self):
+        """Schreibt Snapshot + Log in einen neuen Snapshot und leert das Log"""
+        with self.locked():
+            self._refresh()
+            atomic_write_json(self.snapshot_path, {
+                'last_seq': self._last_seq,
+                'stats': {'by_day': self._by_day, 'by_confidence': self._by_confidence},
+                'predictions': self._predictions
+            }, indent=None, fsync=True)
+            self._reset_log(self._last_seq)
+
+            # Index ist bereits aktuell - nur die Dateisignaturen nachziehen
+            self._snapshot_sig = self._stat_sig(self.snapshot_path)
+            log_stat = os.stat(self.log_path)
+            self._log_ino = log_stat.st_ino
+            self._log_offset = log_stat.st_size
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _stat_sig(path):
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        """Bringt den Index auf den Stand von Snapshot + Log"""
+        with self._mutex:
+            if self._stat_sig(self.snapshot_path) != self._snapshot_sig:
+                self._rebuild()
+                return
+
+            with open(self.log_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_ino != self._log_ino:
+                    # Ein anderer Prozess hat kompaktiert
+                    self._rebuild()
+                    return
+                f.seek(self._log_offset)
+                data = f.read()
+
+            self._apply(data)
+
+    def _rebuild(self):
+        """Baut den Index komplett neu auf (unter Lock, damit Snapshot und Log zusammenpassen)"""
+        with self.locked():
+            snapshot_sig = self._stat_sig(self.snapshot_path)
+            with open(self.snapshot_path, 'r') as f:
+                snapshot = json.load(f)
+
+            self._predictions = snapshot['predictions']
+            self._last_seq = snapshot['last_seq']
+            self._unchecked = {}
+            for index, prediction in enumerate(self._predictions):
+                self._index(index, prediction)
+
+            # Stats-Aggregat aus dem Snapshot (ältere Snapshots: einmal nachzählen)
+            if 'stats' in snapshot:
+                self._by_day = snapshot['stats']['by_day']
+                self._by_confidence = snapshot['stats']['by_confidence']
+            else:
+                self._by_day = {}
+                self._by_confidence = {}
+                for prediction in self._predictions:
+                    self._count(prediction, 1)
+
+            with open(self.log_path, 'rb') as f:
+                self._log_ino = os.fstat(f.fileno()).st_ino
+                self._log_offset = 0
+                data = f.read()
+
+            self._apply(data)
+            self._snapshot_sig = snapshot_sig
+
+    def _apply(self, data):
+        """Wendet die vollständigen Log-Zeilen aus data auf den Index an"""
+        end = data.rfind(b'\n') + 1  # unvollständige letzte Zeile später lesen
+
+        for line in data[:end].split(b'\n'):
+            if not line:
+                continue
+            try:
+                op = json.loads(line)
+            except ValueError:
+                continue  # abgebrochener Write
+
+            if op['seq'] <= self._last_seq:
+                continue
+            self._last_seq = op['seq']
+
+            if op['op'] == 'add':
+                self._predictions.append(op['data'])
+                self._index(len(self._predictions) - 1, op['data'])
+                self._count(op['data'], 1)
+            elif op['op'] == 'update':
+                index = op['index']
+                prediction = self._predictions[index]
+                was_unchecked = not prediction.get('checked')
+                self._count(prediction, -1)
+                prediction.update(op['data'])
+                self._count(prediction, 1)
+                if was_unchecked and prediction.get('checked'):
+                    self._unindex(index, prediction)
+
+        self._log_offset += end
+
+    @staticmethod
+    def _key(prediction):
+        return prediction['date'], prediction['team1'], prediction['team2']
+
+    def _index(self, index, prediction):
+        if not prediction.get('checked'):
+            self._unchecked.setdefault(self._key(prediction), []).append(index)
+
+    def _count(self, prediction, sign):
+        """Zählt eine gecheckte Vorhersage ins Aggregat (sign=-1 nimmt sie heraus) - O(1)"""
+        if not prediction.get('checked'):
+            return
+
+        correct = 1 if prediction.get('was_correct') else 0
+        for table, key in ((self._by_day, prediction.get('date', '')),
+                           (self._by_confidence, confidence_bucket(prediction.get('confidence')))):
+            data = table.setdefault(key, [0, 0])
+            data[0] += sign
+            data[1] += sign * correct
+            if data[0] == 0:
+                del table[key]
+
+    def _unindex(self, index, prediction):
+        key = self._key(prediction)
+        positions = self._unchecked.get(key, [])
+        if index in positions:
+            positions.remove(index)
+        if not positions:
+            self._unchecked.pop(key, None)
+
+    def predictions(self):
+        """Alle Vorhersagen in Log-Reihenfolge (Dicts gehören dem Index - nicht verändern)"""
+        with self._mutex:
+            self._refresh()
+            return list(self._predictions)
+
+    def find_unchecked(self, date, team1, team2):
+        """Ungecheckte Vorhersagen für ein Spiel als Liste von (index, prediction)"""
+        with self._mutex:
+            self._refresh()
+            return [(i, self._predictions[i])
+                    for i in self._unchecked.get((date, team1, team2), [])]
+
+    def unchecked(self):
+        """Alle ungecheckten Vorhersagen direkt aus dem Index (ohne Scan der Historie)"""
+        with self._mutex:
+            self._refresh()
+            return [(i, self._predictions[i])
+                    for positions in self._unchecked.values() for i in positions]
+
+    def accuracy_stats(self):
+        """
+        Aggregat wird beim Anwenden jeder Log-Zeile mitgezählt - es steckt
+        damit in derselben Zeile wie das Update und ist nie inkonsistent
+        """
+        with self._mutex:
+            self._refresh()
+            return {
+                'by_day': {k: {'total': t, 'correct': c} for k, (t, c) in self._by_day.items()},
+                'by_confidence': {k: {'total': t, 'correct': c}
+                                  for k, (t, c) in self._by_confidence.items()}
+            }
+
+    def __len__(self):
+        with self._mutex:
+            self._refresh()
+            return len(self._predictions)
+
+
+# Prepared Statements: sqlite3 cached kompilierte Statements pro Verbindung,
+# solange derselbe SQL-String wiederverwendet wird
+_SQL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id          INTEGER PRIMARY KEY,
+    date        TEXT NOT NULL,
+    team1       TEXT NOT NULL,
+    team2       TEXT NOT NULL,
+    checked     INTEGER NOT NULL DEFAULT 0,
+    was_correct INTEGER,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_match ON predictions (date, team1, team2);
+CREATE INDEX IF NOT EXISTS idx_predictions_checked ON predictions (checked, date, was_correct);
+CREATE TABLE IF NOT EXISTS prediction_stats (
+    date    TEXT NOT NULL,
+    bucket  TEXT NOT NULL,
+    total   INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (date, bucket)
+);
+"""
+_SQL_INSERT = ("INSERT INTO predictions (date, team1, team2, checked, was_correct, data) "
+               "VALUES (?, ?, ?, ?, ?, ?)")
+_SQL_SELECT_DATA = "SELECT data FROM predictions WHERE id = ?"
+_SQL_UPDATE = "UPDATE predictions SET checked = ?, was_correct = ?, data = ? WHERE id = ?"
+_SQL_MATCH = ("SELECT id, data FROM predictions "
+              "WHERE date = ? AND team1 = ? AND team2 = ? AND checked = 0 ORDER BY id")
+_SQL_UNCHECKED = "SELECT id, data FROM predictions WHERE checked = 0 ORDER BY id"
+_SQL_ALL = "SELECT data FROM predictions ORDER BY id"
+_SQL_COUNT = "SELECT COUNT(*) FROM predictions"
+_SQL_HAS_TABLE = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+_SQL_CHECKED = "SELECT data FROM predictions WHERE checked = 1"
+_SQL_COUNT_STATS = ("INSERT INTO prediction_stats (date, bucket, total, correct) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (date, bucket) DO UPDATE SET "
+                    "total = total + excluded.total, correct = correct + excluded.correct")
+_SQL_STATS = "SELECT date, bucket, total, correct FROM prediction_stats WHERE total > 0"
+
+
+class SqlitePredictionStore(PredictionStore):
+    """
+    Vorhersagen in SQLite (WAL: Leser blockieren den Writer nicht).
+
+    Die Index-Spalten (date, teams, checked, was_correct) sind aus dem
+    JSON-Datensatz denormalisiert. Key einer Vorhersage ist ihre Row-ID.
+    Das Stats-Aggregat (prediction_stats, Zähler pro Tag und Konfidenz-Bucket)
+    wird in derselben Transaktion wie die Vorhersagen aktualisiert.
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, SQLITE_FILE)
+        self._local = threading.local()
+
+        conn = self._conn()
+
+        # Prüfen, Schema anlegen und Befüllen in einer IMMEDIATE-Transaktion: starten
+        # mehrere Worker gleichzeitig, initialisiert nur der erste, die anderen sehen
+        # danach fertige Tabellen (executescript würde vorher COMMIT ausführen)
+        with self.locked():
+            is_new = conn.execute(_SQL_HAS_TABLE, ('predictions',)).fetchone() is None
+            has_stats = conn.execute(_SQL_HAS_TABLE, ('prediction_stats',)).fetchone() is not None
+            for statement in _SQL_SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+
+            if is_new:
+                self._import_existing()
+            elif not has_stats:
+                # Datenbank von vor dem Stats-Aggregat: einmal nachzählen
+                self._count_all(json.loads(data) for (data,) in conn.execute(_SQL_CHECKED))
+
+    def _conn(self):
+        """Eine Verbindung pro Thread und Prozess (nach fork neu öffnen)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def locked(self):
+        """Reentrante Schreib-Transaktion (BEGIN IMMEDIATE ... COMMIT)"""
+        conn = self._conn()
+        if self._local.depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.depth += 1
+        try:
+            yield
+        except BaseException:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute("ROLLBACK")
+            raise
+        else:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                conn.execute("COMMIT")
+
+    def _import_existing(self):
+        """Übernimmt die Historie aus dem JSON-Log bzw. predictions_history.json"""
+        if os.path.exists(os.path.join(self.data_dir, SNAPSHOT_FILE)):
+            predictions = PredictionLog(self.data_dir).predictions()
+        elif os.path.exists(os.path.join(self.data_dir, LEGACY_FILE)):
+            with open(os.path.join(self.data_dir, LEGACY_FILE), 'r') as f:
+                predictions = json.load(f)
+        else:
+            return
+
+        self.append(predictions)
+        print(f"✅ {len(predictions)} Vorhersagen nach SQLite importiert")
+
+    def _count_all(self, predictions, sign=1):
+        """Zählt gecheckte Vorhersagen ins Aggregat (Aufrufer hält die Transaktion)"""
+        cells = {}
+        for prediction in predictions:
+            if not prediction.get('checked'):
+                continue
+            key = (prediction.get('date', ''), confidence_bucket(prediction.get('confidence')))
+            data = cells.setdefault(key, [0, 0])
+            data[0] += sign
+            data[1] += sign * (1 if prediction.get('was_correct') else 0)
+
+        if cells:
+            self._conn().executemany(_SQL_COUNT_STATS, [
+                (date, bucket, total, correct) for (date, bucket), (total, correct) in cells.items()
+            ])
+
+    @staticmethod
+    def _row(prediction):
+        was_correct = prediction.get('was_correct')
+        return (
+            prediction['date'], prediction['team1'], prediction['team2'],
+            1 if prediction.get('checked') else 0,
+            None if was_correct is None else int(bool(was_correct)),
+            json.dumps(prediction, separators=(',', ':'))
+        )
+
+    def append(self, predictions):
+        """Hängt neue Vorhersagen an (eine Transaktion für alle)"""
+        if not predictions:
+            return
+
+        with self.locked():
+            self._conn().executemany(_SQL_INSERT, [self._row(p) for p in predictions])
+            self._count_all(predictions)
+
+    def update(self, changes):
+        """
+        Aktualisiert Felder bestehender Vorhersagen
+
+        Args:
+            changes: Liste von (key, fields) - key ist die Row-ID aus find_unchecked
+        """
+        if not changes:
+            return
+
+        with self.locked():
+            conn = self._conn()
+            rows = []
+            before, after = [], []
+            for key, fields in changes:
+                prediction = json.loads(conn.execute(_SQL_SELECT_DATA, (key,)).fetchone()[0])
+                before.append(dict(prediction))
+                prediction.update(fields)
+                after.append(prediction)
+                _, _, _, checked, was_correct, data = self._row(prediction)
+                rows.append((checked, was_correct, data, key))
+            conn.executemany(_SQL_UPDATE, rows)
+
+            # Stats-Delta: alten Stand herausnehmen, neuen einzählen
+            self._count_all(before, -1)
+            self._count_all(after)
+
+    def predictions(self):
+        return [json.loads(data) for (data,) in self._conn().execute(_SQL_ALL)]
+
+    def find_unchecked(self, date, team1, team2):
+        return [(key, json.loads(data))
+                for key, data in self._conn().execute(_SQL_MATCH, (date, team1, team2))]
+
+    def unchecked(self):
+        return [(key, json.loads(data)) for key, data in self._conn().execute(_SQL_UNCHECKED)]
+
+    def accuracy_stats(self):
+        by_day, by_confidence = {}, {}
+        for date, bucket, total, correct in self._conn().execute(_SQL_STATS):
+            for table, key in ((by_day, date), (by_confidence, bucket)):
+                data = table.setdefault(key, {'total': 0, 'correct': 0})
+                data['total'] += total
+                data['correct'] += correct
+        return {'by_day': by_day, 'by_confidence': by_confidence}
+
+    def compact(self):
+        """Schreibt das WAL in die Datenbank zurück und kürzt es"""
+        self._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def __len__(self):
+        return self._conn().execute(_SQL_COUNT).fetchone()[0]
+
+
+STORE_CLASSES = {
+    'jsonl': PredictionLog,
+    'sqlite': SqlitePredictionStore
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_prediction_store(data_dir=None, backend=None):
+    """
+    Ein Store pro Verzeichnis, Backend und Prozess, damit Index bzw.
+    Verbindungen geteilt werden. Backend: Argument, sonst PREDICTIONS_BACKEND
+    """
+    if data_dir is None:
+        data_dir = default_data_dir()
+    if backend is None:
+        backend = os.environ.get('PREDICTIONS_BACKEND', 'jsonl').lower()
+    if backend not in STORE_CLASSES:
+        raise ValueError(f"Unbekanntes PREDICTIONS_BACKEND: {backend} "
+                         f"(erlaubt: {', '.join(STORE_CLASSES)})")
+
+    key = (os.path.abspath(data_dir), backend)
+
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = STORE_CLASSES[backend](key[0])
+        return _stores[key]
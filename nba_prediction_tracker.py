@@ -4,65 +4,47 @@ NBA Prediction Tracker
 Speichert Vorhersagen und vergleicht mit echten Ergebnissen
 """
 
-import json
 import os
 from datetime import datetime, timedelta
-from nba_api.stats.endpoints import ScoreboardV2
-import time
+
+from nba_prediction_store import atomic_write_json, build_stats, default_data_dir, get_prediction_store
+from nba_result_matcher import ResultMatcher
+from nba_results_fetcher import ResultsFetcher, unchecked_dates
+
 
 class PredictionTracker:
     """Trackt Vorhersagen und vergleicht mit Ergebnissen"""
     
-    def __init__(self):
-        # Use persistent volume
-        data_dir = '/data'
-        
-        # Create directory if it doesn't exist
-        if not os.path.exists(data_dir):
-            try:
-                os.makedirs(data_dir, exist_ok=True)
-            except:
-                data_dir = '.'  # Fallback
-        
-        self.predictions_file = os.path.join(data_dir, 'predictions_history.json')
+    def __init__(self, data_dir=None, backend=None):
+        # Use persistent volume (PREDICTIONS_DATA_DIR, Fallback: aktuelles Verzeichnis)
+        if data_dir is None:
+            data_dir = default_data_dir()
+        
+        # Storage-Backend: Argument oder PREDICTIONS_BACKEND (jsonl | sqlite)
+        self.store = get_prediction_store(data_dir, backend)
+        self.predictions_file = self.store.path
         self.stats_file = os.path.join(data_dir, 'prediction_stats.json')
         
-        # Initialize empty files if they don't exist
-        if not os.path.exists(self.predictions_file):
-            with open(self.predictions_file, 'w') as f:
-                json.dump([], f)
+        # Ergebnisse: parallel, rate-limitiert, abgeschlossene Tage auf Platte
+        # (Cache des gemeinsamen Clients: NBA_API_CACHE_DIR, auch für Offline-Replay)
+        self.fetcher = ResultsFetcher()
         
+        # Stats-Export für Datei-Konsumenten anlegen
         if not os.path.exists(self.stats_file):
-            with open(self.stats_file, 'w') as f:
-                json.dump({
-                    'total_predictions': 0,
-                    'correct_predictions': 0,
-                    'accuracy': 0.0
-                }, f)
+            atomic_write_json(self.stats_file, self.stats)
     
     @property
     def stats(self):
-        """Read and return stats from file"""
+        """Aktuelle Statistiken aus dem Stats-Aggregat des Stores"""
         try:
-            if os.path.exists(self.stats_file):
-                with open(self.stats_file, 'r') as f:
-                    return json.load(f)
-            else:
-                # Return default stats
-                return {
-                    'total_predictions': 0,
-                    'correct_predictions': 0,
-                    'accuracy': 0.0,
-                    'last_7_days': [],
-                    'best_day': None,
-                    'worst_day': None
-                }
+            return build_stats(self.store.accuracy_stats())
         except Exception as e:
             print(f"Error reading stats: {e}")
             return {
                 'total_predictions': 0,
                 'correct_predictions': 0,
                 'accuracy': 0.0,
+                'by_confidence': {},
                 'last_7_days': [],
                 'best_day': None,
                 'worst_day': None
@@ -71,11 +53,7 @@ class PredictionTracker:
     def get_all_predictions(self):
         """Gibt alle Vorhersagen zurück"""
         try:
-            if os.path.exists(self.predictions_file):
-                with open(self.predictions_file, 'r') as f:
-                    return json.load(f)
-            else:
-                return []
+            return self.store.predictions()
         except Exception as e:
             print(f"Error reading predictions: {e}")
             return []
@@ -83,43 +61,19 @@ class PredictionTracker:
     def load_data(self):
         """Lädt gespeicherte Daten"""
         # Predictions History
-        if os.path.exists(self.predictions_file):
-            with open(self.predictions_file, 'r') as f:
-                self.predictions = json.load(f)
-        else:
-            self.predictions = []
-        
-        # Stats
-        if os.path.exists(self.stats_file):
-            with open(self.stats_file, 'r') as f:
-                self._stats = json.load(f)
-        else:
-            self._stats = {
-                'total_predictions': 0,
-                'correct_predictions': 0,
-                'accuracy': 0.0,
-                'by_confidence': {},
-                'last_7_days': [],
-                'best_day': None,
-                'worst_day': None
-            }
-    
-    def save_data(self):
-        """Speichert Daten"""
-        with open(self.predictions_file, 'w') as f:
-            json.dump(self.predictions, f, indent=2)
+        self.predictions = self.store.predictions()
         
-        with open(self.stats_file, 'w') as f:
-            json.dump(self._stats, f, indent=2)
+        # Stats (inkrementell im Store gepflegt)
+        self._stats = self.stats
     
-    def log_prediction(self, team1, team2, predicted_winner, 
-                      predicted_score, confidence, game_date=None, 
-                      team1_name=None, team2_name=None):
-        """Speichert eine neue Vorhersage"""
+    def _make_prediction(self, team1, team2, predicted_winner,
+                         predicted_score, confidence, game_date=None,
+                         team1_name=None, team2_name=None):
+        """Baut den Datensatz für eine neue Vorhersage"""
         if game_date is None:
             game_date = datetime.now().strftime('%Y-%m-%d')
         
-        prediction = {
+        return {
             'id': f"{team1}_vs_{team2}_{game_date}",
             'date': game_date,
             'team1': team1,
@@ -134,160 +88,135 @@ class PredictionTracker:
             'was_correct': None,
             'checked': False
         }
+    
+    def log_prediction(self, team1, team2, predicted_winner, 
+                      predicted_score, confidence, game_date=None, 
+                      team1_name=None, team2_name=None):
+        """Speichert eine neue Vorhersage"""
+        prediction = self._make_prediction(
+            team1, team2, predicted_winner, predicted_score, confidence,
+            game_date, team1_name, team2_name
+        )
         
-        # Load existing predictions
-        predictions = self.get_all_predictions()
-        predictions.append(prediction)
-        
-        # Save
-        with open(self.predictions_file, 'w') as f:
-            json.dump(predictions, f, indent=2)
+        # Nur anhängen - kein Lesen/Neuschreiben der ganzen Historie
+        self.store.append([prediction])
         
         print(f"✅ Vorhersage gespeichert: {team1} vs {team2}")
         return prediction
     
+    def log_predictions(self, entries):
+        """
+        Speichert mehrere Vorhersagen mit einem einzigen Schreibvorgang
+        
+        Args:
+            entries: Liste von Dicts mit den Argumenten von log_prediction
+        """
+        new_predictions = [self._make_prediction(**entry) for entry in entries]
+        
+        if not new_predictions:
+            return []
+        
+        self.store.append(new_predictions)
+        
+        print(f"✅ {len(new_predictions)} Vorhersagen gespeichert")
+        return new_predictions
+    
     def get_yesterdays_results(self):
         """Holt gestrige Spiel-Ergebnisse von NBA API"""
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
-        try:
-            print(f"📊 Lade Ergebnisse vom {yesterday}...")
-            scoreboard = ScoreboardV2(game_date=yesterday)
-            time.sleep(1)  # Rate limiting
-            
-            games = scoreboard.game_header.get_data_frame()
-            line_score = scoreboard.line_score.get_data_frame()
-            
-            results = []
-            for _, game in games.iterrows():
-                game_id = game['GAME_ID']
-                
-                # Teams und Scores
-                game_scores = line_score[line_score['GAME_ID'] == game_id]
-                
-                if len(game_scores) == 2:
-                    team1_score = game_scores.iloc[0]['PTS']
-                    team2_score = game_scores.iloc[1]['PTS']
-                    team1_name = game_scores.iloc[0]['TEAM_ABBREVIATION']
-                    team2_name = game_scores.iloc[1]['TEAM_ABBREVIATION']
-                    
-                    winner = team1_name if team1_score > team2_score else team2_name
-                    
-                    results.append({
-                        'date': yesterday,
-                        'team1': team1_name,
-                        'team2': team2_name,
-                        'score': f"{team1_score}-{team2_score}",
-                        'winner': winner
-                    })
-            
-            print(f"✅ {len(results)} Spiele gefunden")
-            return results
-            
-        except Exception as e:
-            print(f"❌ Fehler beim Laden der Ergebnisse: {e}")
+        print(f"📊 Lade Ergebnisse vom {yesterday}...")
+        results = self.fetcher.fetch_day(yesterday)
+        print(f"✅ {len(results)} Spiele gefunden")
+        return results
+    
+    def get_backfill_results(self):
+        """
+        Holt die Ergebnisse aller Tage, für die noch ungecheckte Vorhersagen
+        existieren - verpasste Cron-Läufe werden so nachgeholt
+        """
+        dates = unchecked_dates(self.store.unchecked())
+        
+        if not dates:
             return []
+        
+        print(f"📊 Backfill: Lade Ergebnisse für {len(dates)} Tage ({dates[0]} bis {dates[-1]})...")
+        results_by_date = self.fetcher.fetch_results(dates)
+        results = [result for date in dates for result in results_by_date[date]]
+        print(f"✅ {len(results)} Spiele gefunden")
+        return results
     
-    def check_predictions(self):
-        """Vergleicht Vorhersagen mit echten Ergebnissen"""
-        results = self.get_yesterdays_results()
+    def check_predictions(self, backfill=False):
+        """
+        Vergleicht Vorhersagen mit echten Ergebnissen
+        
+        Args:
+            backfill: Alle offenen Tage statt nur gestern checken
+        """
+        results = self.get_backfill_results() if backfill else self.get_yesterdays_results()
         
         if not results:
             print("ℹ️ Keine Ergebnisse zum Checken")
             return
         
-        self.load_data()
-        checked_count = 0
-        correct_count = 0
-        
-        for result in results:
-            # Finde passende Vorhersage
-            for prediction in self.predictions:
-                if (not prediction['checked'] and 
-                    prediction['date'] == result['date'] and
-                    prediction['team1'] == result['team1'] and
-                    prediction['team2'] == result['team2']):
-                    
-                    # Update mit echtem Ergebnis
-                    prediction['actual_result'] = {
-                        'winner': result['winner'],
-                        'score': result['score']
-                    }
-                    
-                    # War die Vorhersage richtig?
-                    prediction['was_correct'] = (
-                        prediction['predicted_winner'] == result['winner']
-                    )
-                    prediction['checked'] = True
-                    
-                    checked_count += 1
-                    if prediction['was_correct']:
-                        correct_count += 1
-                    
-                    print(f"{'✅' if prediction['was_correct'] else '❌'} "
-                          f"{prediction['team1']} vs {prediction['team2']}: "
-                          f"Predicted {prediction['predicted_winner']}, "
-                          f"Actual {result['winner']}")
+        with self.store.locked():
+            checked_count, correct_count = self._apply_results(results)
         
         if checked_count > 0:
-            self.save_data()
-            self.update_stats()
             print(f"\n📊 Checked: {checked_count} | Correct: {correct_count}")
         else:
             print("ℹ️ Keine Vorhersagen zum Checken gefunden")
     
-    def update_stats(self):
-        """Aktualisiert Statistiken"""
-        checked = [p for p in self.predictions if p['checked']]
-        
-        if not checked:
-            return
-        
-        total = len(checked)
-        correct = sum(1 for p in checked if p['was_correct'])
-        accuracy = (correct / total * 100) if total > 0 else 0
-        
-        self._stats['total_predictions'] = total
-        self._stats['correct_predictions'] = correct
-        self._stats['accuracy'] = round(accuracy, 2)
+    def _apply_results(self, results):
+        """Trägt Ergebnisse ein (Aufrufer hält den Lock)"""
+        updates = []
+        correct_count = 0
         
-        # Last 7 days
-        last_7_days = {}
-        for p in checked:
-            date = p['date']
-            if date not in last_7_days:
-                last_7_days[date] = {'total': 0, 'correct': 0}
+        # Ein Durchlauf: Hash-Index über alle ungecheckten Vorhersagen
+        matcher = ResultMatcher(self.store.unchecked())
+        
+        for key, prediction, result, was_correct in matcher.match(results):
+            # Update mit echtem Ergebnis
+            updates.append((key, {
+                'actual_result': {
+                    'winner': result['winner'],
+                    'score': result['score']
+                },
+                'was_correct': was_correct,
+                'checked': True
+            }))
             
-            last_7_days[date]['total'] += 1
-            if p['was_correct']:
-                last_7_days[date]['correct'] += 1
-        
-        self._stats['last_7_days'] = [
-            {
-                'date': date,
-                'accuracy': round(data['correct'] / data['total'] * 100, 1),
-                'correct': data['correct'],
-                'total': data['total']
-            }
-            for date, data in sorted(last_7_days.items(), reverse=True)[:7]
-        ]
+            if was_correct:
+                correct_count += 1
+            
+            print(f"{'✅' if was_correct else '❌'} "
+                  f"{prediction['team1']} vs {prediction['team2']}: "
+                  f"Predicted {prediction['predicted_winner']}, "
+                  f"Actual {result['winner']}")
         
-        # Best/Worst day
-        if self._stats['last_7_days']:
-            self._stats['best_day'] = max(
-                self._stats['last_7_days'], 
-                key=lambda x: x['accuracy']
-            )
-            self._stats['worst_day'] = min(
-                self._stats['last_7_days'], 
-                key=lambda x: x['accuracy']
-            )
-        
-        self.save_data()
+        if updates:
+            # Vorhersagen + Stats-Aggregat in einem Write bzw. einer Transaktion
+            self.store.update(updates)
+            self._update_stats()
+        
+        return len(updates), correct_count
+    
+    def update_stats(self):
+        """Aktualisiert Statistiken"""
+        with self.store.locked():
+            self._update_stats()
+    
+    def _update_stats(self):
+        """
+        Schreibt den Stats-Export (prediction_stats.json). Das Aggregat selbst
+        wird vom Store pro gecheckter Vorhersage in O(1) mitgezählt.
+        """
+        self._stats = self.stats
+        atomic_write_json(self.stats_file, self._stats)
     
     def show_stats(self):
         """Zeigt Statistiken"""
-        self.load_data()
+        self._stats = self.stats
         
         print("\n" + "="*60)
         print("📊 PREDICTION TRACKER - STATISTIKEN")
@@ -303,6 +232,12 @@ class PredictionTracker:
                 print(f"   {day['date']}: {day['accuracy']}% "
                       f"({day['correct']}/{day['total']})")
         
+        if self._stats['by_confidence']:
+            print(f"\n🎲 Nach Konfidenz:")
+            for bucket, data in self._stats['by_confidence'].items():
+                print(f"   {bucket}%: {data['accuracy']}% "
+                      f"({data['correct']}/{data['total']})")
+        
         if self._stats['best_day']:
             print(f"\n🏆 Bester Tag:")
             print(f"   {self._stats['best_day']['date']}: "
@@ -328,9 +263,16 @@ if __name__ == "__main__":
         if command == "check":
             tracker.check_predictions()
         
+        elif command == "backfill":
+            tracker.check_predictions(backfill=True)
+        
         elif command == "stats":
             tracker.show_stats()
         
+        elif command == "compact":
+            tracker.store.compact()
+            print(f"✅ Store kompaktiert: {len(tracker.store)} Vorhersagen")
+        
         elif command == "log":
             if len(sys.argv) >= 6:
                 team1 = sys.argv[2]
@@ -344,8 +286,8 @@ if __name__ == "__main__":
                 print("Usage: python nba_prediction_tracker.py log <team1> <team2> <winner> <score> <confidence>")
         
         else:
-            print("Commands: check, stats, log")
+            print("Commands: check, backfill, stats, log, compact")
     
     else:
-        print("Commands: check, stats, log")
+        print("Commands: check, backfill, stats, log, compact")
         tracker.show_stats()
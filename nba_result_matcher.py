@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+NBA Result Matcher
+Ordnet Spielergebnisse ungecheckten Vorhersagen zu (geteilt von
+PredictionTracker und LivePredictionChecker)
+
+Statt für jedes Ergebnis alle Vorhersagen zu durchsuchen, wird einmal ein
+Hash-Index über (date, frozenset(teams)) gebaut - Heim/Auswärts-Reihenfolge
+und Name vs. Tricode spielen so keine Rolle.
+"""
+
+from nba_teams import normalize_team
+
+
+def match_key(date, team1, team2):
+    """Index-Key eines Spiels: Datum + ungeordnetes Paar normalisierter Tricodes"""
+    return date, frozenset((normalize_team(team1), normalize_team(team2)))
+
+
+def result_teams(result):
+    """Teams eines Ergebnisses (Tracker: team1/team2, Live Checker: home_team/away_team)"""
+    if 'team1' in result:
+        return result['team1'], result['team2']
+    return result['home_team'], result['away_team']
+
+
+class ResultMatcher:
+    """Hash-Index über ungecheckte Vorhersagen, einmal bauen und wiederverwenden"""
+
+    def __init__(self, unchecked):
+        """
+        Args:
+            unchecked: Iterable von (key, prediction), z.B. PredictionStore.unchecked()
+        """
+        self.index = {}
+        for key, prediction in unchecked:
+            game_key = match_key(prediction.get('date'), prediction.get('team1'), prediction.get('team2'))
+            self.index.setdefault(game_key, []).append((key, prediction))
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.index.values())
+
+    def match(self, results):
+        """
+        Ein Durchlauf über die Ergebnisse
+
+        Returns:
+            Liste von (key, prediction, result, was_correct)
+        """
+        matches = []
+
+        for result in results:
+            team1, team2 = result_teams(result)
+            entries = self.index.pop(match_key(result['date'], team1, team2), ())
+
+            winner = normalize_team(result['winner'])
+            for key, prediction in entries:
+                was_correct = normalize_team(prediction.get('predicted_winner')) == winner
+                matches.append((key, prediction, result, was_correct))
+
+        return matches
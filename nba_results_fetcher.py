@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+NBA Results Fetcher
+Holt Endergebnisse für beliebige Tage (ScoreboardV2) - parallel über den
+gemeinsamen NBAApiClient (Disk-Cache, Token Bucket, Retry)
+
+Scoreboards vor gestern laufen im Cache nie ab: ein zweiter Backfill über
+dieselben Tage macht keine API-Calls. Der Client ist austauschbar, damit sich
+alles offline (Fixtures) oder mit einem Stub testen lässt.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from nba_api_client import get_client
+
+# GAME_STATUS_ID in ScoreboardV2: 1 = geplant, 2 = läuft, 3 = beendet
+STATUS_FINAL = 3
+
+
+def unchecked_dates(unchecked, until=None):
+    """
+    Alle Tage mit ungecheckten Vorhersagen bis einschließlich until (Default: heute)
+
+    Args:
+        unchecked: Iterable von (key, prediction), z.B. PredictionStore.unchecked()
+    """
+    if until is None:
+        until = datetime.now().strftime('%Y-%m-%d')
+    return sorted({p['date'] for _, p in unchecked if p.get('date') and p['date'] <= until})
+
+
+class ResultsFetcher:
+    """Endergebnisse pro Tag im Format der Checker: date, team1, team2, score, winner"""
+
+    def __init__(self, cache_dir=None, max_workers=4, timeout=30, client=None):
+        """
+        Args:
+            cache_dir: Cache-Verzeichnis des NBAApiClient (None = Default des Clients)
+            max_workers: Maximal parallele Requests (das Tempo bestimmt der Token Bucket)
+            client: Ersatz für den NBAApiClient (z.B. Stub mit fetch(endpoint, **params))
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.client = client or get_client(cache_dir)
+
+    @staticmethod
+    def parse_scoreboard(board, date):
+        """
+        Parst ScoreboardV2 (game_header + line_score)
+
+        Returns:
+            Liste von Ergebnissen, nur beendete Spiele
+        """
+        games = board.game_header.get_data_frame()
+        line_score = board.line_score.get_data_frame()
+
+        lines = {}
+        for row in line_score[['GAME_ID', 'TEAM_ID', 'TEAM_ABBREVIATION', 'PTS']].itertuples(index=False):
+            lines.setdefault(row.GAME_ID, []).append(row)
+
+        results = []
+        for game in games.itertuples(index=False):
+            if getattr(game, 'GAME_STATUS_ID', STATUS_FINAL) != STATUS_FINAL:
+                continue
+
+            game_lines = lines.get(game.GAME_ID, [])
+            if len(game_lines) != 2 or any(line.PTS != line.PTS or line.PTS is None for line in game_lines):
+                continue
+
+            # Heimteam als team1, falls die IDs bekannt sind
+            home_id = getattr(game, 'HOME_TEAM_ID', None)
+            if game_lines[1].TEAM_ID == home_id:
+                game_lines.reverse()
+            team1, team2 = game_lines
+            team1_pts, team2_pts = int(team1.PTS), int(team2.PTS)
+
+            results.append({
+                'date': date,
+                'team1': team1.TEAM_ABBREVIATION,
+                'team2': team2.TEAM_ABBREVIATION,
+                'score': f"{team1_pts}-{team2_pts}",
+                'winner': team1.TEAM_ABBREVIATION if team1_pts > team2_pts else team2.TEAM_ABBREVIATION
+            })
+
+        return results
+
+    def fetch_day(self, date):
+        """Ergebnisse eines Tages (über den Client-Cache). Fehler ergeben eine leere Liste"""
+        try:
+            from nba_api.stats.endpoints import ScoreboardV2
+            board = self.client.fetch(ScoreboardV2, game_date=date, timeout=self.timeout)
+            return self.parse_scoreboard(board, date)
+        except Exception as e:
+            print(f"❌ Fehler beim Laden der Ergebnisse vom {date}: {e}")
+            return []
+
+    def fetch_results(self, dates):
+        """
+        Ergebnisse für mehrere Tage über einen begrenzten Thread-Pool
+
+        Returns:
+            Dict date -> Liste von Ergebnissen
+        """
+        dates = list(dict.fromkeys(dates))
+        if not dates:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(dates))) as pool:
+            return dict(zip(dates, pool.map(self.fetch_day, dates)))
@@ -1,23 +1,471 @@
 
-import pandas as pd
 import numpy as np
 import json
+import threading
+from collections import OrderedDict
+
+import nba_player_store as player_store
+
+# Spalten der Spieler-Matrix (Reihenfolge = Spaltenindex)
+STAT_COLUMNS = [
+    'GP', 'MIN', 'PTS', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT',
+    'FTM', 'FTA', 'FT_PCT', 'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK',
+    'TOV', 'PF', 'TRUE_SHOOTING', 'USAGE_RATE', 'AST_RATIO', 'REB_RATE',
+    'SCORING_VOLUME', 'SCORING_EFFICIENCY', 'THREE_POINT_THREAT',
+    'PLAYMAKING_SCORE', 'DEFENSE_SCORE'
+]
+STAT_INDEX = {stat: i for i, stat in enumerate(STAT_COLUMNS)}
+
+# Integer-Codes für Spieler-Typen
+PLAYER_TYPES = ['ROLE_PLAYER', 'PLAYMAKER', 'WING', 'SHOOTER', 'BIG', 'SCORER']
+PLAYER_TYPE_CODES = {ptype: code for code, ptype in enumerate(PLAYER_TYPES)}
+
+SYNERGY_KEYS = ['spacing', 'playmaking', 'rebounding', 'defense',
+                'ball_movement', 'size', 'balance']
+TEAM_STAT_KEYS = ['PTS', 'FG_PCT', 'FG3_PCT', 'REB', 'AST', 'TOV', 'STL', 'BLK']
+
+
+# Vorberechnete Bool-Features pro Spieler (Spalten von SynergyEngine.flags)
+FLAG_COLUMNS = [
+    'is_shooter_threat',    # THREE_POINT_THREAT > 2.0
+    'is_strong_rebounder',  # REB > 6
+    'is_high_usage',        # USAGE_RATE > 0.3
+    'is_rim_protector',     # BIG mit BLK >= 1.5
+    'is_playmaker',         # type == PLAYMAKER
+    'is_scorer',            # type in SCORER, SHOOTER
+    'is_big',               # type == BIG
+    'is_wing',              # type == WING
+    'has_fg_pct',           # FG_PCT > 0
+    'has_fg3_pct'           # FG3_PCT > 0
+]
+FLAG_INDEX = {flag: i for i, flag in enumerate(FLAG_COLUMNS)}
+
+# Vorberechnete Beiträge pro Spieler, die über das Lineup summiert werden
+# (Spalten von SynergyEngine.contrib)
+CONTRIB_COLUMNS = [
+    'PTS', 'REB', 'AST', 'TOV', 'STL', 'BLK', 'DEFENSE_SCORE', 'AST_RATIO',
+    'SCORING_VOLUME',
+    'spacing',              # THREE_POINT_THREAT falls Shooter-Threat, sonst 0
+    'playmaking',           # PLAYMAKING_SCORE falls Playmaker, sonst 0
+    'fg_pct',               # FG_PCT falls > 0, sonst 0
+    'fg3_pct'               # FG3_PCT falls > 0, sonst 0
+]
+CONTRIB_INDEX = {name: i for i, name in enumerate(CONTRIB_COLUMNS)}
+
+
+def _row_sum(values):
+    """
+    Summiert über die 5 Spieler (Achse 1) strikt von links nach rechts,
+    damit das Ergebnis bitgenau dem Python-sum() über die Spieler entspricht
+    """
+    total = values[:, 0].copy()
+    for col in range(1, values.shape[1]):
+        total += values[:, col]
+    return total
+
+
+class SynergyEngine:
+    """
+    Vektorisierte Synergie-Berechnung über eine spaltenweise Spieler-Matrix
+
+    Lineups werden als Index-Array der Form (N, 5) übergeben, alle sieben
+    Synergien und die Team-Stats werden für alle N Lineups auf einmal
+    berechnet. Die Ergebnisse sind identisch zum dict-basierten Pfad in
+    TeamSynergyCalculator.
+
+    Schwellwert-Checks und Typ-Zugehörigkeit werden beim Laden einmal pro
+    Spieler vorberechnet (flags, contrib), die Auswertung eines Lineups
+    besteht dann nur noch aus Lookups und Summen.
+    """
+
+    def __init__(self, players):
+        names = list(players.keys())
+
+        # Fehlende Stats zählen wie im dict-Pfad (.get(stat, 0)) als 0
+        stats = np.zeros((len(names), len(STAT_COLUMNS)), dtype=np.float64)
+        for row, name in enumerate(names):
+            player_stats = players[name]['stats']
+            for stat, col in STAT_INDEX.items():
+                stats[row, col] = player_stats.get(stat, 0)
+
+        self._init_arrays(
+            names,
+            [players[name]['id'] for name in names],
+            [players[name]['type'] for name in names],
+            stats
+        )
+
+    @classmethod
+    def from_arrays(cls, names, ids, types, stats):
+        """
+        Baut die Engine direkt aus Arrays (z.B. aus dem binären Player-Store)
+
+        Args:
+            names: Spielernamen, ids: Spieler-IDs, types: Typ-Strings,
+            stats: Matrix (Spieler x STAT_COLUMNS)
+        """
+        engine = cls.__new__(cls)
+        engine._init_arrays(list(names), ids, types, np.asarray(stats, dtype=np.float64))
+        return engine
+
+    def _init_arrays(self, names, ids, types, stats):
+        """Setzt die spaltenweisen Arrays und berechnet die Features vor"""
+        self.names = names
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.id_index = {player_id: i for i, player_id in enumerate(self.ids.tolist())}
+        self.stats = stats
+        self.types = np.array(
+            [PLAYER_TYPE_CODES.get(ptype, -1) for ptype in types],
+            dtype=np.int8
+        )
+
+        self._precompute_features()
+
+    def _precompute_features(self):
+        """Berechnet Bool-Features und Beiträge einmal pro Spieler"""
+        stat = lambda name: self.stats[:, STAT_INDEX[name]]
+
+        is_big = self.types == PLAYER_TYPE_CODES['BIG']
+        is_playmaker = self.types == PLAYER_TYPE_CODES['PLAYMAKER']
+        is_shooter_threat = stat('THREE_POINT_THREAT') > 2.0
+
+        flags = {
+            'is_shooter_threat': is_shooter_threat,
+            'is_strong_rebounder': stat('REB') > 6,
+            'is_high_usage': stat('USAGE_RATE') > 0.3,
+            'is_rim_protector': is_big & (stat('BLK') >= 1.5),
+            'is_playmaker': is_playmaker,
+            'is_scorer': ((self.types == PLAYER_TYPE_CODES['SCORER']) |
+                          (self.types == PLAYER_TYPE_CODES['SHOOTER'])),
+            'is_big': is_big,
+            'is_wing': self.types == PLAYER_TYPE_CODES['WING'],
+            'has_fg_pct': stat('FG_PCT') > 0,
+            'has_fg3_pct': stat('FG3_PCT') > 0
+        }
+        self.flags = np.column_stack([flags[name] for name in FLAG_COLUMNS]).astype(np.int8)
+        for name in FLAG_COLUMNS:
+            setattr(self, name, self.flags[:, FLAG_INDEX[name]])
+
+        contrib = {name: stat(name) for name in CONTRIB_COLUMNS if name in STAT_INDEX}
+        contrib['spacing'] = np.where(is_shooter_threat, stat('THREE_POINT_THREAT'), 0.0)
+        contrib['playmaking'] = np.where(is_playmaker, stat('PLAYMAKING_SCORE'), 0.0)
+        contrib['fg_pct'] = np.where(flags['has_fg_pct'], stat('FG_PCT'), 0.0)
+        contrib['fg3_pct'] = np.where(flags['has_fg3_pct'], stat('FG3_PCT'), 0.0)
+        self.contrib = np.column_stack([contrib[name] for name in CONTRIB_COLUMNS])
+
+    def lineup_indices(self, lineups):
+        """Wandelt Listen von Spielernamen in ein (N, 5) Index-Array um"""
+        return np.array(
+            [[self.index[name] for name in lineup] for lineup in lineups],
+            dtype=np.intp
+        ).reshape(-1, 5)
+
+    def column(self, indices, stat):
+        """Holt eine Stat-Spalte für alle Spieler der Lineups, Form (N, 5)"""
+        return self.stats[indices, STAT_INDEX[stat]]
+
+    def evaluate(self, indices):
+        """
+        Berechnet Team-Stats und Synergien für alle Lineups in einem Durchlauf
+
+        Returns:
+            (team_stats, synergies) - jeweils dict von Arrays der Länge N
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1, 5)
+        contrib = self.contrib[indices]                  # (N, 5, C)
+        sums = _row_sum(contrib)                         # (N, C)
+        counts = self.flags[indices].sum(axis=1)         # (N, F)
+        volumes = contrib[:, :, CONTRIB_INDEX['SCORING_VOLUME']]
+
+        # Varianz des Scoring-Volumens wie np.std (exakt über die 5 Werte)
+        deviation = volumes - (sums[:, CONTRIB_INDEX['SCORING_VOLUME']] / 5)[:, None]
+        variance = _row_sum(deviation * deviation) / 5
+
+        return self._team_stats(sums, counts), self._synergies(sums, counts, variance)
+
+    def calculate_team_stats(self, indices):
+        """
+        Berechnet Team-Stats für alle Lineups (dict von Arrays der Länge N)
+        """
+        return self.evaluate(indices)[0]
+
+    def calculate_all_synergies(self, indices):
+        """
+        Berechnet alle Synergien für alle Lineups (dict von Arrays der Länge N)
+        """
+        return self.evaluate(indices)[1]
+
+    def lineup_state(self, indices):
+        """
+        Synergie-Zustand eines einzelnen Lineups für inkrementelle Updates
+
+        Enthält die Summen der Spieler-Beiträge, die Zähler der Bool-Features
+        und die Summe der quadrierten Scoring-Volumen (für die
+        Standardabweichung über Summe und Quadratsumme).
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(5)
+        volumes = self.contrib[indices, CONTRIB_INDEX['SCORING_VOLUME']]
+        return {
+            'indices': indices.copy(),
+            'sums': _row_sum(self.contrib[indices][None])[0],
+            'counts': self.flags[indices].sum(axis=0),
+            'volume_sq': float((volumes * volumes).sum())
+        }
+
+    def substitute(self, state, player_out, player_in):
+        """
+        Tauscht einen Spieler (Index) aus, O(1) statt Neuberechnung
+
+        Returns:
+            Neuer Zustand (der alte bleibt unverändert)
+        """
+        slot = int(np.flatnonzero(state['indices'] == player_out)[0])
+        volume_out = self.contrib[player_out, CONTRIB_INDEX['SCORING_VOLUME']]
+        volume_in = self.contrib[player_in, CONTRIB_INDEX['SCORING_VOLUME']]
+
+        indices = state['indices'].copy()
+        indices[slot] = player_in
+        return {
+            'indices': indices,
+            'sums': state['sums'] - self.contrib[player_out] + self.contrib[player_in],
+            'counts': state['counts'] - self.flags[player_out] + self.flags[player_in],
+            'volume_sq': state['volume_sq'] - volume_out * volume_out + volume_in * volume_in
+        }
+
+    def evaluate_states(self, sums, counts, volume_sq):
+        """
+        Team-Stats und Synergien direkt aus (beliebig geformten) Zuständen
+
+        sums (..., C), counts (..., F) und volume_sq (...) dürfen beliebige
+        führende Dimensionen haben. Die Standardabweichung kommt hier aus
+        Summe und Quadratsumme und kann deshalb in den letzten Bits vom
+        exakten Pfad in evaluate() abweichen.
+        """
+        shape = np.shape(volume_sq)
+        sums = np.asarray(sums).reshape(-1, len(CONTRIB_COLUMNS))
+        counts = np.asarray(counts).reshape(-1, len(FLAG_COLUMNS))
+        volume_sq = np.asarray(volume_sq, dtype=np.float64).reshape(-1)
+
+        mean = sums[:, CONTRIB_INDEX['SCORING_VOLUME']] / 5
+        variance = np.maximum(volume_sq / 5 - mean * mean, 0.0)
+
+        team_stats = self._team_stats(sums, counts)
+        synergies = self._synergies(sums, counts, variance)
+        reshape = lambda d: {key: values.reshape(shape) for key, values in d.items()}
+        return reshape(team_stats), reshape(synergies)
+
+    def substitution_deltas(self, state, candidates=None):
+        """
+        Alle Einzel-Wechsel auf einmal: jeder der 5 Spieler gegen jeden Kandidaten
+
+        Args:
+            state: Zustand aus lineup_state
+            candidates: Index-Array der Kandidaten (Default: alle Spieler)
+
+        Returns:
+            (team_stats, synergies) als dict von Arrays der Form (5, M);
+            Kandidaten, die schon im Lineup stehen, sind NaN
+        """
+        if candidates is None:
+            candidates = np.arange(len(self.names))
+        candidates = np.asarray(candidates, dtype=np.intp).reshape(-1)
+        out = state['indices']
+
+        sums = (state['sums'][None, None, :] - self.contrib[out][:, None, :] +
+                self.contrib[candidates][None, :, :])
+        counts = (state['counts'][None, None, :] - self.flags[out][:, None, :] +
+                  self.flags[candidates][None, :, :])
+        volumes = self.contrib[:, CONTRIB_INDEX['SCORING_VOLUME']]
+        volume_sq = (state['volume_sq'] - (volumes[out] ** 2)[:, None] +
+                     (volumes[candidates] ** 2)[None, :])
+
+        team_stats, synergies = self.evaluate_states(sums, counts, volume_sq)
+
+        in_lineup = np.isin(candidates, out)
+        for values in list(team_stats.values()) + list(synergies.values()):
+            values[:, in_lineup] = np.nan
+
+        return team_stats, synergies
+
+    def _team_stats(self, sums, counts):
+        """Team-Stats aus Lineup-Summen und -Zählern"""
+        s = lambda name: sums[:, CONTRIB_INDEX[name]]
+        c = lambda name: counts[:, FLAG_INDEX[name]]
+
+        # Mittelwert nur über Spieler mit Wert > 0 (NaN wenn keiner)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fg_pct = s('fg_pct') / c('has_fg_pct')
+            fg3_pct = s('fg3_pct') / c('has_fg3_pct')
+
+        return {
+            'PTS': s('PTS'),
+            'FG_PCT': fg_pct,
+            'FG3_PCT': fg3_pct,
+            'REB': s('REB'),
+            'AST': s('AST'),
+            'TOV': s('TOV'),
+            'STL': s('STL'),
+            'BLK': s('BLK')
+        }
+
+    def _synergies(self, sums, counts, variance):
+        """Alle sieben Synergien aus Lineup-Summen, -Zählern und Scoring-Varianz"""
+        s = lambda name: sums[:, CONTRIB_INDEX[name]]
+        c = lambda name: counts[:, FLAG_INDEX[name]]
+
+        synergies = {}
+
+        # SPACING
+        synergies['spacing'] = s('spacing') * np.where(c('is_shooter_threat') >= 3, 1.15, 1.0)
+
+        # PLAYMAKING
+        n_scorers = c('is_scorer')
+        playmaking = np.where(n_scorers > 0, s('playmaking') * (1 + n_scorers * 0.1), s('playmaking'))
+        synergies['playmaking'] = np.where(c('is_playmaker') > 0, playmaking, 0.0)
+
+        # REBOUNDING
+        strong_rebounders = c('is_strong_rebounder')
+        rebounding = np.where(strong_rebounders >= 2, s('REB') * 1.2, s('REB'))
+        synergies['rebounding'] = np.where(strong_rebounders >= 3, rebounding * 1.35, rebounding)
+
+        # DEFENSE
+        defense = np.where(c('is_rim_protector') > 0, s('DEFENSE_SCORE') * 1.15, s('DEFENSE_SCORE'))
+        synergies['defense'] = np.where(c('is_wing') >= 2, defense * 1.1, defense)
+
+        # BALL MOVEMENT
+        ball_movement = s('AST') * (1 + s('AST_RATIO') / 5)
+        synergies['ball_movement'] = np.where(c('is_high_usage') <= 1, ball_movement * 1.1, ball_movement)
+
+        # SIZE
+        bigs = c('is_big')
+        size = (bigs * 5).astype(np.float64)
+        synergies['size'] = np.where(bigs >= 2, size * 1.3, size)
+
+        # BALANCE
+        synergies['balance'] = 50 / (1 + np.sqrt(variance))
+
+        # Gesamt-Synergy-Score in derselben Reihenfolge wie der dict-Pfad
+        total = synergies['spacing'].copy()
+        for key in SYNERGY_KEYS[1:]:
+            total += synergies[key]
+        synergies['total'] = total
+
+        return synergies
+
+
+class LineupSynergyCache:
+    """
+    Begrenzter LRU-Cache für Lineup-Ergebnisse (Team-Stats + Synergien)
+
+    Key ist das sortierte Tupel der Spieler-IDs, die Reihenfolge im Lineup
+    spielt also keine Rolle.
+    """
+
+    def __init__(self, capacity=1024):
+        self.capacity = max(0, int(capacity))
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Gibt den Eintrag zurück (oder None) und zählt Hit/Miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """Speichert einen Eintrag, verdrängt den ältesten bei voller Kapazität"""
+        if self.capacity == 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Invalidiert alle Einträge (z.B. nach Neuladen der Spieler-Daten)"""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        """Cache-Statistiken"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
 
 class TeamSynergyCalculator:
     """
     Berechnet Team-Synergien basierend auf Spieler-Kombinationen
     """
     
-    def __init__(self, player_data_file='nba_players_2024-25.json'):
+    def __init__(self, player_data_file='nba_players_2024-25.json', cache_size=1024):
         """Lädt Spieler-Daten"""
-        with open(player_data_file, 'r') as f:
-            self.players = json.load(f)
-        print(f"✓ {len(self.players)} Spieler geladen")
+        self.player_data_file = player_data_file
+        self.cache = LineupSynergyCache(cache_size)
+        self.state_cache = LineupSynergyCache(cache_size)
+        self.data_version = 0
+        self.reload_players()
+    
+    def reload_players(self, player_data_file=None):
+        """(Neu-)Lädt Spieler-Daten und invalidiert den Lineup-Cache"""
+        if player_data_file:
+            self.player_data_file = player_data_file
+        
+        store_file = player_store.store_path(self.player_data_file)
+        
+        store = None
+        if player_store.is_fresh(self.player_data_file, store_file):
+            store = player_store.load_store(store_file)
+        
+        if store is not None:
+            # Vorgebauter binärer Store (python nba_player_store.py build)
+            self.players = player_store.to_player_dict(store)
+            self.engine = SynergyEngine.from_arrays(
+                store['names'], store['ids'], store['types'], store['stats']
+            )
+            print(f"✓ {len(self.players)} Spieler geladen (binärer Store)")
+        else:
+            with open(self.player_data_file, 'r') as f:
+                self.players = json.load(f)
+            print(f"✓ {len(self.players)} Spieler geladen")
+            
+            # Spaltenweise Repräsentation für Batch-Berechnungen
+            self.engine = SynergyEngine(self.players)
+        
+        self.cache.clear()
+        self.state_cache.clear()
+        self.data_version += 1
     
     def get_player_stats(self, player_name):
         """Holt Stats für einen Spieler"""
         return self.players.get(player_name)
     
+    def get_team_roster(self, team):
+        """Alle Spieler eines Teams (Abkürzung), sortiert nach Minuten"""
+        roster = [name for name, p in self.players.items() if p['team'] == team]
+        roster.sort(key=lambda name: self.players[name]['stats'].get('MIN', 0), reverse=True)
+        return roster
+    
+    def get_default_lineup(self, team):
+        """Standard-Starting-5 eines Teams: die fünf Spieler mit den meisten Minuten"""
+        roster = self.get_team_roster(team)
+        return roster[:5] if len(roster) >= 5 else None
+    
     def calculate_spacing_synergy(self, lineup):
         """
         SPACING: Gute 3-Point-Shooter schaffen Raum für Drives
@@ -179,43 +627,99 @@ class TeamSynergyCalculator:
         
         return synergies
     
+    def lineup_key(self, lineup_names):
+        """Kanonischer Cache-Key: sortiertes Tupel der Spieler-IDs"""
+        return tuple(sorted(self.players[name]['id'] for name in lineup_names))
+    
+    def get_lineup_profiles(self, lineups):
+        """
+        Holt Team-Stats und Synergien für mehrere Lineups über den LRU-Cache
+        
+        Cache-Misses werden gesammelt in einem Durchlauf der Synergy-Engine
+        berechnet, in der Reihenfolge, in der das Lineup zuerst angefragt
+        wurde - dann ist der Eintrag bitgenau gleich dem Dict-Pfad
+        (calculate_team_stats / calculate_all_synergies). Gecacht wird unter
+        dem sortierten Key; spätere Anfragen in anderer Spieler-Reihenfolge
+        bekommen denselben Eintrag, vom Dict-Pfad höchstens in den letzten
+        Bits (Rundung der Summen) verschieden.
+        
+        Returns:
+            Liste von Dicts mit 'stats' und 'synergies' (Kopien)
+        """
+        keys = [self.lineup_key(lineup) for lineup in lineups]
+        entries = [self.cache.get(key) for key in keys]
+        
+        missing = {}
+        for lineup, key, entry in zip(lineups, keys, entries):
+            if entry is None and key not in missing:
+                missing[key] = (len(missing), lineup)
+        
+        if missing:
+            indices = np.array(
+                [[self.engine.index[name] for name in lineup] for _, lineup in missing.values()],
+                dtype=np.intp
+            )
+            stats, synergies = self.engine.evaluate(indices)
+            
+            computed = {}
+            for key, (row, _) in missing.items():
+                computed[key] = {
+                    'stats': {stat: float(values[row]) for stat, values in stats.items()},
+                    'synergies': {syn: float(values[row]) for syn, values in synergies.items()}
+                }
+                self.cache.put(key, computed[key])
+            
+            entries = [entry if entry is not None else computed[key]
+                       for key, entry in zip(keys, entries)]
+        
+        return [
+            {'stats': dict(entry['stats']), 'synergies': dict(entry['synergies'])}
+            for entry in entries
+        ]
+    
+    def get_lineup_state(self, lineup_names):
+        """
+        Synergie-Zustand eines Lineups (gecacht) als Basis für Wechsel
+        
+        Die Indizes im Zustand stehen in der Reihenfolge, in der das Lineup
+        zuerst angefragt wurde (Cache-Key wie get_lineup_profiles sortiert).
+        """
+        key = self.lineup_key(lineup_names)
+        state = self.state_cache.get(key)
+        if state is None:
+            indices = [self.engine.index[name] for name in lineup_names]
+            state = self.engine.lineup_state(indices)
+            self.state_cache.put(key, state)
+        return state
+    
     def compare_lineups(self, lineup1_names, lineup2_names):
         """
         Vergleicht zwei Lineups und gibt detaillierte Analyse
         """
-        # Lade Spieler-Daten
-        lineup1 = [self.get_player_stats(name) for name in lineup1_names]
-        lineup2 = [self.get_player_stats(name) for name in lineup2_names]
-        
         # Prüfe ob alle Spieler gefunden wurden
-        if None in lineup1:
-            missing = [lineup1_names[i] for i, p in enumerate(lineup1) if p is None]
+        missing = [name for name in lineup1_names if name not in self.players]
+        if missing:
             print(f"❌ Spieler nicht gefunden in Team 1: {missing}")
             return None
         
-        if None in lineup2:
-            missing = [lineup2_names[i] for i, p in enumerate(lineup2) if p is None]
+        missing = [name for name in lineup2_names if name not in self.players]
+        if missing:
             print(f"❌ Spieler nicht gefunden in Team 2: {missing}")
             return None
         
-        # Berechne Stats
-        team1_stats = self.calculate_team_stats(lineup1)
-        team2_stats = self.calculate_team_stats(lineup2)
-        
-        # Berechne Synergien
-        team1_synergies = self.calculate_all_synergies(lineup1)
-        team2_synergies = self.calculate_all_synergies(lineup2)
+        # Stats und Synergien (aus dem Lineup-Cache)
+        team1_profile, team2_profile = self.get_lineup_profiles([lineup1_names, lineup2_names])
         
         return {
             'team1': {
                 'lineup': lineup1_names,
-                'stats': team1_stats,
-                'synergies': team1_synergies
+                'stats': team1_profile['stats'],
+                'synergies': team1_profile['synergies']
             },
             'team2': {
                 'lineup': lineup2_names,
-                'stats': team2_stats,
-                'synergies': team2_synergies
+                'stats': team2_profile['stats'],
+                'synergies': team2_profile['synergies']
             }
         }
     
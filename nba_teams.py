@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+NBA Teams
+Team-Tabelle (Tricode, Stadt, Name) und Normalisierung von Team-Bezeichnungen
+
+Vorhersagen speichern Teams mal als Tricode ('LAL'), mal als Namen ('Lakers'
+oder 'Los Angeles Lakers'), die NBA API liefert Tricodes. normalize_team bildet
+alles über eine einmal vorberechnete Tabelle auf den Tricode ab.
+"""
+
+TEAMS = {
+    'ATL': ('Atlanta', 'Hawks'),
+    'BOS': ('Boston', 'Celtics'),
+    'BKN': ('Brooklyn', 'Nets'),
+    'CHA': ('Charlotte', 'Hornets'),
+    'CHI': ('Chicago', 'Bulls'),
+    'CLE': ('Cleveland', 'Cavaliers'),
+    'DAL': ('Dallas', 'Mavericks'),
+    'DEN': ('Denver', 'Nuggets'),
+    'DET': ('Detroit', 'Pistons'),
+    'GSW': ('Golden State', 'Warriors'),
+    'HOU': ('Houston', 'Rockets'),
+    'IND': ('Indiana', 'Pacers'),
+    'LAC': ('LA', 'Clippers'),
+    'LAL': ('Los Angeles', 'Lakers'),
+    'MEM': ('Memphis', 'Grizzlies'),
+    'MIA': ('Miami', 'Heat'),
+    'MIL': ('Milwaukee', 'Bucks'),
+    'MIN': ('Minnesota', 'Timberwolves'),
+    'NOP': ('New Orleans', 'Pelicans'),
+    'NYK': ('New York', 'Knicks'),
+    'OKC': ('Oklahoma City', 'Thunder'),
+    'ORL': ('Orlando', 'Magic'),
+    'PHI': ('Philadelphia', '76ers'),
+    'PHX': ('Phoenix', 'Suns'),
+    'POR': ('Portland', 'Trail Blazers'),
+    'SAC': ('Sacramento', 'Kings'),
+    'SAS': ('San Antonio', 'Spurs'),
+    'TOR': ('Toronto', 'Raptors'),
+    'UTA': ('Utah', 'Jazz'),
+    'WAS': ('Washington', 'Wizards')
+}
+
+# Kurzname pro Tricode ('LAL' -> 'Lakers')
+TEAM_NAMES = {abbr: name for abbr, (_, name) in TEAMS.items()}
+
+# Abweichende Kürzel aus anderen Quellen (ESPN, Basketball-Reference, ...)
+_EXTRA_ALIASES = {
+    'GS': 'GSW', 'NY': 'NYK', 'NO': 'NOP', 'NOR': 'NOP', 'SA': 'SAS',
+    'PHO': 'PHX', 'BRK': 'BKN', 'CHO': 'CHA', 'UTAH': 'UTA', 'WSH': 'WAS',
+    'Los Angeles Clippers': 'LAC', 'Blazers': 'POR', 'Sixers': 'PHI'
+}
+
+
+def _build_aliases():
+    aliases = {}
+    for abbr, (city, name) in TEAMS.items():
+        for alias in (abbr, name, f"{city} {name}"):
+            aliases[alias.casefold()] = abbr
+    for alias, abbr in _EXTRA_ALIASES.items():
+        aliases[alias.casefold()] = abbr
+    return aliases
+
+TEAM_ALIASES = _build_aliases()
+
+
+def normalize_team(team):
+    """Tricode für Tricode/Name/vollen Namen; Unbekanntes kommt unverändert zurück"""
+    if not team:
+        return team
+    return TEAM_ALIASES.get(team.strip().casefold(), team)
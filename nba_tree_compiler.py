@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+NBA Tree Compiler
+Übersetzt das trainierte Ensemble (RandomForest oder GradientBoosting, binär)
+in flache NumPy-Arrays und wertet es ohne sklearn aus
+
+Alle Bäume liegen hintereinander in feature/threshold/children/value, Blätter
+zeigen auf sich selbst. Die Auswertung läuft max_depth Schritte über alle
+Zeilen und Bäume gleichzeitig - ohne Input-Validierung und joblib-Dispatch.
+
+Der StandardScaler steckt in den Schwellen: pro Knoten wird das größte x
+gesucht, für das sklearn (skalieren, float32-Cast, <= threshold) links geht.
+x <= folded_threshold trifft damit für jeden Rohwert dieselbe Entscheidung.
+"""
+
+import numpy as np
+from scipy.special import expit
+
+KIND_FOREST = 'forest'
+KIND_BOOSTING = 'boosting'
+
+# Arrays in CompiledEnsemble.arrays (Reihenfolge = Export-Format)
+ARRAY_NAMES = ('feature', 'threshold', 'children', 'value', 'roots')
+
+# Zeilen pro Schritt: Zwischen-Arrays (Zeilen x Bäume) bleiben im Cache
+CHUNK_ROWS = 256
+
+
+def _to_key(x):
+    """float64 -> int64 mit gleicher Ordnung (für Bisektion über alle Doubles)"""
+    bits = x.view(np.int64)
+    return np.where(bits < 0, -(bits & np.int64(0x7FFFFFFFFFFFFFFF)), bits)
+
+
+def _from_key(key):
+    bits = np.where(key < 0, (-key) | np.int64(-0x8000000000000000), key)
+    return bits.view(np.float64)
+
+
+def fold_thresholds(threshold, mean, scale):
+    """
+    Schwellen im Rohwert-Raum
+
+    Args:
+        threshold: sklearn-Schwellen (skalierter Raum) pro Split-Knoten
+        mean, scale: StandardScaler-Parameter des jeweiligen Features
+
+    Returns:
+        Größtes float64 x pro Knoten mit float32((x - mean) / scale) <= threshold
+    """
+    def goes_left(x):
+        return ((x - mean) / scale).astype(np.float32).astype(np.float64) <= threshold
+
+    guess = threshold * scale + mean
+    delta = (np.abs(threshold) + 1.0) * np.abs(scale) * 1e-5
+    for _ in range(20):
+        lo, hi = guess - delta, guess + delta
+        if goes_left(lo).all() and not goes_left(hi).any():
+            break
+        delta *= 16
+    else:
+        raise ValueError("Schwellen lassen sich nicht falten")
+
+    lo_key, hi_key = _to_key(lo), _to_key(hi)
+    while (hi_key - lo_key > 1).any():
+        mid = lo_key + (hi_key - lo_key) // 2
+        left = goes_left(_from_key(mid))
+        lo_key = np.where(left, mid, lo_key)
+        hi_key = np.where(left, hi_key, mid)
+
+    return _from_key(lo_key)
+
+
+class CompiledEnsemble:
+    """Flaches Ensemble: predict_proba auf Rohwerten (Scaler ist eingefaltet)"""
+
+    def __init__(self, kind, arrays, max_depth, n_features, init_raw=0.0, classes=(0, 1)):
+        """
+        Args:
+            kind: KIND_FOREST (Mittel der Blatt-Wahrscheinlichkeiten) oder
+                  KIND_BOOSTING (expit(init_raw + Summe der Blattwerte))
+            arrays: Dict mit ARRAY_NAMES (z.B. aus compile_ensemble oder .npy-Dateien)
+            classes: Klassen-Labels wie model.classes_ (Spalten von predict_proba)
+        """
+        self.kind = kind
+        self.arrays = arrays
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.init_raw = float(init_raw)
+        self.classes = np.asarray(classes)
+
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.children = arrays['children']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        # children ist (n_nodes x 2): nächster Knoten = _next[2 * node + rechts]
+        self._next = self.children.reshape(-1)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def leaves(self, X):
+        """Blatt-Index pro Zeile und Baum (n_rows x n_trees)"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        if len(X) == 1:
+            # Eine Zeile (API-Request): 1D-Indexing ist deutlich billiger
+            x, nodes = X[0], self.roots
+            for _ in range(self.max_depth):
+                nodes = self._next[2 * nodes + (x[self.feature[nodes]] > self.threshold[nodes])]
+            return nodes[None, :]
+
+        if len(X) > CHUNK_ROWS:
+            return np.concatenate([self.leaves(X[i:i + CHUNK_ROWS]) for i in range(0, len(X), CHUNK_ROWS)])
+
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.max_depth):
+            nodes = self._next[2 * nodes + (X[rows, self.feature[nodes]] > self.threshold[nodes])]
+        return nodes
+
+    def predict_proba(self, X):
+        """Wie sklearn predict_proba: Matrix (n_rows x 2)"""
+        values = self.value[self.leaves(X)]
+        if self.kind == KIND_FOREST:
+            proba = values.mean(axis=1)
+        else:
+            proba = expit(self.init_raw + values.sum(axis=1))
+        return np.column_stack((1.0 - proba, proba))
+
+    def info(self):
+        return {
+            'kind': self.kind,
+            'trees': self.n_trees,
+            'nodes': self.n_nodes,
+            'max_depth': self.max_depth,
+            'bytes': sum(array.nbytes for array in self.arrays.values())
+        }
+
+
+def compile_ensemble(model, scaler=None):
+    """
+    Übersetzt ein gefittetes binäres RandomForestClassifier- oder
+    GradientBoostingClassifier-Modell (plus optional StandardScaler)
+
+    Returns:
+        CompiledEnsemble
+    """
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+    if len(model.classes_) != 2:
+        raise ValueError("Nur binäre Klassifikation wird unterstützt")
+
+    n_features = model.n_features_in_
+    if isinstance(model, RandomForestClassifier):
+        kind, trees, init_raw = KIND_FOREST, [est.tree_ for est in model.estimators_], 0.0
+    elif isinstance(model, GradientBoostingClassifier):
+        kind, trees = KIND_BOOSTING, [est.tree_ for est in model.estimators_[:, 0]]
+        init_raw = float(model._raw_predict_init(np.zeros((1, n_features)))[0, 0])
+    else:
+        raise TypeError(f"Nicht unterstütztes Modell: {type(model).__name__}")
+
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+    n_nodes = offsets[-1]
+
+    feature = np.zeros(n_nodes, dtype=np.intp)
+    threshold = np.zeros(n_nodes, dtype=np.float64)
+    children = np.empty((n_nodes, 2), dtype=np.intp)
+    value = np.empty(n_nodes, dtype=np.float64)
+
+    for tree, offset in zip(trees, offsets):
+        nodes = slice(offset, offset + tree.node_count)
+        own = np.arange(offset, offset + tree.node_count)
+        is_leaf = tree.children_left < 0
+
+        feature[nodes] = np.where(is_leaf, 0, tree.feature)
+        threshold[nodes] = np.where(is_leaf, np.inf, tree.threshold)
+        # Blätter zeigen auf sich selbst, die Auswertung läuft immer max_depth Schritte
+        children[nodes, 0] = np.where(is_leaf, own, tree.children_left + offset)
+        children[nodes, 1] = np.where(is_leaf, own, tree.children_right + offset)
+
+        if kind == KIND_FOREST:
+            counts = tree.value[:, 0, :]
+            value[nodes] = counts[:, 1] / counts.sum(axis=1)
+        else:
+            value[nodes] = model.learning_rate * tree.value[:, 0, 0]
+
+    # Scaler in die Split-Schwellen falten
+    split = np.isfinite(threshold)
+    if scaler is not None:
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+    else:
+        mean, scale = np.zeros(n_features), np.ones(n_features)
+    threshold[split] = fold_thresholds(threshold[split], mean[feature[split]], scale[feature[split]])
+
+    arrays = {
+        'feature': feature,
+        'threshold': threshold,
+        'children': children,
+        'value': value,
+        'roots': offsets[:-1].astype(np.intp)
+    }
+    max_depth = max(tree.max_depth for tree in trees)
+    return CompiledEnsemble(kind, arrays, max_depth, n_features, init_raw, model.classes_)
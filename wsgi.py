@@ -0,0 +1,10 @@
+"""
+WSGI Entry Point für Produktion
+
+gunicorn:  gunicorn -c gunicorn.conf.py wsgi:app
+waitress:  waitress-serve --port=5001 --call nba_flask_api:create_app
+"""
+
+from nba_flask_api import create_app
+
+app = create_app()